@@ -0,0 +1,214 @@
+"""Greatest common divisors and fast modular exponentiation.
+
+Each algorithm comes as a scalar function of Python integers, and as a batch
+function applying it element-wise to whole arrays. The batch functions run
+the same steps on all the elements at once with NumPy, in case it's
+installed, and fall back to a loop over the scalar function otherwise. The
+scalar arguments are broadcast along the arrays, and scalars alone give
+one-element results.
+`iterate_batches` feeds them inputs too large for the memory, by chunks.
+"""
+import numbers
+from array import array
+from itertools import islice, repeat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_SIZE = 1 << 16  # Elements per chunk of the streamed inputs.
+
+
+def gcd(a, b):
+    """Return the greatest common divisor of the numbers, using the
+    Euclid's algorithm.
+
+    GCD(a, b) = GCD(b, a mod b), and the remainders shrink at least by half
+    every two steps, so it takes O(log(max(a, b))) steps.
+    """
+    while b != 0:
+        a, b = b, a % b
+    return abs(a)
+
+
+def binary_gcd(a, b):
+    """Return the greatest common divisor of the numbers, using the Stein's
+    (binary) algorithm.
+
+    It uses only shifts and subtractions instead of divisions: the common
+    factors of 2 are taken out first, then the difference of two odd numbers
+    is even, so its factors of 2 can go as well. Takes O(log(max(a, b))^2)
+    bit operations.
+    """
+    a, b = abs(a), abs(b)
+    if a == 0 or b == 0:
+        return a or b
+    shift = ((a | b) & -(a | b)).bit_length() - 1  # The common factors of 2.
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def lcm(a, b):
+    """Return the least common multiple of the numbers."""
+    if a == 0 or b == 0:
+        return 0
+    return abs(a // gcd(a, b) * b)
+
+
+def modpow(base, exponent, modulus):
+    """Return base^exponent mod modulus, using the square-and-multiply
+    algorithm.
+
+    The base is squared for each bit of the exponent, and multiplied into
+    the result for each bit set, everything taken modulo the modulus so the
+    numbers stay small. Takes O(log(exponent)) multiplications.
+    """
+    assert exponent >= 0 and modulus > 0
+    result = 1 % modulus
+    base %= modulus
+    while exponent:
+        if exponent & 1:
+            result = result * base % modulus
+        base = base * base % modulus
+        exponent >>= 1
+    return result
+
+
+def broadcast(*arguments):
+    """Return the arguments as lists of one length, the scalars repeated
+    along the sequences, for the loops of the fallbacks without NumPy.
+
+    It's the one-dimensional case of NumPy's broadcasting: the sequences
+    must have the same length, and scalars alone make one-element lists.
+
+    :raises ValueError: In case the sequences have different lengths.
+    :rtype: list[list]
+    """
+    arguments = [argument if isinstance(argument, numbers.Number)
+                 else list(argument) for argument in arguments]
+    lengths = {len(argument) for argument in arguments
+               if isinstance(argument, list)}
+    if len(lengths) > 1:
+        raise ValueError("The sequences have different lengths.")
+    length = lengths.pop() if lengths else 1
+    return [[argument] * length if isinstance(argument, numbers.Number)
+            else argument for argument in arguments]
+
+
+def gcd_batch(a, b):
+    """Return the element-wise GCDs of the arrays of integers (or of an
+    array and an integer).
+
+    The Euclid's algorithm runs on all the pairs at once, each step taking
+    the remainders of the pairs not done yet, so the number of the steps is
+    the one of the slowest pair, O(log(max)).
+
+    :rtype: numpy.ndarray | array
+    """
+    if numpy is None:
+        return array('q', map(gcd, *broadcast(a, b)))
+    a, b = numpy.broadcast_arrays(numpy.atleast_1d(a).astype(numpy.int64),
+                                  numpy.atleast_1d(b).astype(numpy.int64))
+    a = numpy.abs(a)  # Copies of the inputs.
+    b = numpy.abs(b)
+    active = numpy.flatnonzero(b)
+    a_flat = a.reshape(-1)
+    b_flat = b.reshape(-1)
+    while active.size:
+        a_active = a_flat[active]
+        b_active = b_flat[active]
+        a_flat[active] = b_active
+        b_active = a_active % b_active
+        b_flat[active] = b_active
+        active = active[b_active != 0]
+    return a
+
+
+def lcm_batch(a, b):
+    """Return the element-wise LCMs of the arrays of integers (or of an
+    array and an integer).
+
+    :rtype: numpy.ndarray | array
+    """
+    if numpy is None:
+        return array('q', map(lcm, *broadcast(a, b)))
+    a, b = numpy.broadcast_arrays(numpy.atleast_1d(a).astype(numpy.int64),
+                                  numpy.atleast_1d(b).astype(numpy.int64))
+    divisors = gcd_batch(a, b)
+    result = numpy.zeros_like(divisors)
+    nonzero = divisors != 0
+    result[nonzero] = numpy.abs(a[nonzero] // divisors[nonzero] * b[nonzero])
+    return result
+
+
+def modpow_batch(bases, exponents, modulus):
+    """Return the element-wise base^exponent mod modulus of the arrays of
+    the bases and of the exponents (or of scalars).
+
+    The square-and-multiply algorithm runs on all the elements at once, for
+    as many steps as the bits of the largest exponent. The products of two
+    residues must fit in 64 bits, so the vectorized version takes moduli
+    below 2^32.
+
+    :rtype: numpy.ndarray | array
+    """
+    if numpy is None:
+        return array('q', (modpow(base, exponent, modulus) for base, exponent
+                           in zip(*broadcast(bases, exponents))))
+    assert 0 < modulus < 1 << 32
+    bases, exponents = numpy.broadcast_arrays(
+        numpy.atleast_1d(bases).astype(numpy.int64) % modulus,
+        numpy.atleast_1d(exponents).astype(numpy.int64))
+    assert (exponents >= 0).all()
+    bases = bases.astype(numpy.uint64)  # Copies of the inputs.
+    exponents = exponents.copy()
+    result = numpy.full(bases.shape, 1 % modulus, dtype=numpy.uint64)
+    modulus = numpy.uint64(modulus)
+    while exponents.any():
+        odd = (exponents & 1).astype(bool)
+        result[odd] = result[odd] * bases[odd] % modulus
+        bases = bases * bases % modulus
+        exponents >>= 1
+    return result.astype(numpy.int64)
+
+
+def _chunks(values, chunk_size):
+    """Split the values into chunks: slices of an array (or any sequence),
+    or lists of the items of an iterator.
+    """
+    if hasattr(values, '__len__') and hasattr(values, '__getitem__'):
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]
+        return
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iterate_batches(function, *inputs, chunk_size=CHUNK_SIZE):
+    """Apply the batch function to the inputs by chunks, and iterate over the
+    results of the chunks.
+
+    The inputs may be arrays, memory-mapped files (`numpy.memmap`) or any
+    iterables, e.g. generators reading them from the disk, so only a chunk
+    of them at a time has to be in the memory. The scalar arguments are
+    passed to every call as is.
+
+    Example:
+        for gcds in iterate_batches(gcd_batch, read_a(), read_b()):
+            write(gcds)
+    """
+    assert not all(isinstance(argument, int) for argument in inputs)
+    streams = [repeat(argument) if isinstance(argument, int)
+               else _chunks(argument, chunk_size) for argument in inputs]
+    for arguments in zip(*streams):
+        yield function(*arguments)
@@ -0,0 +1,177 @@
+"""Ad-hoc benchmarks for the numerical algorithms.
+
+Run with `python -m chapter_02_numerical_algorithms.benchmarks`.
+"""
+import math
+import os
+import random
+import time
+
+from . import arithmetic
+from .arithmetic import gcd, binary_gcd, modpow, gcd_batch, modpow_batch
+from .primality import PrimalityService
+from .integration import rectangle_rule, trapezoid_rule, \
+    rectangle_rule__vectorized, trapezoid_rule__vectorized, \
+    adaptive_integrate
+from .primes import sieve_of_eratosthenes, small_primes, count_primes
+from .randomness import LinearCongruentialGenerator
+
+
+def measure_time(function, *args):
+    """Return the wall time in seconds of a single `function(*args)` call."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_sieve(max_number=10 ** 7):
+    """Compare the book's sieve against the bytearray and segmented ones."""
+    return [
+        ('sieve_of_eratosthenes', measure_time(sieve_of_eratosthenes,
+                                               max_number)),
+        ('small_primes', measure_time(small_primes, max_number)),
+        ('count_primes, segmented', measure_time(count_primes, max_number)),
+    ]
+
+
+def benchmark_sieve_scaling(max_number=10 ** 9, worker_counts=None):
+    """Return the time to count the primes up to the max number, by the
+    number of processes.
+    """
+    if worker_counts is None:
+        cpu_count = os.cpu_count()
+        worker_counts = [1] + [count for count in (2, 4, 8, 16, 32)
+                               if count <= cpu_count]
+    return [(workers, measure_time(count_primes, max_number, workers))
+            for workers in worker_counts]
+
+
+def benchmark_arithmetic(size=1000000, modulus=1000003):
+    """Compare the GCD and modular exponentiation kernels, one element at a
+    time and in batches, against the built-in `math.gcd` and `pow`.
+    """
+    a = [random.getrandbits(62) for _ in range(size)]
+    b = [random.getrandbits(62) for _ in range(size)]
+    exponents = [random.getrandbits(62) for _ in range(size)]
+    if arithmetic.numpy is not None:
+        numpy = arithmetic.numpy
+        a_array, b_array = numpy.array(a), numpy.array(b)
+        exponents_array = numpy.array(exponents)
+        batch = 'NumPy batch'
+    else:
+        a_array, b_array, exponents_array = a, b, exponents
+        batch = 'batch (no NumPy)'
+
+    def loop(function, *columns):
+        return [function(*arguments) for arguments in zip(*columns)]
+
+    return [
+        ('gcd', 'math.gcd loop', measure_time(loop, math.gcd, a, b)),
+        ('gcd', 'Euclid loop', measure_time(loop, gcd, a, b)),
+        ('gcd', 'binary GCD loop', measure_time(loop, binary_gcd, a, b)),
+        ('gcd', batch, measure_time(gcd_batch, a_array, b_array)),
+        ('modpow', 'pow loop',
+         measure_time(loop, pow, a, exponents, [modulus] * size)),
+        ('modpow', 'square-and-multiply loop',
+         measure_time(loop, modpow, a, exponents, [modulus] * size)),
+        ('modpow', batch,
+         measure_time(modpow_batch, a_array, exponents_array, modulus)),
+    ]
+
+
+def benchmark_primality(size=100000, worker_counts=None):
+    """Return the times to factor a batch of 48-bit numbers, cold by the
+    number of processes, then again from the cache.
+    """
+    if worker_counts is None:
+        worker_counts = [1] + [count for count in (2, 4, 8, 16, 32)
+                               if count <= os.cpu_count()]
+    numbers = [random.getrandbits(48) | 1 for _ in range(size)]
+    results = []
+    for workers in worker_counts:
+        with PrimalityService(max_entries=size, workers=workers) as service:
+            results.append(('cold, {} processes'.format(workers),
+                            measure_time(service.factor_batch, numbers)))
+            cached = measure_time(service.factor_batch, numbers)
+    results.append(('cached', cached))
+    return results
+
+
+def benchmark_random(draws=10 ** 7, block_size=1 << 20):
+    """Return the random draws per second, one per call and in blocks."""
+    generator = LinearCongruentialGenerator(seed=1)
+
+    def per_call(function):
+        for _ in range(draws // 10):
+            function()
+
+    def in_blocks():
+        for _ in range(draws // block_size):
+            generator.random_block(block_size)
+
+    generator.random_block(block_size)  # Compute the block coefficients.
+    return [
+        ('random.random', draws // 10 / measure_time(per_call, random.random)),
+        ('LCG random', draws // 10 / measure_time(per_call, generator.random)),
+        ('LCG random_block',
+         draws // block_size * block_size / measure_time(in_blocks)),
+    ]
+
+
+def _peak(x):
+    return 1 / (1e-4 + x * x)
+
+
+def benchmark_integration(interval_counts=(10 ** 3, 10 ** 5),
+                          tolerances=(1e-3, 1e-6)):
+    """Return the errors and the times of the integration rules on the side
+    of a sharp peak, by the number of the slices or the tolerance.
+
+    Each row is (rule, slices or tolerance, absolute error, seconds).
+    """
+    exact = 100 * math.atan(100)
+    results = []
+    for rule in (rectangle_rule, rectangle_rule__vectorized,
+                 trapezoid_rule, trapezoid_rule__vectorized):
+        for num_intervals in interval_counts:
+            start = time.perf_counter()
+            area = rule(_peak, 0, 1, num_intervals)
+            results.append((rule.__name__, num_intervals, abs(area - exact),
+                            time.perf_counter() - start))
+    for tolerance in tolerances:
+        start = time.perf_counter()
+        area = adaptive_integrate(_peak, 0, 1, tolerance)
+        results.append(('adaptive_integrate', tolerance, abs(area - exact),
+                        time.perf_counter() - start))
+    return results
+
+
+def main():
+    print("Seconds to find the primes up to 1e7:")
+    for name, seconds in benchmark_sieve():
+        print("  {:<24} {:>8.4f}".format(name, seconds))
+
+    print("Seconds to compute 1e6 GCDs and modular powers:")
+    for kernel, name, seconds in benchmark_arithmetic():
+        print("  {:<7} {:<25} {:>8.4f}".format(kernel, name, seconds))
+
+    print("Random draws per second:")
+    for name, rate in benchmark_random():
+        print("  {:<20} {:>12.3g}".format(name, rate))
+
+    print("Errors and seconds to integrate a peak:")
+    for name, parameter, error, seconds in benchmark_integration():
+        print("  {:<28} {:>8.0e} {:>10.2e} {:>8.4f}".format(
+            name, parameter, error, seconds))
+
+    print("Seconds to factor 1e5 random 48-bit numbers:")
+    for name, seconds in benchmark_primality():
+        print("  {:<20} {:>8.4f}".format(name, seconds))
+
+    print("Seconds to count the primes up to 1e9, by processes:")
+    for workers, seconds in benchmark_sieve_scaling():
+        print("  {:>2} {:>8.4f}".format(workers, seconds))
+
+
+if __name__ == '__main__':
+    main()
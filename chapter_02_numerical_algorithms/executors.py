@@ -0,0 +1,33 @@
+"""Solving batches of independent problems in a pool of processes."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def map_problems(function, problems, workers=None, chunk_size=16,
+                 executor=None):
+    """Return the list of `function(problem)` for the problems, computed in
+    a pool of processes.
+
+    The function and the problems travel to the processes, so they must be
+    picklable: functions defined at the top level of a module, or
+    `functools.partial` of them for the parameters.
+
+    :param workers: The number of processes of a pool started for this
+        batch, the number of CPUs by default. With 1 the problems are solved
+        in this process.
+    :param chunk_size: The number of the problems per task of a process.
+        Fewer problems are solved in this process, unless an executor is
+        given.
+    :param executor: An executor to reuse across the batches, instead of
+        starting a pool for each of them. It's left running.
+    :type executor: concurrent.futures.Executor | None
+    :rtype: list
+    """
+    problems = list(problems)
+    if executor is not None:
+        return list(executor.map(function, problems, chunksize=chunk_size))
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(problems) <= chunk_size:
+        return list(map(function, problems))
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(function, problems, chunksize=chunk_size))
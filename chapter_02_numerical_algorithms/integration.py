@@ -0,0 +1,202 @@
+"""Numerical integration with the rectangle and trapezoid rules.
+
+The area under the curve is approximated by slices, the more the slices the
+closer the approximation. Calling the function once per slice costs a Python
+call each, so the vectorized rules evaluate it on the whole grid of the
+points at once, with NumPy in case it's installed. The adaptive rule puts
+more slices only where the curve needs them, and `integrate_batch` spreads
+many integrals over several processes.
+"""
+import math
+from functools import partial
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .executors import map_problems
+
+
+def rectangle_rule(function, low, high, num_intervals):
+    """Return the area under the curve over [low, high], approximated by
+    rectangles as high as the function at their left side.
+
+    The book's algorithm: one function call per rectangle. The error is
+    O(1 / num_intervals).
+    """
+    assert num_intervals > 0
+    dx = (high - low) / num_intervals
+    total_area = 0.0
+    for i in range(num_intervals):
+        total_area += dx * function(low + i * dx)
+    return total_area
+
+
+def trapezoid_rule(function, low, high, num_intervals):
+    """Return the area under the curve over [low, high], approximated by
+    trapezoids joining the values of the function at their sides.
+
+    The book's algorithm: one function call per trapezoid side. The error is
+    O(1 / num_intervals^2) for a smooth function.
+    """
+    assert num_intervals > 0
+    dx = (high - low) / num_intervals
+    total_area = 0.0
+    for i in range(num_intervals):
+        x = low + i * dx
+        total_area += dx * (function(x) + function(x + dx)) / 2
+    return total_area
+
+
+def _evaluate(function, points):
+    """Return the values of the function at the points: a single call on the
+    NumPy array of the points, or a call per point without NumPy.
+    """
+    if numpy is None:
+        return [function(x) for x in points]
+    values = numpy.asarray(function(points), dtype=float)
+    return numpy.broadcast_to(values, points.shape)  # For constant results.
+
+
+def _sum(values):
+    """Sum the values: with NumPy's pairwise summation in C, or `fsum`."""
+    if numpy is None:
+        return math.fsum(values)
+    return float(values.sum())
+
+
+def _grid(low, high, num_points):
+    if numpy is None:
+        dx = (high - low) / (num_points - 1)
+        return [low + i * dx for i in range(num_points)]
+    return numpy.linspace(low, high, num_points)
+
+
+def rectangle_rule__vectorized(function, low, high, num_intervals):
+    """Return the same area as `rectangle_rule`, evaluating the function on
+    the NumPy array of all the left sides in one call.
+
+    :param function: A function taking an array and returning the array of
+        its values, like `numpy.sin`. Without NumPy it's called per point.
+    """
+    assert num_intervals > 0
+    dx = (high - low) / num_intervals
+    values = _evaluate(function, _grid(low, high, num_intervals + 1)[:-1])
+    return dx * _sum(values)
+
+
+def trapezoid_rule__vectorized(function, low, high, num_intervals):
+    """Return the same area as `trapezoid_rule`, evaluating the function on
+    the NumPy array of all the sides in one call.
+
+    The inner sides are shared by two trapezoids, so there are
+    num_intervals + 1 values to compute instead of 2 * num_intervals.
+
+    :param function: A function taking an array and returning the array of
+        its values, like `numpy.sin`. Without NumPy it's called per point.
+    """
+    assert num_intervals > 0
+    dx = (high - low) / num_intervals
+    values = _evaluate(function, _grid(low, high, num_intervals + 1))
+    return dx * (_sum(values) - float(values[0] + values[-1]) / 2)
+
+
+def _slice_area(function, low, high, f_low, f_high, area, tolerance,
+                depth):
+    """The book's adaptive step: compare the trapezoid of the slice with the
+    two of its halves, and split the halves further while they differ by
+    more than the tolerance.
+    """
+    middle = (low + high) / 2
+    f_middle = function(middle)
+    left = (middle - low) * (f_low + f_middle) / 2
+    right = (high - middle) * (f_middle + f_high) / 2
+    if depth == 0 or abs(left + right - area) <= tolerance:
+        return left + right
+    return (_slice_area(function, low, middle, f_low, f_middle, left,
+                        tolerance / 2, depth - 1) +
+            _slice_area(function, middle, high, f_middle, f_high, right,
+                        tolerance / 2, depth - 1))
+
+
+def adaptive_integrate(function, low, high, tolerance=1e-8, num_intervals=16,
+                       max_depth=40):
+    """Return the area under the curve over [low, high], using trapezoids
+    split in two until the halves change the area by less than the
+    tolerance.
+
+    The tolerance is shared among the slices in proportion to their widths,
+    so the total error stays around it, and the flat parts of the curve take
+    few slices while the steep ones take many.
+
+    With NumPy, all the slices still to refine are split at once: a round
+    evaluates the function on the array of their middles in one call, keeps
+    the areas of the slices done, and goes on with the halves of the rest.
+
+    :param num_intervals: The number of the slices to start with, so that a
+        few coarse slices can't miss the shape of the curve.
+    :param max_depth: The maximum number of the splits of a slice, after
+        which its area is taken as is.
+    """
+    assert num_intervals > 0 and tolerance > 0
+    if low == high:
+        return 0.0
+    points = _grid(low, high, num_intervals + 1)
+    values = _evaluate(function, points)
+    width = (high - low) / num_intervals
+    if numpy is None:
+        return math.fsum(
+            _slice_area(function, points[i], points[i + 1], values[i],
+                        values[i + 1], width * (values[i] + values[i + 1]) / 2,
+                        tolerance / num_intervals, max_depth)
+            for i in range(num_intervals))
+
+    lows, highs = points[:-1], points[1:]
+    f_lows, f_highs = values[:-1], values[1:]
+    areas = width * (f_lows + f_highs) / 2
+    tolerance_per_width = tolerance / abs(high - low)
+    done = []
+    for depth in range(max_depth + 1):
+        middles = (lows + highs) / 2
+        f_middles = _evaluate(function, middles)
+        lefts = (middles - lows) * (f_lows + f_middles) / 2
+        rights = (highs - middles) * (f_middles + f_highs) / 2
+        refined = lefts + rights
+        if depth == max_depth:
+            done.append(refined)
+            break
+        converged = numpy.abs(refined - areas) <= \
+            tolerance_per_width * numpy.abs(highs - lows)
+        done.append(refined[converged])
+        if converged.all():
+            break
+        rest = ~converged
+        lows, middles, highs = lows[rest], middles[rest], highs[rest]
+        f_lows, f_middles, f_highs = \
+            f_lows[rest], f_middles[rest], f_highs[rest]
+        # The left halves, followed by the right ones.
+        lows, highs = (numpy.concatenate((lows, middles)),
+                       numpy.concatenate((middles, highs)))
+        f_lows, f_highs = (numpy.concatenate((f_lows, f_middles)),
+                           numpy.concatenate((f_middles, f_highs)))
+        areas = numpy.concatenate((lefts[rest], rights[rest]))
+    return _sum(numpy.concatenate(done))
+
+
+def _integrate(problem, tolerance):
+    function, low, high = problem
+    return adaptive_integrate(function, low, high, tolerance)
+
+
+def integrate_batch(problems, tolerance=1e-8, workers=None, chunk_size=16,
+                    executor=None):
+    """Return the list of the areas of the (function, low, high) problems,
+    computed by `adaptive_integrate` in a pool of processes.
+
+    For a family of functions depending on parameters, pass
+    `functools.partial(function, parameter=...)`. See `map_problems` for
+    the pool and its arguments.
+    """
+    return map_problems(partial(_integrate, tolerance=tolerance), problems,
+                        workers, chunk_size, executor)
@@ -0,0 +1,287 @@
+"""Testing numbers for primality and factoring them.
+
+The Miller-Rabin test tells primes from composites without factoring, and
+Pollard's rho algorithm finds the factors of a composite much faster than
+trial division. `PrimalityService` remembers the answers, and spreads large
+batches of questions over several processes.
+"""
+import math
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .primes import small_primes
+
+# With the first 13 primes as the bases the Miller-Rabin test never errs
+# below 3317044064679887385961981 (about 3.3 * 10^24), so it is deterministic
+# for all the 64-bit numbers. The first 12 ones are only good up to
+# 318665857834031151167461, a strong pseudoprime to all of them.
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+TRIAL_PRIMES = (2,) + tuple(small_primes(1000))
+
+
+def is_prime(number):
+    """Tell whether the number is a prime, using the Miller-Rabin test.
+
+    Write number - 1 = d * 2^s with d odd. For a prime number, and any base
+    a, either a^d = 1 or a^(d * 2^r) = -1 (mod number) for some r < s. A
+    base for which neither holds is a witness that the number is composite.
+    Each base takes O(log(number)) multiplications, using the built-in
+    `pow` for the modular powers (see `arithmetic.modpow`).
+
+    With the first 13 primes as the bases, the smallest composite passing
+    them all is 3317044064679887385961981, so the answer is exact below it.
+    From it on the answer is no longer proven: the strong pseudoprimes to
+    all 13 bases are reported as primes.
+    """
+    if number < 2:
+        return False
+    for prime in TRIAL_PRIMES[:len(MILLER_RABIN_BASES)]:
+        if number % prime == 0:
+            return number == prime
+
+    d = number - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, d, number)
+        if x == 1 or x == number - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(number, seed=None):
+    """Return a nontrivial factor of the composite number, using the
+    Pollard's rho algorithm with the Brent's cycle detection.
+
+    The sequence x -> x^2 + c (mod number) runs into a cycle modulo each
+    prime factor p after about sqrt(p) steps, and at that point the GCD of
+    the number and the difference of two values of the sequence is a
+    multiple of p. So finding a factor takes about O(number^(1/4)) steps.
+    The differences are multiplied together and their GCD is taken once per
+    batch of them, to save most of the GCDs.
+    """
+    assert number > 3
+    if number % 2 == 0:
+        return 2
+    generator = random.Random(seed)
+    batch_size = 128
+    while True:
+        c = generator.randrange(1, number)
+        y = generator.randrange(number)
+        divisor = product = 1
+        steps = 1
+        while divisor == 1:
+            x = y
+            for _ in range(steps):
+                y = (y * y + c) % number
+            done = 0
+            while done < steps and divisor == 1:
+                batch_start = y
+                for _ in range(min(batch_size, steps - done)):
+                    y = (y * y + c) % number
+                    product = product * abs(x - y) % number
+                divisor = math.gcd(product, number)
+                done += batch_size
+            steps *= 2
+        if divisor == number:  # The batch went past the factor, redo it.
+            divisor = 1
+            y = batch_start
+            while divisor == 1:
+                y = (y * y + c) % number
+                divisor = math.gcd(abs(x - y), number)
+        if divisor != number:  # Otherwise try another sequence.
+            return divisor
+
+
+def factor(number):
+    """Return the prime factors of the number, in ascending order and with
+    the repetitions.
+
+    The small factors are found by trial division, and the rest are split by
+    `pollard_rho` until they are primes.
+
+    :type number: int
+    :rtype: tuple[int]
+    """
+    assert number > 0
+    factors = []
+    for prime in TRIAL_PRIMES:
+        if prime * prime > number:
+            break
+        while number % prime == 0:
+            factors.append(prime)
+            number //= prime
+
+    composites = [number] if number > 1 else []
+    while composites:
+        number = composites.pop()
+        if is_prime(number):
+            factors.append(number)
+        else:
+            divisor = pollard_rho(number)
+            composites.extend((divisor, number // divisor))
+    return tuple(sorted(factors))
+
+
+_MISSING = object()
+
+
+class _LRUCache(object):
+    """A small least recently used cache, on an `OrderedDict` kept in the
+    order of the uses, the least recently used first.
+    """
+
+    def __init__(self, max_entries):
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        value = self.entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+        }
+
+
+class PrimalityService(object):
+    """Answers primality and factorization questions, remembering the
+    answers.
+
+    The answers are kept in bounded LRU caches, so a repeated question costs
+    a dictionary lookup. The batch methods answer the cached questions first,
+    and send the rest, once each, to a pool of processes. The pool is started
+    by the first batch that needs it and kept for the next ones, until
+    `close()`; the service can be used as a context manager for that.
+    """
+
+    def __init__(self, max_entries=100000, workers=None):
+        """
+        :param max_entries: The number of the answers to keep, of each kind.
+        :param workers: The number of processes for the batches, the number
+            of CPUs by default.
+        """
+        self.primality_cache = _LRUCache(max_entries)
+        self.factors_cache = _LRUCache(max_entries)
+        self.workers = workers or os.cpu_count()
+        self.executor = None
+
+    def close(self):
+        """Shut the pool of processes down, in case it was started."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_prime(self, number):
+        return self.primality_cache.get_or_compute(
+            number, lambda: is_prime(number))
+
+    def factor(self, number):
+        """:rtype: tuple[int]"""
+        factors = self.factors_cache.get(number, _MISSING)
+        if factors is _MISSING:
+            factors = factor(number)
+            self.factors_cache.put(number, factors)
+            if number > 1:
+                self.primality_cache.put(number, len(factors) == 1)
+        return factors
+
+    def _batch(self, cache, function, numbers, chunk_size):
+        """Answer the questions from the cache, compute the missing answers
+        in the process pool, and return the answers in order, along with the
+        computed ones by number.
+        """
+        answers = [cache.get(number, _MISSING) for number in numbers]
+        computed = {}
+        missing = list({number: None for number, answer
+                        in zip(numbers, answers) if answer is _MISSING})
+        if missing:
+            if self.workers == 1 or len(missing) <= chunk_size:
+                computed = map(function, missing)
+            else:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(self.workers)
+                computed = list(self.executor.map(function, missing,
+                                                  chunksize=chunk_size))
+            computed = dict(zip(missing, computed))
+            for number, answer in computed.items():
+                cache.put(number, answer)
+            answers = [computed[number] if answer is _MISSING else answer
+                       for number, answer in zip(numbers, answers)]
+        return answers, computed
+
+    def is_prime_batch(self, numbers, chunk_size=1024):
+        """Return the list of the answers of `is_prime` for the numbers.
+
+        :param chunk_size: The number of the questions per task of a
+            process. Fewer missing answers are computed in this process.
+        """
+        answers, _ = self._batch(self.primality_cache, is_prime,
+                                 list(numbers), chunk_size)
+        return answers
+
+    def factor_batch(self, numbers, chunk_size=64):
+        """Return the list of the answers of `factor` for the numbers.
+
+        :param chunk_size: The number of the questions per task of a
+            process. Fewer missing answers are computed in this process.
+        """
+        answers, computed = self._batch(self.factors_cache, factor,
+                                        list(numbers), chunk_size)
+        for number, factors in computed.items():
+            if number > 1:
+                self.primality_cache.put(number, len(factors) == 1)
+        return answers
+
+    def stats(self):
+        """Return the statistics of the caches, with their hit rates."""
+        stats = {}
+        for name, cache in (('is_prime', self.primality_cache),
+                            ('factor', self.factors_cache)):
+            cache_stats = cache.stats()
+            lookups = cache_stats['hits'] + cache_stats['misses']
+            cache_stats['hit_rate'] = \
+                cache_stats['hits'] / lookups if lookups else 0.0
+            stats[name] = cache_stats
+        return stats
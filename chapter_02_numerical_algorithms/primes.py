@@ -0,0 +1,212 @@
+"""Finding prime numbers with the Sieve of Eratosthenes.
+
+The sieve crosses out the multiples of each prime, and the numbers left are
+the primes. The plain sieve needs a flag per number up to the maximum, so it
+can't go far: up to 1e10 it would take 10 GB. The segmented sieve crosses
+out the multiples in one segment of the numbers at a time, small enough to
+fit in the CPU cache, so it takes O(sqrt(N)) memory and the segments can be
+sieved on several cores at once.
+"""
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, count, islice
+from math import isqrt
+
+# Odd numbers per segment: a 256 KiB bytearray fits in a typical L2 cache.
+SEGMENT_SIZE = 1 << 18
+
+
+def sieve_of_eratosthenes(max_number):
+    """Return the list of the primes up to the max number, inclusive.
+
+    The book's algorithm: a flag per number, and for each prime p, the
+    multiples of p from p^2 on crossed out one by one. Runs in
+    O(N log log N) time with O(N) memory.
+
+    :type max_number: int
+    :rtype: list[int]
+    """
+    if max_number < 2:
+        return []
+    is_composite = [False] * (max_number + 1)
+    for number in range(2, isqrt(max_number) + 1):
+        if not is_composite[number]:
+            for multiple in range(number * number, max_number + 1, number):
+                is_composite[multiple] = True
+    return [number for number in range(2, max_number + 1)
+            if not is_composite[number]]
+
+
+def small_primes(max_number):
+    """Return the odd primes up to the max number, inclusive, sieved in one
+    bytearray of the odd numbers.
+
+    The multiples of a prime are crossed out by a single slice assignment,
+    which runs in C.
+
+    :rtype: array
+    """
+    if max_number < 3:
+        return array('q')
+    size = (max_number - 1) // 2  # The flags of 3, 5, 7... max_number.
+    flags = bytearray(b'\x01') * size
+    for index in range((isqrt(max_number) - 1) // 2):
+        if flags[index]:
+            prime = 2 * index + 3
+            start = (prime * prime - 3) // 2
+            flags[start::prime] = bytes(len(range(start, size, prime)))
+    return array('q', compress(range(3, max_number + 1, 2), flags))
+
+
+def sieve_segment(low, high, primes):
+    """Return the primes in [low, high), crossing out the multiples of the
+    odd primes given.
+
+    Only the odd numbers are sieved, one byte each, and 2 is added in case
+    it's in the segment.
+
+    :param low: An even number.
+    :param primes: The odd primes up to sqrt(high), at least.
+    :type primes: array
+    :rtype: array
+    """
+    assert low % 2 == 0
+    size = (high - low) // 2  # The flags of low + 1, low + 3... high - 1.
+    flags = bytearray(b'\x01') * size
+    if low == 0 and size:
+        flags[0] = 0  # 1 is not a prime.
+    for prime in primes:
+        square = prime * prime
+        if square >= high:
+            break
+        # The first odd multiple of the prime in the segment, from p^2 on.
+        start = max(square, (low // prime + 1) * prime)
+        if start % 2 == 0:
+            start += prime
+        index = (start - low - 1) // 2
+        if index < size:
+            flags[index::prime] = bytes(len(range(index, size, prime)))
+    result = array('q', [2] if low <= 2 < high else [])
+    result.extend(compress(range(low + 1, high, 2), flags))
+    return result
+
+
+def _segments(low, high, segment_size):
+    """Split [low, high) into segments of `segment_size` odd numbers, the
+    segments starting with even numbers.
+    """
+    low -= low % 2
+    step = 2 * segment_size
+    for start in range(low, high, step):
+        yield start, min(start + step, high)
+
+
+def iterate_primes(max_number=None, segment_size=SEGMENT_SIZE):
+    """Iterate over the primes up to the max number, inclusive, or all the
+    primes in case it's None.
+
+    The numbers are sieved one segment at a time, so the memory taken is the
+    segment and the primes up to the square root of the numbers reached.
+
+    :type max_number: int | None
+    """
+    high = None if max_number is None else max_number + 1
+    primes_limit = 0
+    primes = array('q')
+    for low in count(0, 2 * segment_size):
+        if high is not None and low >= high:
+            return
+        segment_high = low + 2 * segment_size
+        if high is not None:
+            segment_high = min(segment_high, high)
+        if isqrt(segment_high) > primes_limit:
+            # Grow the primes ahead, to sieve more segments with them.
+            primes_limit = max(isqrt(segment_high), 2 * primes_limit)
+            primes = small_primes(primes_limit)
+        yield from sieve_segment(low, segment_high, primes)
+
+
+# The odd primes up to sqrt(high) in the worker processes.
+_worker_primes = None
+
+
+def _init_worker(high):
+    global _worker_primes
+    _worker_primes = small_primes(isqrt(high))
+
+
+def _sieve_segments(segments):
+    return [sieve_segment(low, high, _worker_primes)
+            for low, high in segments]
+
+
+def _count_in_segments(segments):
+    return sum(len(primes) for primes in _sieve_segments(segments))
+
+
+def _batches(low, high, segment_size, batch_size):
+    batch = []
+    for segment in _segments(low, high, segment_size):
+        batch.append(segment)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _map_segments(function, high, workers, segment_size, batch_size):
+    """Map the function over the batches of the segments of [0, high) in a
+    process pool, and iterate over the results in order.
+
+    Only a window of 2 batches per process is submitted ahead, and the next
+    batch is submitted as the oldest result is taken, so the results waiting
+    in the memory stay bounded however far the sieve goes.
+    """
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(high,)) as executor:
+        batches = _batches(0, high, segment_size, batch_size)
+        window = deque(executor.submit(function, batch)
+                       for batch in islice(batches, 2 * workers))
+        while window:
+            result = window.popleft().result()
+            for batch in islice(batches, 1):
+                window.append(executor.submit(function, batch))
+            yield result
+
+
+def iterate_primes__parallel(max_number, workers=None,
+                             segment_size=SEGMENT_SIZE, batch_size=4):
+    """Iterate over the primes up to the max number, inclusive, sieving the
+    segments on several processes.
+
+    The segments go to the processes in batches, and the primes come back
+    in order. Still, all the primes found travel between the processes, so
+    it pays off for counting more than for listing, see `count_primes`.
+
+    :param workers: The number of processes, the number of CPUs by default.
+    :param batch_size: The number of segments per task.
+    """
+    for batch in _map_segments(_sieve_segments, max_number + 1, workers,
+                               segment_size, batch_size):
+        for primes in batch:
+            yield from primes
+
+
+def count_primes(max_number, workers=1, segment_size=SEGMENT_SIZE,
+                 batch_size=4):
+    """Return the number of primes up to the max number, inclusive.
+
+    :param workers: The number of processes, or None for the number of
+        CPUs. With 1 the segments are sieved in this process.
+    """
+    high = max_number + 1
+    if workers == 1:
+        primes = small_primes(isqrt(high))
+        return sum(len(sieve_segment(low, segment_high, primes))
+                   for low, segment_high in _segments(0, high, segment_size))
+    return sum(_map_segments(_count_in_segments, high, workers,
+                             segment_size, batch_size))
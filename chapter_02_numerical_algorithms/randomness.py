@@ -0,0 +1,205 @@
+"""Generating random numbers, randomizing arrays and picking random samples.
+
+`LinearCongruentialGenerator` is the book's generator, seedable so a run can
+be repeated. Drawing numbers one at a time costs a Python call each, so it
+also generates whole blocks of numbers at once, with NumPy in case it's
+installed.
+"""
+import math
+import os
+from array import array
+from itertools import islice
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MASK_32 = (1 << 32) - 1
+MASK_64 = (1 << 64) - 1
+TABLE_SIZE = 1 << 18  # The block coefficients kept, 4 MiB.
+
+# The block coefficients by the constants of the generators.
+_tables = {}
+
+
+class LinearCongruentialGenerator(object):
+    """A linear congruential generator: X(n+1) = (A * X(n) + C) mod M.
+
+    With M = 2^64, the constants of Knuth's MMIX give the full period of
+    2^64, and the modulo is the overflow of the 64-bit integers. The low bits
+    of such a generator have short periods, so the numbers are taken from
+    the high bits.
+
+    A block of the next numbers is computed with no loop: X(n+i) =
+    A^i * X(n) + C * (A^(i-1) + ... + 1) (mod M). The coefficients of each i
+    are shared by all the generators, and computed once.
+    """
+
+    multiplier = 6364136223846793005
+    increment = 1442695040888963407
+
+    def __init__(self, seed=None):
+        """
+        :param seed: Any integer, to repeat the same numbers. By default the
+            generator is seeded from `os.urandom`.
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.state = seed & MASK_64
+
+    def next_raw(self):
+        """Return the next 64-bit number."""
+        self.state = (self.multiplier * self.state + self.increment) & MASK_64
+        return self.state
+
+    def random(self):
+        """Return the next float in [0, 1), from the high 53 bits."""
+        return (self.next_raw() >> 11) * 2.0 ** -53
+
+    def randrange(self, count):
+        """Return the next integer in [0, count): the high 53 bits scaled to
+        the count, (X >> 11) * count >> 53.
+
+        The bias is below count / 2^53, so the counts should stay well below
+        2^53.
+        """
+        return (self.next_raw() >> 11) * count >> 53
+
+    def _coefficients(self, size):
+        """Return the arrays of A^i and C * (A^(i-1) + ... + 1) modulo 2^64
+        for i from 1 to the size, at most `TABLE_SIZE`.
+
+        The table is doubled as needed: the coefficients of n + i are
+        A^i * A^n and A^i * C(n) + C(i), for all i at once.
+        """
+        key = (self.multiplier, self.increment)
+        table = _tables.get(key)
+        if table is None:
+            table = (numpy.array([self.multiplier], dtype=numpy.uint64),
+                     numpy.array([self.increment], dtype=numpy.uint64))
+        multipliers, increments = table
+        while len(multipliers) < size:
+            multipliers, increments = (
+                numpy.concatenate((multipliers,
+                                   multipliers * multipliers[-1])),
+                numpy.concatenate((increments,
+                                   multipliers * increments[-1] + increments)))
+        _tables[key] = (multipliers, increments)
+        return multipliers[:size], increments[:size]
+
+    def raw_block(self, size):
+        """Return the next `size` 64-bit numbers, as a NumPy array of uint64,
+        or an `array` of them without NumPy.
+
+        The numbers are computed by pieces of up to `TABLE_SIZE`, each a
+        single multiply-add of arrays.
+        """
+        if numpy is None:
+            return array('Q', (self.next_raw() for _ in range(size)))
+        block = numpy.empty(size, dtype=numpy.uint64)
+        for start in range(0, size, TABLE_SIZE):
+            piece = block[start:start + TABLE_SIZE]
+            multipliers, increments = self._coefficients(len(piece))
+            numpy.multiply(multipliers, numpy.uint64(self.state), out=piece)
+            piece += increments
+            self.state = int(piece[-1])
+        return block
+
+    def random_block(self, size):
+        """Return the next `size` floats in [0, 1), as a NumPy array of
+        float64, or an `array` of them without NumPy.
+        """
+        if numpy is None:
+            return array('d', (self.random() for _ in range(size)))
+        return (self.raw_block(size) >> numpy.uint64(11)) * 2.0 ** -53
+
+    def randrange_block(self, size, count):
+        """Return the next `size` integers in [0, count), the same as `size`
+        calls of `randrange`, as a NumPy array of int64 or an `array`.
+
+        With NumPy, the 117-bit products (X >> 11) * count are computed from
+        32-bit halves, so the results are exact for any count up to 2^63.
+        """
+        assert 0 < count <= 1 << 63
+        if numpy is None:
+            return array('q', (self.randrange(count) for _ in range(size)))
+        high_bits = self.raw_block(size) >> numpy.uint64(11)
+        mask = numpy.uint64(MASK_32)
+        shift = numpy.uint64(32)
+        count_low = numpy.uint64(count & MASK_32)
+        count_high = numpy.uint64(count >> 32)
+        low, high = high_bits & mask, high_bits >> shift
+        low_low = low * count_low
+        middle = high * count_low + (low_low >> shift)
+        middle_low = (middle & mask) + low * count_high
+        product_high = high * count_high + (middle >> shift) + \
+            (middle_low >> shift)
+        product_low = (middle_low << shift) | (low_low & mask)
+        return ((product_high << numpy.uint64(11)) |
+                (product_low >> numpy.uint64(53))).astype(numpy.int64)
+
+
+def shuffle(data, generator=None):
+    """Randomize the order of the items of the mutable sequence in place,
+    using the Fisher-Yates algorithm.
+
+    For each position i from the end, the item is swapped with the one at a
+    random position in [0, i]. Each order comes out with the same
+    probability, and it takes O(N) time. The random positions are drawn in
+    one block.
+
+    :param data: A list, an `array`, a NumPy array...
+    :param generator: A `LinearCongruentialGenerator`, a new one with a
+        random seed by default.
+    """
+    if generator is None:
+        generator = LinearCongruentialGenerator()
+    size = len(data)
+    if size < 2:
+        return
+    fractions = generator.random_block(size - 1)
+    for i in range(size - 1, 0, -1):
+        j = int(fractions[i - 1] * (i + 1))
+        data[i], data[j] = data[j], data[i]
+
+
+def reservoir_sample(items, count, generator=None):
+    """Pick `count` random items of the iterable, in a single pass, each with
+    the same probability. Returns all the items if there are no more.
+
+    The reservoir starts with the first items. Each next item should replace
+    a random item of the reservoir with a probability decreasing along the
+    stream, so instead of drawing a number for each item, the number of the
+    items to skip before the next replacement is drawn (Li's "Algorithm L").
+    It takes O(count * (1 + log(N / count))) random numbers.
+
+    The items may be the cells of a linked list, `iterate(top_cell)`, or any
+    stream too large to hold in memory.
+
+    :param generator: A `LinearCongruentialGenerator`, a new one with a
+        random seed by default.
+    :rtype: list
+    """
+    assert count > 0
+    if generator is None:
+        generator = LinearCongruentialGenerator()
+    items = iter(items)
+    reservoir = list(islice(items, count))
+    if len(reservoir) < count:
+        return reservoir
+
+    def fraction():  # In (0, 1), not to take the logarithm of 0.
+        return (generator.next_raw() >> 11 | 1) * 2.0 ** -53
+
+    weight = math.exp(math.log(fraction()) / count)
+    while True:
+        skip = math.floor(math.log(fraction()) / math.log1p(-weight))
+        item = next(islice(items, skip, None), _END)
+        if item is _END:
+            return reservoir
+        reservoir[generator.randrange(count)] = item
+        weight *= math.exp(math.log(fraction()) / count)
+
+
+_END = object()
@@ -0,0 +1,112 @@
+"""Finding the zeros of functions with Newton's method.
+
+From a guess x, the tangent of the curve at x crosses zero at
+x - f(x) / f'(x), which is a better guess near a simple zero: the number of
+the correct digits about doubles at each step. The vectorized version runs
+the steps from many guesses, or for many parameter sets, at once, and
+`newton_batch` spreads independent problems over several processes.
+"""
+from functools import partial
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .arithmetic import broadcast
+from .executors import map_problems
+
+
+def newton(function, derivative, x, tolerance=1e-12, max_iterations=100):
+    """Return a zero of the function, using Newton's method from the guess.
+
+    The book's algorithm: step to x - f(x) / f'(x) until |f(x)| is within
+    the tolerance.
+
+    :raises RuntimeError: In case the steps don't get there within the
+        maximum number of iterations.
+    :raises ZeroDivisionError: In case a step hits a zero of the derivative.
+    """
+    for _ in range(max_iterations):
+        y = function(x)
+        if abs(y) <= tolerance:
+            return x
+        x -= y / derivative(x)
+    raise RuntimeError(
+        "Newton's method didn't converge from {!r}".format(x))
+
+
+def newton__vectorized(function, derivative, xs, *parameters,
+                       tolerance=1e-12, max_iterations=100):
+    """Return the array of the zeros found by Newton's method from each of
+    the guesses.
+
+    The steps of all the guesses are taken at once, by calling the function
+    and the derivative on the array of the guesses not done yet. For a
+    family of functions, the parameters come as arrays along the guesses, or
+    as scalars shared by all of them, and are passed after x, sliced the
+    same way: e.g. the square roots of the array a are
+    `newton__vectorized(lambda x, a: x * x - a, lambda x, a: 2 * x, a, a)`.
+    A guess that doesn't converge, or hits a zero of the derivative, gives
+    NaN.
+
+    :param function: A function taking arrays and returning the array of
+        its values. Without NumPy it's called per guess.
+    :rtype: numpy.ndarray | list
+    """
+    if numpy is None:
+        zeros = []
+        for x, *values in zip(*broadcast(xs, *parameters)):
+            try:
+                zeros.append(newton(
+                    lambda x, values=values: function(x, *values),
+                    lambda x, values=values: derivative(x, *values),
+                    x, tolerance, max_iterations))
+            except (RuntimeError, ZeroDivisionError):
+                zeros.append(float('nan'))
+        return zeros
+
+    x = numpy.array(xs, dtype=float)  # A copy of the guesses.
+    shape = x.shape
+    x = x.reshape(-1)
+    parameters = [numpy.broadcast_to(parameter, shape).reshape(-1)
+                  for parameter in parameters]
+    zeros = numpy.full(x.shape, numpy.nan)
+    active = numpy.arange(x.size)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iterations):
+            values = [parameter[active] for parameter in parameters]
+            y = numpy.broadcast_to(function(x, *values), x.shape)
+            done = numpy.abs(y) <= tolerance
+            zeros[active[done]] = x[done]
+            rest = ~done
+            active, x, y = active[rest], x[rest], y[rest]
+            if not active.size:
+                break
+            values = [value[rest] for value in values]
+            x = x - y / derivative(x, *values)
+            finite = numpy.isfinite(x)
+            active, x = active[finite], x[finite]
+    return zeros.reshape(shape)
+
+
+def _solve(problem, tolerance):
+    function, derivative, x = problem
+    try:
+        return newton(function, derivative, x, tolerance)
+    except (RuntimeError, ZeroDivisionError):
+        return float('nan')
+
+
+def newton_batch(problems, tolerance=1e-12, workers=None, chunk_size=16,
+                 executor=None):
+    """Return the list of the zeros of the (function, derivative, guess)
+    problems, found by `newton` in a pool of processes. A problem that
+    doesn't converge gives NaN.
+
+    For a family of functions depending on parameters, pass
+    `functools.partial(function, parameter=...)`. See `map_problems` for
+    the pool and its arguments.
+    """
+    return map_problems(partial(_solve, tolerance=tolerance), problems,
+                        workers, chunk_size, executor)
@@ -0,0 +1,430 @@
+import math
+import unittest
+from unittest import mock
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from .primes import sieve_of_eratosthenes, small_primes, sieve_segment, \
+    iterate_primes, iterate_primes__parallel, count_primes
+from . import arithmetic, roots
+from .arithmetic import broadcast, gcd, binary_gcd, lcm, modpow, gcd_batch, \
+    lcm_batch, modpow_batch, iterate_batches
+from .primality import is_prime, pollard_rho, factor, PrimalityService
+from .randomness import LinearCongruentialGenerator, shuffle, \
+    reservoir_sample, TABLE_SIZE
+from .integration import rectangle_rule, trapezoid_rule, \
+    rectangle_rule__vectorized, trapezoid_rule__vectorized, \
+    adaptive_integrate, integrate_batch
+from .roots import newton, newton__vectorized, newton_batch
+
+
+class PrimesTest(unittest.TestCase):
+
+    primes = sieve_of_eratosthenes(10000)
+
+    def primes_up_to(self, max_number):
+        return [prime for prime in self.primes if prime <= max_number]
+
+    def test_sieve_of_eratosthenes(self):
+        self.assertEqual(sieve_of_eratosthenes(1), [])
+        self.assertEqual(sieve_of_eratosthenes(2), [2])
+        self.assertEqual(sieve_of_eratosthenes(30),
+                         [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(len(self.primes), 1229)
+
+    def test_small_primes(self):
+        for max_number in (0, 2, 3, 9, 10, 121, 10000):
+            self.assertEqual(list(small_primes(max_number)),
+                             self.primes_up_to(max_number)[1:])
+
+    def test_sieve_segment(self):
+        primes = small_primes(100)
+        self.assertEqual(list(sieve_segment(0, 30, primes)),
+                         self.primes_up_to(29))
+        self.assertEqual(list(sieve_segment(9000, 9100, primes)),
+                         [prime for prime in self.primes
+                          if 9000 <= prime < 9100])
+        self.assertEqual(list(sieve_segment(8, 9, primes)), [])
+
+    def test_iterate_primes(self):
+        for max_number in (0, 1, 2, 3, 10, 11, 100, 9973, 10000):
+            for segment_size in (1, 3, 64):
+                self.assertEqual(
+                    list(iterate_primes(max_number, segment_size)),
+                    self.primes_up_to(max_number))
+                self.assertEqual(count_primes(max_number,
+                                              segment_size=segment_size),
+                                 len(self.primes_up_to(max_number)))
+        self.assertEqual(list(islice(iterate_primes(segment_size=5), 1229)),
+                         self.primes)
+
+    def test_parallel(self):
+        self.assertEqual(
+            list(iterate_primes__parallel(10000, workers=2, segment_size=64,
+                                          batch_size=3)),
+            self.primes)
+        # Only a window of the batches is sieved ahead of the stream.
+        primes = iterate_primes__parallel(10 ** 12, workers=2,
+                                          segment_size=64, batch_size=1)
+        self.assertEqual(list(islice(primes, 10)), self.primes[:10])
+        primes.close()
+        self.assertEqual(count_primes(10000, workers=2, segment_size=64), 1229)
+        self.assertEqual(count_primes(10 ** 6, workers=2), 78498)
+
+
+class ArithmeticTest(unittest.TestCase):
+
+    pairs = [(0, 0), (0, 5), (7, 0), (12, 18), (-12, 18), (17, 5),
+             (2 ** 40, 6 ** 20), (1071, 462), (1, 1)]
+
+    def test_gcd(self):
+        for a, b in self.pairs:
+            self.assertEqual(gcd(a, b), math.gcd(a, b))
+            self.assertEqual(binary_gcd(a, b), math.gcd(a, b))
+            self.assertEqual(lcm(a, b), math.lcm(a, b))
+
+    def test_modpow(self):
+        for base, exponent, modulus in ((2, 10, 1000), (3, 0, 7), (5, 3, 1),
+                                        (-2, 5, 13), (7, 2 ** 64 + 1, 101)):
+            self.assertEqual(modpow(base, exponent, modulus),
+                             pow(base, exponent, modulus))
+
+    def test_batches__fallback(self):
+        with mock.patch.object(arithmetic, 'numpy', None):
+            self.check_batches()
+
+    @unittest.skipIf(arithmetic.numpy is None, "NumPy is not installed.")
+    def test_batches__numpy(self):
+        self.check_batches()
+
+    def check_batches(self):
+        a = [a for a, _ in self.pairs[:-3]]
+        b = [b for _, b in self.pairs[:-3]]
+        self.assertEqual(list(gcd_batch(a, b)), list(map(math.gcd, a, b)))
+        self.assertEqual(list(gcd_batch(a, 6)),
+                         [math.gcd(x, 6) for x in a])
+        self.assertEqual(list(lcm_batch(a, b)), list(map(math.lcm, a, b)))
+        bases = list(range(-5, 50))
+        exponents = [exponent * 7919 for exponent in range(55)]
+        self.assertEqual(list(modpow_batch(bases, exponents, 65521)),
+                         [pow(base, exponent, 65521)
+                          for base, exponent in zip(bases, exponents)])
+        self.assertEqual(list(modpow_batch(bases, 3, 1)), [0] * 55)
+        # Scalars alone give one-element results.
+        self.assertEqual(list(gcd_batch(12, 18)), [6])
+        self.assertEqual(list(lcm_batch(4, 6)), [12])
+        self.assertEqual(list(modpow_batch(3, 5, 7)), [5])
+        self.assertRaises(ValueError, gcd_batch, [1, 2], [1, 2, 3])
+
+    def test_broadcast(self):
+        self.assertEqual(broadcast([1, 2], 3, (4, 5)),
+                         [[1, 2], [3, 3], [4, 5]])
+        self.assertEqual(broadcast(1, 2.5), [[1], [2.5]])
+        self.assertEqual(broadcast(range(2)), [[0, 1]])
+        self.assertRaises(ValueError, broadcast, [1], [1, 2])
+
+    def test_iterate_batches(self):
+        a = range(1, 1000)
+        b = (number * 3 for number in range(1, 1000))
+        chunks = list(iterate_batches(gcd_batch, a, b, chunk_size=100))
+        self.assertEqual(len(chunks), 10)
+        self.assertEqual([value for chunk in chunks for value in chunk],
+                         [math.gcd(x, 3 * x) for x in a])
+        chunks = iterate_batches(modpow_batch, array('q', range(10)), 2, 7,
+                                 chunk_size=4)
+        self.assertEqual([list(chunk) for chunk in chunks],
+                         [[0, 1, 4, 2], [2, 4, 1, 0], [1, 4]])
+
+
+class PrimalityTest(unittest.TestCase):
+
+    def test_is_prime(self):
+        primes = set(sieve_of_eratosthenes(20000))
+        for number in range(-1, 20001):
+            self.assertEqual(is_prime(number), number in primes)
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertTrue(is_prime(2 ** 64 - 59))
+        self.assertFalse(is_prime(3215031751))  # A strong pseudoprime.
+        # A strong pseudoprime to the first 12 prime bases.
+        self.assertFalse(is_prime(318665857834031151167461))
+        self.assertFalse(is_prime((2 ** 31 - 1) * (2 ** 61 - 1)))
+
+    def test_factor(self):
+        self.assertEqual(factor(1), ())
+        self.assertEqual(factor(360), (2, 2, 2, 3, 3, 5))
+        self.assertEqual(factor(2 ** 64 + 1), (274177, 67280421310721))
+        self.assertEqual(factor(1000000007 ** 2), (1000000007, 1000000007))
+        self.assertEqual(factor(318665857834031151167461),
+                         (399165290221, 798330580441))
+        for number in range(2, 3000):
+            factors = factor(number)
+            self.assertEqual(math.prod(factors), number)
+            self.assertTrue(all(map(is_prime, factors)))
+        self.assertIn(pollard_rho(8051, seed=1), (83, 97))
+
+    def test_service(self):
+        service = PrimalityService(max_entries=100, workers=1)
+        self.assertTrue(service.is_prime(97))
+        self.assertTrue(service.is_prime(97))
+        self.assertEqual(service.factor(84), (2, 2, 3, 7))
+        self.assertFalse(service.is_prime(84))  # Known from the factors.
+        stats = service.stats()
+        self.assertEqual(stats['is_prime']['hits'], 2)
+        self.assertEqual(stats['is_prime']['hit_rate'], 2 / 3)
+        self.assertEqual(stats['factor']['misses'], 1)
+
+        numbers = [97, 10, 97, 11, 12]
+        self.assertEqual(service.is_prime_batch(numbers),
+                         [True, False, True, True, False])
+        self.assertEqual(service.factor_batch(numbers),
+                         [(97,), (2, 5), (97,), (11,), (2, 2, 3)])
+
+    def test_parallel_batch(self):
+        numbers = list(range(10 ** 12, 10 ** 12 + 300))
+        with PrimalityService(workers=2) as service:
+            self.assertEqual(service.factor_batch(numbers, chunk_size=50),
+                             [factor(number) for number in numbers])
+            executor = service.executor
+            # Known from the factors, without the pool.
+            self.assertEqual(service.is_prime_batch(numbers, chunk_size=50),
+                             [is_prime(number) for number in numbers])
+            self.assertEqual(service.stats()['is_prime']['hits'], 300)
+            self.assertEqual(service.factor_batch(numbers[:10]),
+                             [factor(number) for number in numbers[:10]])
+            self.assertEqual(service.stats()['factor']['hits'], 10)
+            more = list(range(10 ** 13, 10 ** 13 + 100))
+            self.assertEqual(service.is_prime_batch(more, chunk_size=20),
+                             [is_prime(number) for number in more])
+            self.assertIs(service.executor, executor)  # The same pool.
+        self.assertIsNone(service.executor)
+
+    def test_lru_eviction(self):
+        service = PrimalityService(max_entries=2, workers=1)
+        service.is_prime_batch([5, 6, 7])
+        self.assertEqual(service.stats()['is_prime']['evictions'], 1)
+        service.is_prime(7)
+        service.is_prime(5)
+        stats = service.stats()['is_prime']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 4))
+
+
+class RandomnessTest(unittest.TestCase):
+
+    def test_generator(self):
+        generator = LinearCongruentialGenerator(seed=42)
+        numbers = [generator.next_raw() for _ in range(1000)]
+        self.assertEqual(numbers[0], (42 * 6364136223846793005
+                                      + 1442695040888963407) % 2 ** 64)
+        self.assertEqual(len(set(numbers)), 1000)
+        generator = LinearCongruentialGenerator(seed=42)
+        self.assertEqual([generator.next_raw() for _ in range(1000)],
+                         numbers)
+
+        fractions = [generator.random() for _ in range(10000)]
+        self.assertTrue(all(0 <= fraction < 1 for fraction in fractions))
+        self.assertAlmostEqual(sum(fractions) / len(fractions), 0.5,
+                               delta=0.02)
+        counts = [0] * 6
+        for _ in range(6000):
+            counts[generator.randrange(6)] += 1
+        self.assertTrue(all(800 < count < 1200 for count in counts))
+
+    def test_blocks(self):
+        generator = LinearCongruentialGenerator(seed=7)
+        expected = LinearCongruentialGenerator(seed=7)
+        for size in (1, 100, 0, 100, 37):
+            self.assertEqual(
+                [int(number) for number in generator.raw_block(size)],
+                [expected.next_raw() for _ in range(size)])
+        self.assertEqual(
+            [float(fraction) for fraction in generator.random_block(50)],
+            [expected.random() for _ in range(50)])
+        self.assertEqual(generator.state, expected.state)
+        integers = generator.randrange_block(1000, 10)
+        self.assertEqual([int(integer) for integer in integers],
+                         [expected.randrange(10) for _ in range(1000)])
+        self.assertEqual(set(int(integer) for integer in integers),
+                         set(range(10)))
+        for count in (1, 10, 2 ** 40 + 1, 3 * 2 ** 60, 2 ** 63):
+            self.assertEqual(
+                [int(integer) for integer
+                 in generator.randrange_block(1000, count)],
+                [expected.randrange(count) for _ in range(1000)])
+
+        # The blocks longer than the coefficients come in pieces.
+        generator = LinearCongruentialGenerator(seed=8)
+        expected = LinearCongruentialGenerator(seed=8)
+        block = generator.raw_block(TABLE_SIZE + 3)
+        self.assertEqual([int(number) for number in block[-5:]],
+                         [expected.next_raw() for _ in range(TABLE_SIZE + 3)]
+                         [-5:])
+
+    def test_default_seed(self):
+        first, second = list(range(100)), list(range(100))
+        shuffle(first)
+        shuffle(second)
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(reservoir_sample(range(10 ** 4), 5),
+                            reservoir_sample(range(10 ** 4), 5))
+
+    def test_shuffle(self):
+        data = array('q', range(1000))
+        shuffle(data, LinearCongruentialGenerator(seed=1))
+        self.assertNotEqual(list(data), list(range(1000)))
+        self.assertEqual(sorted(data), list(range(1000)))
+        data = list(range(1000))
+        shuffle(data, LinearCongruentialGenerator(seed=1))
+        self.assertEqual(data, list(array('q', data)))
+
+        # Each of the 6 orders of 3 items comes out about as often.
+        generator = LinearCongruentialGenerator(seed=2)
+        counts = {}
+        for _ in range(6000):
+            data = [1, 2, 3]
+            shuffle(data, generator)
+            counts[tuple(data)] = counts.get(tuple(data), 0) + 1
+        self.assertEqual(len(counts), 6)
+        self.assertTrue(all(800 < count < 1200 for count in counts.values()))
+
+        empty = []
+        shuffle(empty)
+        self.assertEqual(empty, [])
+
+    def test_reservoir_sample(self):
+        self.assertEqual(reservoir_sample(range(3), 5), [0, 1, 2])
+        sample = reservoir_sample(range(100000), 10,
+                                  LinearCongruentialGenerator(seed=3))
+        self.assertEqual(len(set(sample)), 10)
+        self.assertTrue(max(sample) > 10000)
+
+        # A stream read once, like the cells of a linked list.
+        stream = (value * value for value in range(100))
+        sample = reservoir_sample(stream, 5)
+        self.assertEqual(len(set(sample)), 5)
+        self.assertTrue(all(math.isqrt(value) ** 2 == value
+                            for value in sample))
+        self.assertEqual(list(stream), [])
+
+        # Each item is picked with the same probability, 2 / 10.
+        generator = LinearCongruentialGenerator(seed=4)
+        counts = [0] * 10
+        for _ in range(5000):
+            for item in reservoir_sample(range(10), 2, generator):
+                counts[item] += 1
+        self.assertTrue(all(850 < count < 1150 for count in counts))
+
+
+def cube(x, scale=1.0):
+    return scale * x ** 3
+
+
+def peak(x):
+    return 1 / (1e-4 + x * x)  # Its integral over [-1, 1] is 200 atan(100).
+
+
+class IntegrationTest(unittest.TestCase):
+
+    def test_rules(self):
+        self.assertAlmostEqual(rectangle_rule(cube, 0, 1, 1000), 0.25,
+                               delta=1e-3)
+        self.assertAlmostEqual(trapezoid_rule(cube, 0, 1, 1000), 0.25,
+                               delta=1e-6)
+        for num_intervals in (1, 7, 1000):
+            self.assertAlmostEqual(
+                rectangle_rule__vectorized(cube, 0, 1, num_intervals),
+                rectangle_rule(cube, 0, 1, num_intervals))
+            self.assertAlmostEqual(
+                trapezoid_rule__vectorized(cube, 0, 1, num_intervals),
+                trapezoid_rule(cube, 0, 1, num_intervals))
+        self.assertAlmostEqual(
+            trapezoid_rule__vectorized(lambda x: 3.0, -1, 1, 10), 6)
+
+    def test_adaptive_integrate(self):
+        exact = 200 * math.atan(100)
+        for tolerance in (1e-3, 1e-6):
+            self.assertAlmostEqual(adaptive_integrate(peak, -1, 1, tolerance),
+                                   exact, delta=10 * tolerance)
+        self.assertAlmostEqual(adaptive_integrate(cube, 2, 0), -4,
+                               delta=1e-7)
+        self.assertEqual(adaptive_integrate(cube, 1.5, 1.5), 0.0)
+        # A single slice of a symmetric peak looks flat at first.
+        self.assertAlmostEqual(adaptive_integrate(peak, -1, 1, 1e-6,
+                                                  num_intervals=1),
+                               200 * math.atan(100), delta=1e-5)
+
+    def test_integrate_batch(self):
+        problems = [(partial(cube, scale=scale), 0, 2) for scale in range(40)]
+        expected = [4.0 * scale for scale in range(40)]
+        for workers in (1, 2):
+            areas = integrate_batch(problems, tolerance=1e-5,
+                                    workers=workers, chunk_size=8)
+            for area, exact in zip(areas, expected):
+                self.assertAlmostEqual(area, exact, delta=1e-4)
+
+        # A pool reused across the batches, of both kinds.
+        with ProcessPoolExecutor(2) as executor:
+            for _ in range(2):
+                areas = integrate_batch(problems, tolerance=1e-5,
+                                        executor=executor)
+                for area, exact in zip(areas, expected):
+                    self.assertAlmostEqual(area, exact, delta=1e-4)
+            zeros = newton_batch([(partial(square_minus, a=4), double, 1.0)],
+                                 executor=executor)
+            self.assertAlmostEqual(zeros[0], 2)
+
+
+def square_minus(x, a):
+    return x * x - a
+
+
+def double(x, a=None):
+    return 2 * x
+
+
+class RootsTest(unittest.TestCase):
+
+    def test_newton(self):
+        self.assertAlmostEqual(
+            newton(lambda x: x * x - 2, lambda x: 2 * x, 1.0), math.sqrt(2))
+        self.assertAlmostEqual(newton(math.cos, lambda x: -math.sin(x), 1.0),
+                               math.pi / 2)
+        with self.assertRaises(RuntimeError):  # x^2 + 1 has no real zero.
+            newton(lambda x: x * x + 1, lambda x: 2 * x, 0.5)
+        with self.assertRaises(ZeroDivisionError):
+            newton(lambda x: x * x - 2, lambda x: 2 * x, 0.0)
+
+    def test_vectorized__fallback(self):
+        with mock.patch.object(roots, 'numpy', None):
+            self.check_vectorized()
+
+    @unittest.skipIf(roots.numpy is None, "NumPy is not installed.")
+    def test_vectorized__numpy(self):
+        self.check_vectorized()
+
+    def check_vectorized(self):
+        a = [float(value) for value in range(1, 101)]
+        zeros = newton__vectorized(square_minus, double, a, a)
+        for zero, value in zip(zeros, a):
+            self.assertAlmostEqual(zero, math.sqrt(value))
+        zeros = newton__vectorized(square_minus, double, [0.0, 1.0, 5.0],
+                                   [2.0, -1.0, 2.0])
+        self.assertTrue(math.isnan(zeros[0]))
+        self.assertTrue(math.isnan(zeros[1]))
+        self.assertAlmostEqual(zeros[2], math.sqrt(2))
+        zeros = newton__vectorized(square_minus, double, [1.0, 2.0, -3.0],
+                                   2.0)  # A scalar parameter.
+        self.assertEqual(len(zeros), 3)
+        self.assertAlmostEqual(zeros[0], math.sqrt(2))
+        self.assertAlmostEqual(zeros[1], math.sqrt(2))
+        self.assertAlmostEqual(zeros[2], -math.sqrt(2))
+
+    def test_newton_batch(self):
+        problems = [(partial(square_minus, a=a), double, 1.0)
+                    for a in range(1, 41)]
+        problems.append((partial(square_minus, a=-1), double, 1.0))
+        for workers in (1, 2):
+            zeros = newton_batch(problems, workers=workers, chunk_size=8)
+            for zero, a in zip(zeros, range(1, 41)):
+                self.assertAlmostEqual(zero, math.sqrt(a))
+            self.assertTrue(math.isnan(zeros[-1]))
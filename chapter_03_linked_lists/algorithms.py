@@ -1,4 +1,8 @@
-from .models import Cell, TopSentinel, BottomSentinel, Sentinel
+import heapq
+from itertools import islice
+
+from .models import Cell, TopSentinel, SinglyCell, DoublyCell, \
+    SinglyTopSentinel, DoublyTopSentinel
 
 
 def insertion_sort(top_cell):
@@ -21,10 +25,12 @@ def insertion_sort(top_cell):
     order. Seems we could avoid this by instantiating new cells for the 
     sorted list, instead of managing the links on the items of the input 
     list, but this will double the memory size.
+
+    See `merge_sort` for an O(N log N) in-place alternative.
     """
-    assert isinstance(top_cell, TopSentinel)
+    assert top_cell.is_top_sentinel
     assert not top_cell.is_doubly_linked  # TODO: Possible to support?
-    sorted_top_cell = TopSentinel()
+    sorted_top_cell = top_cell.new_top_sentinel()
 
     input_cell = top_cell.next
     while input_cell:
@@ -38,38 +44,336 @@ def insertion_sort(top_cell):
     return sorted_top_cell
 
 
-def copy_list(top_cell):
+def merge_sort(top_cell, key=None):
+    """Sort the given list in place using the bottom-up `mergesort` algorithm.
+
+    The list is split into runs of 1 cell, then every pair of adjacent runs
+    is merged into a sorted run of twice the size, and so on, until a single
+    run is left. Each pass takes O(N) steps and there are log(N) passes, so
+    the runtime is O(N log N) whatever the order of the input list, unlike
+    `insertion_sort`.
+
+    The algorithm relinks the existing cells, so it needs no extra memory and
+    the list stays whole. It is stable: cells with equal keys keep their
+    relative order. Works for both singly and doubly linked lists.
+
+    :param top_cell: The list's first cell.
+    :type top_cell: TopSentinel
+    :param key: A function of a cell value to compare the cells by.
+    :rtype: TopSentinel
+    """
+    head = _detach_cells(top_cell)
+    if not head:
+        return top_cell
+
+    width = 1
+    while True:
+        left = head
+        head = tail = None
+        merges = 0
+        while left:
+            merges += 1
+            right = left  # Find the run adjacent to the left one.
+            left_size = 0
+            while left_size < width and right:
+                left_size += 1
+                right = right.next
+            right_size = width
+
+            while left_size or (right_size and right):
+                if not left_size:
+                    take_right = True
+                elif not right_size or not right:
+                    take_right = False
+                elif key is None:
+                    take_right = right.value < left.value
+                else:
+                    take_right = key(right.value) < key(left.value)
+
+                if take_right:
+                    cell = right
+                    right = right.next
+                    right_size -= 1
+                else:
+                    cell = left
+                    left = left.next
+                    left_size -= 1
+
+                if tail:
+                    tail.next = cell
+                else:
+                    head = cell
+                tail = cell
+            left = right
+        tail.next = None
+        if merges <= 1:
+            break
+        width *= 2
+
+    _attach_cells(top_cell, head)
+    return top_cell
+
+
+def _detach_cells(top_cell):
+    """Take the cells out of the sentinel list, and return the first of
+    them, or None if the list is empty. The cells form a chain ending with
+    None, whatever their `prev` links.
+    """
+    assert top_cell.is_top_sentinel
+    head = top_cell.next
+    if top_cell.is_doubly_linked:
+        bottom_cell = top_cell.bottom_sentinel
+        if head is bottom_cell:
+            return None
+        bottom_cell.prev.next = None
+        bottom_cell.prev = top_cell
+        top_cell.next = bottom_cell
+    else:
+        top_cell.next = None
+    return head
+
+
+def _attach_cells(top_cell, head):
+    """Put the chain of cells starting with `head` into the empty sentinel
+    list, setting the `prev` links of a doubly linked list. Takes O(N) time
+    for doubly linked lists and O(1) time for singly linked ones.
+    """
+    if not top_cell.is_doubly_linked:
+        top_cell.next = head
+        return
+    bottom_cell = top_cell.bottom_sentinel
+    prev_cell = top_cell
+    cell = head
+    while cell:
+        prev_cell.next = cell
+        cell.prev = prev_cell
+        prev_cell = cell
+        cell = cell.next
+    prev_cell.next = bottom_cell
+    bottom_cell.prev = prev_cell
+
+
+def selection_sort(top_cell):
+    """Sort the given list in place using the `selectionsort` algorithm.
+
+    The largest cell of the input is moved to the beginning of the sorted
+    output, then the largest of the remaining cells, and so on. Each search
+    for the largest cell crosses all the remaining cells, so the runtime is
+    O(N^2) whatever the order of the input list.
+
+    The existing cells are relinked, so no extra memory is needed. The last
+    of the equal cells is taken first, which keeps the sort stable. Works for
+    both singly and doubly linked lists.
+
+    :param top_cell: The list's first cell.
+    :type top_cell: TopSentinel
+    :rtype: TopSentinel
+    """
+    head = _detach_cells(top_cell)
+    sorted_head = None
+    while head:
+        # Find the cell before the largest one, None for the head itself.
+        before_largest = None
+        largest = head
+        cell_before = head
+        while cell_before.next:
+            if not cell_before.next < largest:
+                before_largest = cell_before
+                largest = cell_before.next
+            cell_before = cell_before.next
+
+        if before_largest:
+            before_largest.next = largest.next
+        else:
+            head = largest.next
+        largest.next = sorted_head
+        sorted_head = largest
+
+    _attach_cells(top_cell, sorted_head)
+    return top_cell
+
+
+def _sort_key(key):
+    if key is None:
+        return lambda cell: cell.value
+    return lambda cell: key(cell.value)
+
+
+def merge(top_cell, other_top_cell, key=None):
+    """Merge the cells of the other sorted list into the sorted list.
+
+    Both lists are crossed once, so it takes O(N + M) time. The cells are
+    relinked, and the other list is left empty. Of the equal cells, the ones
+    of the list go first.
+
+    :type top_cell: TopSentinel
+    :type other_top_cell: TopSentinel
+    :param key: A function of a cell value to compare the cells by.
+    :rtype: TopSentinel
+    """
+    assert top_cell.is_doubly_linked == other_top_cell.is_doubly_linked
+    cell_key = _sort_key(key)
+    left = _detach_cells(top_cell)
+    right = _detach_cells(other_top_cell)
+
+    head = tail = None
+    while left and right:
+        if cell_key(right) < cell_key(left):
+            cell = right
+            right = right.next
+        else:
+            cell = left
+            left = left.next
+        if tail:
+            tail.next = cell
+        else:
+            head = cell
+        tail = cell
+    rest = left or right
+    if tail:
+        tail.next = rest
+    else:
+        head = rest
+
+    _attach_cells(top_cell, head)
+    return top_cell
+
+
+def merge_k(top_cells, key=None):
+    """Merge the cells of the sorted lists into a new sorted list, and return
+    its top sentinel.
+
+    The first cells of the lists are kept in a heap, so picking the smallest
+    one takes O(log K) time, and merging N cells of K lists takes
+    O(N log K) time. The cells are relinked, and the lists are left empty.
+    Of the equal cells, the ones of the earlier lists go first.
+
+    :param top_cells: The top sentinels of the lists, all singly or all
+        doubly linked.
+    :type top_cells: list[TopSentinel]
+    :param key: A function of a cell value to compare the cells by.
+    :rtype: TopSentinel
+    """
+    assert top_cells
+    cell_key = _sort_key(key)
+    new_top_cell = make_empty_list_like(top_cells[0])
+
+    heap = []
+    for index, top_cell in enumerate(top_cells):
+        assert top_cell.is_doubly_linked == new_top_cell.is_doubly_linked
+        head = _detach_cells(top_cell)
+        if head:
+            heap.append((cell_key(head), index, head))
+    heapq.heapify(heap)
+
+    head = tail = None
+    while heap:
+        _, index, cell = heap[0]
+        next_cell = cell.next
+        if next_cell:
+            heapq.heapreplace(heap, (cell_key(next_cell), index, next_cell))
+        else:
+            heapq.heappop(heap)
+        if tail:
+            tail.next = cell
+        else:
+            head = cell
+        tail = cell
+
+    _attach_cells(new_top_cell, head)
+    return new_top_cell
+
+
+def merge_k__lazy(iterables, key=None):
+    """Iterate over the cells of the sorted iterables in the sorted order.
+
+    A lazy counterpart of `merge_k`: it takes one cell from an iterable at a
+    time, e.g. from `iterate(top_cell)` or cells read from sorted runs on
+    disk, and changes no links, so the merged cells don't have to fit in the
+    memory at once. Takes O(log K) time per cell.
+
+    :param iterables: The iterables of the cells.
+    :param key: A function of a cell value to compare the cells by.
+    """
+    return heapq.merge(*iterables, key=_sort_key(key))
+
+
+class LoopError(ValueError):
+    """Raised by the guarded algorithms on a list with a loop."""
+
+
+def copy_list(top_cell, guarded=False, pool=None):
     """Return a copy of the list.
     
     :param top_cell: The list's first cell.
     :type top_cell: TopSentinel
+    :param guarded: Check the list for a loop along the copy, rather than
+        copying it until the memory runs out. It's the Brent's algorithm of
+        `iterate__guarded`, one comparison per cell, and the loop is found
+        within a few rounds of it.
+    :type guarded: bool
+    :param pool: A pool to take the new cells from.
+    :type pool: CellPool
+    :raises LoopError: In case the list is guarded and has a loop.
     :rtype: TopSentinel
     """
-    assert isinstance(top_cell, TopSentinel)
+    assert top_cell.is_top_sentinel
     is_doubly_linked = top_cell.is_doubly_linked
-    new_top_cell = TopSentinel(is_doubly_linked=is_doubly_linked)
+    new_top_cell = top_cell.new_top_sentinel()
 
     last_added = new_top_cell
     old_cell = top_cell.next
 
     def is_last_cell(cell):
-        return isinstance(cell, BottomSentinel) or not cell
+        return not cell or cell.is_bottom_sentinel
 
+    new_cell = top_cell.new_cell if pool is None else pool.new_cell
+    marker = None
+    steps = limit = 1
     while not is_last_cell(old_cell):
-        last_added.next = Cell(old_cell.value, is_doubly_linked)
+        if guarded:
+            if old_cell is marker:
+                raise LoopError("The list has a loop.")
+            if steps == limit:
+                marker = old_cell
+                limit *= 2
+                steps = 0
+            steps += 1
+        last_added.next = new_cell(old_cell.value)
         if is_doubly_linked:
             last_added.next.prev = last_added
         last_added = last_added.next
         old_cell = old_cell.next
 
     if is_doubly_linked:
-        last_added.next = BottomSentinel()
+        last_added.next = new_top_cell.new_bottom_sentinel()
         last_added.next.prev = last_added
         new_top_cell.bottom_sentinel = last_added.next
 
     return new_top_cell
 
 
+def find_sorted_position(top_cell, new_cell):
+    """Find the cell after which to insert a new cell so the list remains
+    sorted.
+
+    The new cell goes before the cells with equal values. Worst-case
+    performance is O(N).
+
+    :param top_cell: The list's first cell.
+    :type top_cell: TopSentinel
+    :type new_cell: Cell
+    :rtype: Cell
+    """
+    def is_last_cell(cell):
+        return not cell.next or cell.next.is_bottom_sentinel
+
+    after_me = top_cell
+    while not is_last_cell(after_me) and after_me.next < new_cell:
+        after_me = after_me.next
+    return after_me
+
+
 def insert_into_sorted(top_cell, new_cell):
     """Insert a new cell into the sorted list.
 
@@ -88,17 +392,12 @@ def insert_into_sorted(top_cell, new_cell):
     :type new_cell: Cell
     :rtype: TopSentinel
     """
-    assert isinstance(top_cell, TopSentinel)
+    assert top_cell.is_top_sentinel
     is_doubly_linked = top_cell.is_doubly_linked
     if is_doubly_linked:
         assert new_cell.is_doubly_linked
 
-    def is_last_cell(cell):
-        return isinstance(cell.next, BottomSentinel) or not cell.next
-
-    after_me = top_cell
-    while not is_last_cell(after_me) and after_me.next < new_cell:
-        after_me = after_me.next
+    after_me = find_sorted_position(top_cell, new_cell)
 
     new_cell.next = after_me.next
     after_me.next = new_cell
@@ -107,20 +406,24 @@ def insert_into_sorted(top_cell, new_cell):
         new_cell.next.prev = new_cell
 
 
-def delete_cell(after_me):
+def delete_cell(after_me, pool=None):
     """Delete the cell after the given cell.
 
-    The deleted (unlinked) cell will be garbage-collected.
+    The deleted (unlinked) cell will be garbage-collected, or handed back to
+    the pool for reuse.
 
     This algorithm takes only a few steps, so it runs in O(1) time.
 
     :param after_me: The cell after which insert the new cell.
     :type: Cell
+    :param pool: A pool to release the deleted cell to.
+    :type pool: CellPool
     """
-    assert after_me.next and not isinstance(after_me.next, BottomSentinel)
-    assert not isinstance(after_me, BottomSentinel)
+    assert after_me.next and not after_me.next.is_bottom_sentinel
+    assert not after_me.is_bottom_sentinel
 
     is_doubly_linked = after_me.is_doubly_linked
+    deleted_cell = after_me.next
 
     if after_me.next.next:
         after_me.next = after_me.next.next
@@ -129,6 +432,9 @@ def delete_cell(after_me):
     else:
         after_me.next = None
 
+    if pool is not None:
+        pool.release(deleted_cell)
+
 
 def insert_cell(after_me, new_cell):
     """Insert a new cell after the cell.
@@ -140,7 +446,7 @@ def insert_cell(after_me, new_cell):
     :param new_cell: The new cell to insert.
     :type: Cell
     """
-    assert not isinstance(new_cell, Sentinel)
+    assert not new_cell.is_sentinel
     is_doubly_linked = after_me.is_doubly_linked
     if is_doubly_linked:
         assert new_cell.is_doubly_linked
@@ -160,24 +466,31 @@ def add_at_end(top_cell, new_cell):
     of the input list and M and K are fixed (and negligible at big N),
     so the algorithm's runtime is O(N).
 
+    A doubly linked list knows its bottom sentinel, so there's nothing to
+    search for and the runtime is O(1). The `LinkedList` handle makes it
+    O(1) for singly linked lists too, by keeping track of the last cell.
+
     :param top_cell: The list's first cell.
     :type top_cell: TopSentinel
     :param new_cell: The new cell to add at the end.
     :type new_cell: Cell
     :rtype: TopSentinel
     """
-    assert isinstance(top_cell, TopSentinel)
+    assert top_cell.is_top_sentinel
 
     is_doubly_linked = top_cell.is_doubly_linked
     if is_doubly_linked:
         assert new_cell.is_doubly_linked
 
     def is_last(cell):
-        return isinstance(cell, BottomSentinel) or not cell.next
+        return cell.is_bottom_sentinel or not cell.next
 
-    last_cell = top_cell
-    while not is_last(last_cell):
-        last_cell = last_cell.next
+    if is_doubly_linked:
+        last_cell = top_cell.bottom_sentinel
+    else:
+        last_cell = top_cell
+        while not is_last(last_cell):
+            last_cell = last_cell.next
 
     # Got the last cell. Now adjust the cell links.
     if is_doubly_linked:
@@ -204,7 +517,7 @@ def add_at_beginning(top_cell, new_cell):
     :type new_cell: Cell
     :rtype: TopSentinel
     """
-    assert isinstance(top_cell, TopSentinel)
+    assert top_cell.is_top_sentinel
 
     is_doubly_linked = top_cell.is_doubly_linked
     if is_doubly_linked:
@@ -219,6 +532,159 @@ def add_at_beginning(top_cell, new_cell):
     return top_cell
 
 
+def make_empty_list_like(top_cell):
+    """Return a new empty list of the same kind of cells as the given list.
+
+    :type top_cell: TopSentinel
+    :rtype: TopSentinel
+    """
+    new_top_cell = top_cell.new_top_sentinel()
+    if new_top_cell.is_doubly_linked:
+        bottom_cell = new_top_cell.new_bottom_sentinel()
+        bottom_cell.prev = new_top_cell
+        new_top_cell.next = bottom_cell
+        new_top_cell.bottom_sentinel = bottom_cell
+    return new_top_cell
+
+
+def find_last_cell(top_cell):
+    """Return the list's last cell, or the top sentinel if the list is empty.
+
+    Doubly linked lists know it from the bottom sentinel, so it takes O(1)
+    time for them and O(N) time for singly linked lists.
+
+    :type top_cell: TopSentinel
+    :rtype: Cell
+    """
+    assert top_cell.is_top_sentinel
+    if top_cell.is_doubly_linked:
+        return top_cell.bottom_sentinel.prev
+    last_cell = top_cell
+    while last_cell.next:
+        last_cell = last_cell.next
+    return last_cell
+
+
+def find_cell_before_cell(top_cell, cell):
+    """Return the cell before the given cell of the list.
+
+    Doubly linked cells know it, so it takes O(1) time for them and O(N)
+    time for singly linked lists.
+
+    :type top_cell: TopSentinel
+    :type cell: Cell
+    :rtype: Cell
+    """
+    if cell.is_doubly_linked:
+        return cell.prev
+    cell_before = top_cell
+    while cell_before.next is not cell:
+        cell_before = cell_before.next
+        assert cell_before, "The cell is not in the list."
+    return cell_before
+
+
+def splice(after_me, first, last):
+    """Insert a chain of cells, from `first` to `last`, after the cell.
+
+    The chain must not be a part of a list, e.g. it was taken out of one with
+    `extract_range`. Only the links at the ends of the chain change, so this
+    takes O(1) time whatever the length of the chain.
+
+    :param after_me: The cell after which insert the cells.
+    :type after_me: Cell
+    :type first: Cell
+    :type last: Cell
+    """
+    assert not after_me.is_bottom_sentinel
+    assert not first.is_sentinel and not last.is_sentinel
+    last.next = after_me.next
+    after_me.next = first
+    if after_me.is_doubly_linked:
+        assert first.is_doubly_linked
+        first.prev = after_me
+        last.next.prev = last
+
+
+def unlink_range(after_me, last):
+    """Take the cells after `after_me` up to and including `last` out of the
+    list, and return the first of them. Takes O(1) time.
+
+    The taken out cells still link to each other, with `last.next` (and
+    `first.prev`) cleared.
+
+    :type after_me: Cell
+    :type last: Cell
+    :rtype: Cell
+    """
+    first = after_me.next
+    assert first and not first.is_bottom_sentinel
+    assert not last.is_sentinel
+    after_me.next = last.next
+    if after_me.is_doubly_linked:
+        last.next.prev = after_me
+        first.prev = None
+    last.next = None
+    return first
+
+
+def extract_range(top_cell, first, last):
+    """Move the cells from `first` to `last` out of the list into a new list,
+    and return the new list's top sentinel.
+
+    It takes O(1) time for doubly linked lists. A singly linked list has to
+    be searched for the cell before `first`, in O(N) time; in case that cell
+    is known, `unlink_range` does the job in O(1) time.
+
+    :type top_cell: TopSentinel
+    :type first: Cell
+    :type last: Cell
+    :rtype: TopSentinel
+    """
+    assert top_cell.is_top_sentinel
+    after_me = find_cell_before_cell(top_cell, first)
+    unlink_range(after_me, last)
+    new_top_cell = make_empty_list_like(top_cell)
+    splice(new_top_cell, first, last)
+    return new_top_cell
+
+
+def split_at(top_cell, cell):
+    """Split the list in two at the cell: the cell and the cells after it
+    move to a new list, whose top sentinel is returned.
+
+    The cells stay in place and only the links at the split point change, so
+    it takes O(1) time for doubly linked lists, while a singly linked list
+    has to be searched for the cell before the given one in O(N) time.
+
+    :type top_cell: TopSentinel
+    :type cell: Cell
+    :rtype: TopSentinel
+    """
+    return extract_range(top_cell, cell, find_last_cell(top_cell))
+
+
+def concat(top_cell, other_top_cell):
+    """Move all the cells of the other list to the end of the list.
+
+    The other list is left empty. For doubly linked lists both ends are
+    known, so it takes O(1) time. Singly linked lists have to be searched
+    for their last cells, in O(N + M) time.
+
+    :type top_cell: TopSentinel
+    :type other_top_cell: TopSentinel
+    :rtype: TopSentinel
+    """
+    assert top_cell.is_top_sentinel and other_top_cell.is_top_sentinel
+    assert top_cell.is_doubly_linked == other_top_cell.is_doubly_linked
+    last = find_last_cell(other_top_cell)
+    if last is other_top_cell:  # Nothing to move.
+        return top_cell
+    first = unlink_range(other_top_cell, last)
+    splice(find_last_cell(top_cell), first, last)
+    return top_cell
+
+
 def find_cell_before__sentinel(top_cell, value):
     """Find the cell before the cell containing the target value.
     
@@ -234,7 +700,7 @@ def find_cell_before__sentinel(top_cell, value):
     
     Worst-case performance is O(N).
     """
-    assert isinstance(top_cell, Sentinel)
+    assert top_cell.is_sentinel
     cell_before = top_cell
     while cell_before.next:
         if cell_before.next.value == value:
@@ -260,7 +726,7 @@ def find_cell_before__no_sentinel(top_cell, value):
         
     Worst-case performance is O(N).
     """
-    assert not isinstance(top_cell, Sentinel)
+    assert not top_cell or not top_cell.is_sentinel
     if not top_cell:  # Need this, otherwise can then fail with AttributeError.
         return
     cell_before = top_cell
@@ -286,13 +752,20 @@ def find_cell(top_cell, value):
         current_cell = current_cell.next
 
 
-def iterate(top_cell):
+def iterate(top_cell, guarded=False):
     """Iterate over the linked list represented by its top cell.
 
     :param top_cell: The list's first cell.
     :type top_cell: Cell
+    :param guarded: Raise `LoopError` in case the list has a loop, instead
+        of iterating forever. See `iterate__guarded`.
+    :type guarded: bool
     """
-    if isinstance(top_cell, TopSentinel):
+    if guarded:
+        yield from iterate__guarded(top_cell)
+        return
+
+    if top_cell and top_cell.is_top_sentinel:
         use_sentinel = True
         current_cell = top_cell.next
         if not current_cell:  # Empty list.
@@ -302,43 +775,97 @@ def iterate(top_cell):
         current_cell = top_cell
 
     def is_last(cell):
-        return (use_sentinel and isinstance(cell, BottomSentinel)) or not cell
+        return not cell or (use_sentinel and cell.is_bottom_sentinel)
 
     while not is_last(current_cell):
         yield current_cell
         current_cell = current_cell.next
 
 
-def make_list(values, use_sentinel=True, is_doubly_linked=False):
+def iterate__guarded(top_cell):
+    """Iterate over the linked list, raising `LoopError` in case it has a
+    loop.
+
+    A loop is detected with the Brent's algorithm along the way: a marker
+    cell is left behind and moved to the current cell every time the number
+    of steps reaches the next power of two. In case the iteration comes back
+    to the marker, the list has a loop. That's one comparison per cell and
+    no extra memory, and the iteration stops within a few rounds of the loop.
+
+    :param top_cell: The list's first cell.
+    :type top_cell: Cell
+    :raises LoopError:
+    """
+    current_cell = top_cell
+    if top_cell and top_cell.is_top_sentinel:
+        use_sentinel = True
+        current_cell = top_cell.next
+    else:
+        use_sentinel = False
+
+    marker = None
+    steps = limit = 1
+    while current_cell and not (use_sentinel and
+                                current_cell.is_bottom_sentinel):
+        if current_cell is marker:
+            raise LoopError("The list has a loop.")
+        yield current_cell
+        if steps == limit:
+            marker = current_cell
+            limit *= 2
+            steps = 0
+        steps += 1
+        current_cell = current_cell.next
+
+
+def make_list(values, use_sentinel=True, is_doubly_linked=False,
+              compact=False, pool=None):
     """A helper to create a linked list based on the given values.
 
+    The values are consumed one by one, so they can come from a generator of
+    any length, and no intermediate copy of them is made. A list using a
+    sentinel may be empty, a list not using one needs at least one value.
+
     :param values: An iterable of cell values.
     :type use_sentinel: bool
     :type is_doubly_linked: bool
+    :param compact: Build the list of the `__slots__`-based cells
+        (`SinglyCell`/`DoublyCell` and their sentinels) instead of `Cell`.
+    :type compact: bool
+    :param pool: A pool to take the cells from, other than the sentinels and
+        the top cell. Its cells must be of the same kind as the list's.
+    :type pool: CellPool
     :return: A top cell of the created list.
     :rtype: Cell | TopSentinel
     """
-    assert len(values) > 0
-
-    if use_sentinel:
+    if compact:
+        if use_sentinel:
+            top_cell = DoublyTopSentinel() if is_doubly_linked \
+                else SinglyTopSentinel()
+        else:
+            top_cell = DoublyCell() if is_doubly_linked else SinglyCell()
+    elif use_sentinel:
         top_cell = TopSentinel(is_doubly_linked)
-        values = [None] + list(values)
     else:
         top_cell = Cell(is_doubly_linked=is_doubly_linked)
 
+    values = iter(values)
+    if not use_sentinel:
+        first_values = list(islice(values, 1))
+        assert first_values
+        top_cell.value = first_values[0]
+
+    new_cell = top_cell.new_cell if pool is None else pool.new_cell
     current_cell = top_cell
-    last_cell_index = len(values) - 1
-    for i, value in enumerate(values):
-        current_cell.value = value
-        if i < last_cell_index:
-            next_cell = Cell(is_doubly_linked=is_doubly_linked)
-            current_cell.next = next_cell
-            if is_doubly_linked:
-                next_cell.prev = current_cell
-            current_cell = next_cell
+    for value in values:
+        next_cell = new_cell(value)
+        current_cell.next = next_cell
+        if is_doubly_linked:
+            next_cell.prev = current_cell
+        current_cell = next_cell
 
     if use_sentinel and is_doubly_linked:
-        bottom_cell = BottomSentinel()
+        bottom_cell = top_cell.new_bottom_sentinel()
         bottom_cell.prev = current_cell
         current_cell.next = bottom_cell
         top_cell.bottom_sentinel = bottom_cell
@@ -0,0 +1,341 @@
+from array import array
+
+from .algorithms import make_list, iterate
+
+NIL = -1
+TOP = 0  # Index of the top sentinel.
+BOTTOM = 1  # Index of the bottom sentinel.
+
+
+class ArrayLinkedList(object):
+    """A doubly linked list with sentinels, stored in parallel arrays.
+
+    Instead of a separate `Cell` object per item, a cell here is an index:
+    `next[i]` and `prev[i]` hold the indices of the neighbouring cells and
+    `values[i]` holds the cell's value. The links are kept in typed
+    `array('l')` buffers, so a list of N cells is three flat blocks of
+    memory rather than N heap objects, which keeps the garbage collector
+    out of the way and makes copying a bulk memory copy.
+
+    The top and bottom sentinels occupy the indices `TOP` and `BOTTOM`.
+    Slots of deleted cells are chained through `next` into a free list and
+    reused by the following insertions.
+
+    The operations follow `algorithms.py`, except that they take and return
+    cell indices instead of cells.
+
+    Numeric values can be stored in a typed array too, given its `typecode`.
+    Then a list whose cells sit in the slots in their list order (see
+    `sequential` and `compact`) exposes its values as one contiguous buffer,
+    which is what `to_array` and `to_numpy` take advantage of.
+    """
+
+    def __init__(self, values=(), typecode=None):
+        """
+        :param values: An iterable of the initial values.
+        :param typecode: The `array` type code of the values, in case they
+            are to be stored in a typed array rather than a list.
+        """
+        self.next = array('l', (BOTTOM, NIL))
+        self.prev = array('l', (NIL, TOP))
+        self.typecode = typecode
+        if typecode is None:
+            self.empty = None
+            self.values = [None, None]
+        else:
+            self.empty = 0
+            self.values = array(typecode, (0, 0))
+        self.free = NIL  # Head of the free slots chain.
+        self.size = 0
+        # Whether the cells are in the slots 2, 3, ... in their list order.
+        self.sequential = True
+        self.extend(values)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        values = self.values
+        for index in self.iterate():
+            yield values[index]
+
+    def extend(self, values):
+        """Add the values at the end of the list in bulk.
+
+        The new cells take fresh slots at the end of the arrays, which are
+        linked to each other with a couple of `array` constructions, so the
+        work is done in C rather than cell by cell.
+        """
+        if self.typecode is None:
+            values = list(values)
+        else:
+            values = as_typed_array(values, self.typecode)
+        if not values:
+            return
+        first = len(self.values)
+        last = first + len(values) - 1
+        self.next.extend(range(first + 1, last + 2))
+        self.next[last] = BOTTOM
+        self.prev.extend(range(first - 1, last))
+        self.values.extend(values)
+
+        tail = self.prev[BOTTOM]
+        self.next[tail] = first
+        self.prev[first] = tail
+        self.prev[BOTTOM] = last
+        self.size += len(values)
+
+    def _allocate(self, value):
+        """Return a free slot holding the given value."""
+        index = self.free
+        if index != NIL:
+            self.free = self.next[index]
+            self.values[index] = value
+        else:
+            index = len(self.values)
+            self.next.append(NIL)
+            self.prev.append(NIL)
+            self.values.append(value)
+        return index
+
+    def _release(self, index):
+        self.values[index] = self.empty  # Don't keep the value alive.
+        self.prev[index] = NIL
+        self.next[index] = self.free
+        self.free = index
+
+    def insert_cell(self, after_me, value):
+        """Insert a new cell after the cell and return its index.
+
+        This operation takes only a few steps, so it runs in O(1) time.
+        """
+        assert after_me != BOTTOM
+        new_cell = self._allocate(value)
+        if self.sequential:  # Unless the cell was added at the end.
+            self.sequential = after_me == self.prev[BOTTOM] and \
+                new_cell == self.size + 2
+        next_cell = self.next[after_me]
+        self.next[new_cell] = next_cell
+        self.prev[new_cell] = after_me
+        self.next[after_me] = new_cell
+        self.prev[next_cell] = new_cell
+        self.size += 1
+        return new_cell
+
+    def delete_cell(self, after_me):
+        """Delete the cell after the given cell, releasing its slot.
+
+        This operation takes only a few steps, so it runs in O(1) time.
+        """
+        assert after_me != BOTTOM
+        cell = self.next[after_me]
+        assert cell != BOTTOM
+        next_cell = self.next[cell]
+        self.next[after_me] = next_cell
+        self.prev[next_cell] = after_me
+        self._release(cell)
+        self.size -= 1
+        self.sequential = False
+
+    def add_at_beginning(self, value):
+        return self.insert_cell(TOP, value)
+
+    def add_at_end(self, value):
+        """Add a new cell at the end of the list.
+
+        The bottom sentinel points at the last cell, so it runs in O(1) time.
+        """
+        return self.insert_cell(self.prev[BOTTOM], value)
+
+    def insert_into_sorted(self, value):
+        """Insert a new cell into the sorted list and return its index.
+
+        Worst-case performance is O(N).
+        """
+        values = self.values
+        next_ = self.next
+        after_me = TOP
+        next_cell = next_[after_me]
+        while next_cell != BOTTOM and values[next_cell] < value:
+            after_me = next_cell
+            next_cell = next_[after_me]
+        return self.insert_cell(after_me, value)
+
+    def find_cell_before(self, value):
+        """Return the index of the cell before the cell containing the value.
+
+        Worst-case performance is O(N).
+        """
+        values = self.values
+        next_ = self.next
+        cell_before = TOP
+        next_cell = next_[cell_before]
+        while next_cell != BOTTOM:
+            if values[next_cell] == value:
+                return cell_before
+            cell_before = next_cell
+            next_cell = next_[cell_before]
+
+    def find_cell(self, value):
+        """Return the index of the cell containing the value.
+
+        Worst-case performance is O(N).
+        """
+        cell_before = self.find_cell_before(value)
+        if cell_before is not None:
+            return self.next[cell_before]
+
+    def iterate(self):
+        """Iterate over the indices of the list's cells."""
+        next_ = self.next
+        cell = next_[TOP]
+        while cell != BOTTOM:
+            yield cell
+            cell = next_[cell]
+
+    def copy_list(self):
+        """Return a copy of the list.
+
+        The cell indices are preserved, so the copy is a bulk copy of the
+        arrays rather than a walk through the cells.
+        """
+        new_list = ArrayLinkedList(typecode=self.typecode)
+        new_list.next = self.next[:]
+        new_list.prev = self.prev[:]
+        new_list.values = self.values[:]
+        new_list.free = self.free
+        new_list.size = self.size
+        new_list.sequential = self.sequential
+        return new_list
+
+    def compact(self):
+        """Move the cells into the slots 2, 3, ... in their list order,
+        dropping the free slots. Takes O(N) time.
+        """
+        if self.sequential and self.free == NIL:
+            return
+        values = self.values
+        ordered_values = (values[index] for index in self.iterate())
+        if self.typecode is None:
+            self.values = [None, None]
+        else:
+            self.values = array(self.typecode, (0, 0))
+        self.values.extend(ordered_values)
+        last = len(self.values) - 1
+        self.next = array('l', range(1, last + 2))
+        self.prev = array('l', range(-1, last))
+        self.next[BOTTOM] = NIL
+        if self.size:
+            self.next[TOP] = 2
+            self.next[last] = BOTTOM
+            self.prev[2] = TOP
+            self.prev[BOTTOM] = last
+        else:
+            self.next[TOP] = BOTTOM
+            self.prev[BOTTOM] = TOP
+        self.free = NIL
+        self.sequential = True
+
+    def values_view(self):
+        """Return a `memoryview` of the values of a sequential list, in the
+        list order, sharing the memory with the list.
+        """
+        assert self.sequential and self.typecode is not None
+        return memoryview(self.values)[2:2 + self.size]
+
+    def to_array(self, out=None):
+        """Copy the values, in the list order, into a typed array and return
+        it.
+
+        :param out: A preallocated writable buffer (e.g. `array` or
+            `numpy.ndarray`) of at least `len(self)` items to copy the values
+            into. A new `array` of the list's type code is made if not given.
+        """
+        if out is None:
+            if self.sequential and self.typecode is not None:
+                return self.values[2:2 + self.size]  # A memory copy.
+            values = self.values
+            return array(self.typecode or 'd',
+                         (values[index] for index in self.iterate()))
+
+        target = memoryview(out)
+        assert len(target) >= self.size
+        if self.sequential and self.typecode is not None \
+                and target.format == self.values_view().format:
+            target[:self.size] = self.values_view()  # A memory copy.
+        else:
+            values = self.values
+            for i, index in enumerate(self.iterate()):
+                target[i] = values[index]
+        return out
+
+    def to_numpy(self, view=True):
+        """Return the values, in the list order, as a NumPy array.
+
+        :param view: Share the memory with the list instead of copying the
+            values. Requires a typed sequential list (see `compact`). While
+            the view exists, the list can't grow its arrays.
+        """
+        import numpy
+        if view:
+            return numpy.frombuffer(self.values_view(),
+                                    dtype=self.values_view().format)
+        return numpy.array(self.to_array())
+
+    @classmethod
+    def from_array(cls, data, typecode=None):
+        """Make a typed list of the values of a NumPy array or any other
+        buffer-protocol object, in bulk.
+
+        :param typecode: The type code of the values, by default the format
+            of the buffer.
+        """
+        typecode = typecode or memoryview(data).format
+        return cls(data, typecode)
+
+
+def as_typed_array(values, typecode):
+    """Return the values as an `array` of the type code.
+
+    A buffer of the same item format is copied in bulk, anything else is
+    converted item by item.
+    """
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array(typecode, values)
+    typed = array(typecode)
+    if view.format == typecode and view.ndim == 1 and view.c_contiguous:
+        typed.frombytes(view.cast('B'))
+    else:
+        typed.extend(view.tolist())
+    return typed
+
+
+def make_list_from_array(data, use_sentinel=True, is_doubly_linked=False,
+                         compact=True):
+    """Make a linked list of the values of a NumPy array or any other
+    buffer-protocol object, see `make_list`.
+
+    The values are read straight from the buffer as Python numbers, with no
+    intermediate list (and no NumPy scalar objects).
+    """
+    return make_list(memoryview(data), use_sentinel, is_doubly_linked,
+                     compact)
+
+
+def list_to_array(top_cell, out=None, typecode='d'):
+    """Copy the values of a linked list into a typed array and return it.
+
+    :param out: A preallocated writable buffer (e.g. `array` or
+        `numpy.ndarray`) large enough for the values. A new `array` of the
+        type code is made if not given.
+    """
+    if out is None:
+        return array(typecode, (cell.value for cell in iterate(top_cell)))
+    target = memoryview(out)
+    for i, cell in enumerate(iterate(top_cell)):
+        target[i] = cell.value
+    return out
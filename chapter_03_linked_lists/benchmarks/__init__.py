@@ -0,0 +1,464 @@
+"""Ad-hoc benchmarks for the linked list implementations.
+
+Run with `python -m chapter_03_linked_lists.benchmarks`.
+See `benchmarks.suite` for the sweep of the algorithms over sizes and list
+variants, with JSON output and regression checks.
+"""
+import functools
+import gc
+import io
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ..algorithms import make_list, copy_list, insertion_sort, merge_sort, \
+    iterate, find_cell, find_cell_before__sentinel, concat, merge_k, \
+    add_at_end, delete_cell
+from ..array_list import ArrayLinkedList, make_list_from_array, \
+    list_to_array
+from ..caches import LRUCache, LFUCache
+from ..concurrent_list import ConcurrentSortedList, LockingCell
+from ..linked_list import LinkedList
+from ..loops import has_loop__hash_set, has_loop__tortoise_and_hare, \
+    has_loop__brent
+from ..persistence import dump, load, MappedList
+from ..pools import CellPool
+from ..unrolled_list import UnrolledLinkedList
+
+
+def measure_memory(build):
+    """Return the number of bytes allocated by `build()` and still alive.
+
+    The built object is kept referenced until the measurement is taken.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def benchmark_memory(size=100000):
+    """Compare bytes per node of the `Cell` and the compact cell lists."""
+    values = list(range(size))
+    rows = []
+    for is_doubly_linked in (False, True):
+        for compact in (False, True):
+            allocated = measure_memory(
+                lambda: make_list(values, is_doubly_linked=is_doubly_linked,
+                                  compact=compact))
+            rows.append((is_doubly_linked, compact, allocated / size))
+    return rows
+
+
+def measure_time(function, *args):
+    """Return the wall time in seconds of a single `function(*args)` call."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_array_list(size=1000000):
+    """Compare building and copying `make_list` and `ArrayLinkedList` lists.
+    """
+    values = list(range(size))
+    top_cell = make_list(values, is_doubly_linked=True)
+    array_list = ArrayLinkedList(values)
+    return [
+        ('make_list', measure_time(make_list, values, True, True)),
+        ('ArrayLinkedList', measure_time(ArrayLinkedList, values)),
+        ('copy_list', measure_time(copy_list, top_cell)),
+        ('ArrayLinkedList.copy_list', measure_time(array_list.copy_list)),
+    ]
+
+
+def sort_builtin(top_cell):
+    """The baseline: sort the values out of the list and rebuild it."""
+    return make_list(sorted([cell.value for cell in iterate(top_cell)]))
+
+
+def benchmark_sort(sizes=(1000, 10000, 100000, 1000000),
+                   max_insertion_sort_size=10000):
+    """Compare `merge_sort`, `insertion_sort` and `sorted()` on random and on
+    already sorted lists. Insertion sort is skipped for the larger sizes, as
+    it's quadratic.
+    """
+    rows = []
+    for size in sizes:
+        for order in ('random', 'sorted'):
+            values = list(range(size))
+            if order == 'random':
+                random.shuffle(values)
+            for name, sort in (('merge_sort', merge_sort),
+                               ('insertion_sort', insertion_sort),
+                               ('sorted', sort_builtin)):
+                if sort is insertion_sort and size > max_insertion_sort_size:
+                    continue
+                top_cell = make_list(values)
+                rows.append((size, order, name, measure_time(sort, top_cell)))
+    return rows
+
+
+def benchmark_merge(size=1000000, run_counts=(2, 16, 128)):
+    """Compare merging sorted runs by concatenating and sorting them against
+    the k-way merge.
+    """
+    results = []
+    for run_count in run_counts:
+        def make_runs():
+            return [make_list(sorted(random.random()
+                                     for _ in range(size // run_count)),
+                              compact=True)
+                    for _ in range(run_count)]
+
+        def concat_and_sort(runs):
+            for run in runs[1:]:
+                concat(runs[0], run)
+            merge_sort(runs[0])
+
+        results.append((run_count, 'concat + merge_sort',
+                        measure_time(concat_and_sort, make_runs())))
+        results.append((run_count, 'merge_k',
+                        measure_time(merge_k, make_runs())))
+    return results
+
+
+def ordered_dict_lru(capacity):
+    """The baseline: the usual `OrderedDict` based LRU cache."""
+    cache = OrderedDict()
+
+    def get_or_compute(key, compute):
+        try:
+            cache.move_to_end(key)
+            return cache[key]
+        except KeyError:
+            value = cache[key] = compute()
+            if len(cache) > capacity:
+                cache.popitem(last=False)
+            return value
+    return get_or_compute
+
+
+def benchmark_caches(operations=200000, capacity=1000, key_space=2000):
+    """Compare the throughput (operations per second) of the memoizing
+    caches on random keys, with about a half of the keys fitting in.
+    """
+    keys = [random.randrange(key_space) for _ in range(operations)]
+
+    def compute():
+        return None
+
+    def run_functools():
+        cached = functools.lru_cache(maxsize=capacity)(lambda key: None)
+        for key in keys:
+            cached(key)
+
+    def run_get_or_compute(get_or_compute):
+        for key in keys:
+            get_or_compute(key, compute)
+
+    return [
+        ('functools.lru_cache', operations / measure_time(run_functools)),
+        ('OrderedDict', operations / measure_time(
+            run_get_or_compute, ordered_dict_lru(capacity))),
+        ('LRUCache', operations / measure_time(
+            run_get_or_compute, LRUCache(capacity).get_or_compute)),
+        ('LFUCache', operations / measure_time(
+            run_get_or_compute, LFUCache(capacity).get_or_compute)),
+    ]
+
+
+def benchmark_concurrent_list(thread_counts=(1, 2, 4, 8, 16),
+                              operations=20000, key_space=2000):
+    """Compare the throughput (operations per second) of
+    `ConcurrentSortedList` with a sorted list behind one global lock,
+    running a mix of 80% lookups, 10% inserts and 10% deletes split across
+    the threads.
+
+    Note that CPython runs Python code one thread at a time, so the numbers
+    show the cost of the contention rather than a parallel speedup.
+    """
+    rows = []
+    for thread_count in thread_counts:
+        initial = list(range(0, key_space, 2))
+
+        concurrent_list = ConcurrentSortedList(initial)
+
+        def concurrent_work(seed):
+            rng = random.Random(seed)
+            for _ in range(operations // thread_count):
+                value = rng.randrange(key_space)
+                dice = rng.random()
+                if dice < 0.1:
+                    concurrent_list.insert_into_sorted(LockingCell(value))
+                elif dice < 0.2:
+                    try:
+                        concurrent_list.delete_value(value)
+                    except KeyError:
+                        pass
+                else:
+                    concurrent_list.find_cell(value)
+
+        locked_list = LinkedList()
+        for value in initial:
+            locked_list.add_at_end(locked_list.top_cell.new_cell(value))
+        global_lock = threading.Lock()
+
+        def locked_work(seed):
+            rng = random.Random(seed)
+            new_cell = locked_list.top_cell.new_cell
+            for _ in range(operations // thread_count):
+                value = rng.randrange(key_space)
+                dice = rng.random()
+                with global_lock:
+                    if dice < 0.1:
+                        locked_list.insert_into_sorted(new_cell(value))
+                    elif dice < 0.2:
+                        cell_before = find_cell_before__sentinel(
+                            locked_list.top_cell, value)
+                        if cell_before:
+                            locked_list.delete_cell(cell_before)
+                    else:
+                        find_cell(locked_list.top_cell, value)
+
+        for name, work in (('ConcurrentSortedList', concurrent_work),
+                           ('global lock', locked_work)):
+            def run():
+                with ThreadPoolExecutor(max_workers=thread_count) as executor:
+                    list(executor.map(work, range(thread_count)))
+            rows.append((thread_count, name, operations / measure_time(run)))
+    return rows
+
+
+def benchmark_loops(size=1000000):
+    """Compare the loop detection strategies on a list with no loop and on a
+    list looping back to its middle, and the cost of the guarded iteration.
+    """
+    top_cell = make_list(range(size))
+    cells = list(iterate(top_cell))
+    rows = []
+
+    def consume(cells):
+        for _ in cells:
+            pass
+
+    rows.append(('iterate', 'no loop', measure_time(
+        consume, iterate(top_cell))))
+    rows.append(('iterate(guarded=True)', 'no loop', measure_time(
+        consume, iterate(top_cell, guarded=True))))
+    for has_loop in (has_loop__hash_set, has_loop__tortoise_and_hare,
+                     has_loop__brent):
+        rows.append((has_loop.__name__, 'no loop',
+                     measure_time(has_loop, top_cell)))
+    cells[-1].next = cells[size // 2]
+    for has_loop in (has_loop__hash_set, has_loop__tortoise_and_hare,
+                     has_loop__brent):
+        rows.append((has_loop.__name__, 'loop',
+                     measure_time(has_loop, top_cell)))
+    cells[-1].next = None
+    return rows
+
+
+def benchmark_array_round_trip(size=1000000):
+    """Compare round trips of numeric values from a typed array to a list
+    and back.
+    """
+    data = array('d', range(size))
+
+    def cells_baseline():
+        top_cell = make_list(list(data))
+        return array('d', [cell.value for cell in iterate(top_cell)])
+
+    def cells_fast_path():
+        top_cell = make_list_from_array(data)
+        return list_to_array(top_cell, array('d', bytes(8 * size)))
+
+    def array_list():
+        return ArrayLinkedList.from_array(data).to_array()
+
+    return [
+        ('make_list + list comprehension', measure_time(cells_baseline)),
+        ('make_list_from_array + list_to_array',
+         measure_time(cells_fast_path)),
+        ('ArrayLinkedList from_array + to_array', measure_time(array_list)),
+    ]
+
+
+def benchmark_persistence(size=1000000):
+    """Compare saving and restoring a list of floats.
+
+    Pickling the cells recurses through the links and fails on a list this
+    long, so the baseline pickles the values and rebuilds the list.
+    """
+    top_cell = make_list((random.random() for _ in range(size)),
+                         compact=True)
+
+    def pickle_values():
+        data = pickle.dumps([cell.value for cell in iterate(top_cell)])
+        return make_list(pickle.loads(data), compact=True)
+
+    def dump_load():
+        file = io.BytesIO()
+        dump(top_cell, file)
+        file.seek(0)
+        return load(file, compact=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'list.bin')
+        with open(path, 'wb') as file:
+            dump(top_cell, file)
+
+        def mapped_sum():
+            with MappedList(path) as mapped_list:
+                return sum(mapped_list)
+
+        mapped_seconds = measure_time(mapped_sum)
+
+    return [
+        ('pickle values + make_list', measure_time(pickle_values)),
+        ('dump + load', measure_time(dump_load)),
+        ('MappedList iteration', mapped_seconds),
+    ]
+
+
+def benchmark_unrolled_list(size=1000000, block_sizes=(1, 4, 16, 64, 256)):
+    """Compare the memory per value, and the times to iterate over the list
+    and to find its last value, of the cell lists and the unrolled lists with
+    blocks of K values.
+    """
+    values = range(size)
+
+    def measure(name, build, iterate_values, find_last):
+        data = build()
+        per_value = measure_memory(build) / size
+        return (name, per_value,
+                measure_time(lambda: sum(iterate_values(data))),
+                measure_time(find_last, data))
+
+    results = [
+        measure('Cell',
+                lambda: make_list(values),
+                lambda top_cell: (cell.value for cell in iterate(top_cell)),
+                lambda top_cell: find_cell(top_cell, size - 1)),
+        measure('SinglyCell',
+                lambda: make_list(values, compact=True),
+                lambda top_cell: (cell.value for cell in iterate(top_cell)),
+                lambda top_cell: find_cell(top_cell, size - 1)),
+    ]
+    for block_size in block_sizes:
+        for typecode in (None, 'l'):
+            results.append(measure(
+                'unrolled K={}{}'.format(
+                    block_size, ' array' if typecode else ''),
+                lambda: UnrolledLinkedList(values, block_size, typecode),
+                iter,
+                lambda unrolled_list: unrolled_list.find_cell(size - 1)))
+    return results
+
+
+def benchmark_cell_pool(operations=1000000, queue_size=1000):
+    """Compare a steady-state queue, adding a cell at the end and deleting
+    the first one, with and without a cell pool, with the garbage collector
+    enabled and disabled.
+
+    CPython already keeps free lists of small objects, so a new cell is
+    cheap, and the pool's own bookkeeping in Python takes about as long. The
+    pool pays off mostly by sparing the collector the allocations, when the
+    gc is enabled and the cells are compact.
+    """
+    def run_queue(compact, use_pool):
+        top_cell = make_list(range(queue_size), is_doubly_linked=True,
+                             compact=compact)
+        pool = CellPool(top_cell.new_cell) if use_pool else None
+        new_cell = pool.new_cell if use_pool else top_cell.new_cell
+        for value in range(operations):
+            add_at_end(top_cell, new_cell(value))
+            delete_cell(top_cell, pool)
+
+    results = []
+    for gc_enabled in (True, False):
+        if gc_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+        try:
+            for compact in (False, True):
+                for use_pool in (False, True):
+                    results.append((
+                        'gc on' if gc_enabled else 'gc off',
+                        'DoublyCell' if compact else 'Cell',
+                        'pool' if use_pool else 'no pool',
+                        measure_time(run_queue, compact, use_pool)))
+        finally:
+            gc.enable()
+    return results
+
+
+def main():
+    print("Bytes per node:")
+    for is_doubly_linked, compact, per_node in benchmark_memory():
+        print("  {:<7} {:<8} {:>8.1f}".format(
+            'doubly' if is_doubly_linked else 'singly',
+            'compact' if compact else 'Cell',
+            per_node))
+
+    print("Seconds to build/copy a doubly linked list of 1e6 values:")
+    for name, seconds in benchmark_array_list():
+        print("  {:<26} {:>8.4f}".format(name, seconds))
+
+    print("Seconds to sort a singly linked list:")
+    for size, order, name, seconds in benchmark_sort():
+        print("  {:>8} {:<7} {:<15} {:>8.4f}".format(
+            size, order, name, seconds))
+
+    print("Seconds to merge sorted runs of 1e6 cells in total:")
+    for run_count, name, seconds in benchmark_merge():
+        print("  {:>4} {:<20} {:>8.4f}".format(run_count, name, seconds))
+
+    print("Seconds to round trip 1e6 floats through a list:")
+    for name, seconds in benchmark_array_round_trip():
+        print("  {:<38} {:>8.4f}".format(name, seconds))
+
+    print("Seconds to save and restore 1e6 floats:")
+    for name, seconds in benchmark_persistence():
+        print("  {:<26} {:>8.4f}".format(name, seconds))
+
+    print("Unrolled lists of 1e6 ints: bytes per value, seconds to "
+          "iterate, to find the last value:")
+    for name, per_value, iterate_seconds, find_seconds \
+            in benchmark_unrolled_list():
+        print("  {:<20} {:>8.1f} {:>8.4f} {:>8.4f}".format(
+            name, per_value, iterate_seconds, find_seconds))
+
+    print("Seconds for 1e6 enqueue/dequeue operations:")
+    for gc_state, cell_type, pool_state, seconds in benchmark_cell_pool():
+        print("  {:<6} {:<10} {:<7} {:>8.4f}".format(
+            gc_state, cell_type, pool_state, seconds))
+
+    print("Cache operations per second:")
+    for name, throughput in benchmark_caches():
+        print("  {:<20} {:>12,.0f}".format(name, throughput))
+
+    print("Seconds to check a list of 1e6 cells for a loop:")
+    for name, case, seconds in benchmark_loops():
+        print("  {:<28} {:<8} {:>8.4f}".format(name, case, seconds))
+
+    print("Sorted list operations per second, by threads:")
+    for thread_count, name, throughput in benchmark_concurrent_list():
+        print("  {:>2} {:<20} {:>12,.0f}".format(
+            thread_count, name, throughput))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""A benchmark suite sweeping the list algorithms over sizes and variants.
+
+Each algorithm is timed on lists of each size, for each of the singly/doubly
+linked and sentinel/no sentinel variants it supports. The results, in
+nanoseconds per call and peak traced memory per run, are written as JSON,
+along with the growth exponent fitted to each algorithm/variant over the
+sizes: about 0 for O(1), 1 for O(N), 2 for O(N^2) algorithms.
+
+Run with:
+    python -m chapter_03_linked_lists.benchmarks.suite -o results.json
+and later check the results against the saved ones with:
+    python -m chapter_03_linked_lists.benchmarks.suite --compare results.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from ..algorithms import make_list, copy_list, iterate, find_cell, \
+    find_cell_before__sentinel, find_cell_before__no_sentinel, \
+    insert_into_sorted, insertion_sort, add_at_end, add_at_beginning, \
+    delete_cell
+
+SIZES = (100, 1000, 10000, 100000, 1000000)
+# The smallest size measured: the deletions leave a cell, and the searches and
+# insertions draw values out of the list.
+MIN_SIZE = 2
+VARIANTS = [(use_sentinel, is_doubly_linked)
+            for use_sentinel in (True, False)
+            for is_doubly_linked in (False, True)]
+
+Benchmark = namedtuple('Benchmark', 'name setup run calls supports max_size')
+Benchmark.__doc__ = """An algorithm to benchmark.
+
+    :param setup: `setup(size, use_sentinel, is_doubly_linked, compact)`
+        builds the state for a run. It's not timed.
+    :param run: `run(state)` makes `calls(size)` calls of the algorithm.
+    :param supports: `supports(use_sentinel, is_doubly_linked)` tells
+        whether the algorithm works on the variant.
+    :param max_size: The largest size to run, to keep the slow algorithms
+        in check.
+    """
+
+
+def variant_name(use_sentinel, is_doubly_linked):
+    return '{}/{}'.format('doubly' if is_doubly_linked else 'singly',
+                          'sentinel' if use_sentinel else 'no_sentinel')
+
+
+def _any_variant(use_sentinel, is_doubly_linked):
+    return True
+
+
+def _with_sentinel(use_sentinel, is_doubly_linked):
+    return use_sentinel
+
+
+def _without_sentinel(use_sentinel, is_doubly_linked):
+    return not use_sentinel
+
+
+def _one_call(size):
+    return 1
+
+
+def _new_list(size, use_sentinel, is_doubly_linked, compact):
+    return make_list(range(size), use_sentinel, is_doubly_linked, compact)
+
+
+def _new_shuffled_list(size, use_sentinel, is_doubly_linked, compact):
+    values = list(range(size))
+    random.shuffle(values)
+    return make_list(values, use_sentinel, is_doubly_linked, compact)
+
+
+def _new_cells(count):
+    """Make the setup of a list and `count` new cells to add to it."""
+    def setup(size, use_sentinel, is_doubly_linked, compact):
+        top_cell = _new_list(size, use_sentinel, is_doubly_linked, compact)
+        new_cells = [top_cell.new_cell(random.randrange(size))
+                     for _ in range(count)]
+        return top_cell, new_cells
+    return setup
+
+
+def _make_list(state):
+    make_list(*state)
+
+
+def _copy_list(top_cell):
+    copy_list(top_cell)
+
+
+def _iterate(top_cell):
+    for _ in iterate(top_cell):
+        pass
+
+
+def _find_last(find):
+    """Make the run of a search for the last value, the worst case."""
+    def run(state):
+        top_cell, value = state
+        find(top_cell, value)
+    return run
+
+
+def _with_last_value(size, use_sentinel, is_doubly_linked, compact):
+    return _new_list(size, use_sentinel, is_doubly_linked, compact), size - 1
+
+
+def _add_all(add):
+    def run(state):
+        top_cell, new_cells = state
+        for new_cell in new_cells:
+            add(top_cell, new_cell)
+    return run
+
+
+def _deletions(size):
+    return min(size - 1, 1000)
+
+
+def _with_deletions(size, use_sentinel, is_doubly_linked, compact):
+    return (_new_list(size, use_sentinel, is_doubly_linked, compact),
+            _deletions(size))
+
+
+def _delete_first_cells(state):
+    """Delete the cells after the top one, leaving at least one."""
+    top_cell, count = state
+    for _ in range(count):
+        delete_cell(top_cell)
+
+
+BENCHMARKS = [
+    Benchmark('make_list',
+              lambda size, *variant: (range(size),) + variant, _make_list,
+              _one_call, _any_variant, None),
+    Benchmark('copy_list', _new_list, _copy_list,
+              _one_call, _with_sentinel, None),
+    Benchmark('iterate', _new_list, _iterate, _one_call, _any_variant, None),
+    Benchmark('find_cell', _with_last_value, _find_last(find_cell),
+              _one_call, _any_variant, None),
+    Benchmark('find_cell_before__sentinel', _with_last_value,
+              _find_last(find_cell_before__sentinel),
+              _one_call, _with_sentinel, None),
+    Benchmark('find_cell_before__no_sentinel', _with_last_value,
+              _find_last(find_cell_before__no_sentinel),
+              _one_call, _without_sentinel, None),
+    Benchmark('insert_into_sorted', _new_cells(100),
+              _add_all(insert_into_sorted),
+              lambda size: 100, _with_sentinel, None),
+    Benchmark('insertion_sort', _new_shuffled_list, insertion_sort,
+              _one_call,
+              lambda use_sentinel, is_doubly_linked:
+              use_sentinel and not is_doubly_linked,
+              10000),
+    Benchmark('add_at_end', _new_cells(100), _add_all(add_at_end),
+              lambda size: 100, _with_sentinel, None),
+    Benchmark('add_at_beginning', _new_cells(1000), _add_all(add_at_beginning),
+              lambda size: 1000, _with_sentinel, None),
+    Benchmark('delete_cell', _with_deletions, _delete_first_cells,
+              _deletions, _any_variant, None),
+]
+
+
+def time_run(benchmark, size, variant, compact=False, repeat=3):
+    """Return the best time in nanoseconds per call of the algorithm, out of
+    `repeat` runs on a fresh state each.
+    """
+    assert size >= MIN_SIZE
+    best = math.inf
+    for _ in range(repeat):
+        state = benchmark.setup(size, *variant, compact)
+        start = time.perf_counter_ns()
+        benchmark.run(state)
+        best = min(best, time.perf_counter_ns() - start)
+        del state
+    return best / benchmark.calls(size)
+
+
+def measure_peak(benchmark, size, variant, compact=False):
+    """Return the peak memory in bytes allocated during a run, on top of the
+    memory of its state.
+    """
+    state = benchmark.setup(size, *variant, compact)
+    tracemalloc.start()
+    try:
+        benchmark.run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def fit_exponent(sizes, times):
+    """Fit `time = c * size^k` to the measurements, and return k.
+
+    It's the least squares slope of log(time) over log(size).
+    """
+    points = [(math.log(size), math.log(time))
+              for size, time in zip(sizes, times) if time > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / variance
+
+
+def run_suite(sizes=SIZES, names=None, compact=False, repeat=3,
+              log=None):
+    """Run the benchmarks, and return the results as a JSON-ready dict.
+
+    :param names: The names of the benchmarks to run, all by default.
+    :param log: A function called with a line on each measurement.
+    """
+    assert all(size >= MIN_SIZE for size in sizes)
+    results = []
+    exponents = []
+    for benchmark in BENCHMARKS:
+        if names is not None and benchmark.name not in names:
+            continue
+        for variant in VARIANTS:
+            if not benchmark.supports(*variant):
+                continue
+            run_sizes = [size for size in sizes
+                         if benchmark.max_size is None or
+                         size <= benchmark.max_size]
+            times = []
+            for size in run_sizes:
+                ns_per_op = time_run(benchmark, size, variant, compact, repeat)
+                peak = measure_peak(benchmark, size, variant, compact)
+                times.append(ns_per_op)
+                results.append({
+                    'operation': benchmark.name,
+                    'variant': variant_name(*variant),
+                    'size': size,
+                    'ns_per_op': ns_per_op,
+                    'peak_bytes': peak,
+                })
+                if log:
+                    log('{:<30} {:<20} {:>8} {:>14.1f} ns/op {:>12} B'.format(
+                        benchmark.name, variant_name(*variant), size,
+                        ns_per_op, peak))
+            exponents.append({
+                'operation': benchmark.name,
+                'variant': variant_name(*variant),
+                'exponent': fit_exponent(run_sizes, times),
+            })
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'compact': compact,
+        'results': results,
+        'exponents': exponents,
+    }
+
+
+def compare(baseline, current, threshold=0.25, exponent_threshold=0.3):
+    """Compare the results against the baseline ones, and return the
+    regressions.
+
+    A measurement is a regression in case it's slower than the baseline one
+    by more than the threshold fraction, and a growth exponent is one in case
+    it exceeds the baseline one by more than the exponent threshold. The
+    measurements missing from either results are ignored.
+
+    :rtype: list[str]
+    """
+    regressions = []
+    baseline_times = {(result['operation'], result['variant'], result['size']):
+                      result['ns_per_op'] for result in baseline['results']}
+    for result in current['results']:
+        key = (result['operation'], result['variant'], result['size'])
+        if key not in baseline_times:
+            continue
+        ratio = result['ns_per_op'] / baseline_times[key]
+        if ratio > 1 + threshold:
+            regressions.append('{} {} size {}: {:.1f} ns/op, was {:.1f}'
+                               .format(*key, result['ns_per_op'],
+                                       baseline_times[key]))
+
+    baseline_exponents = {(exponent['operation'], exponent['variant']):
+                          exponent['exponent']
+                          for exponent in baseline['exponents']}
+    for exponent in current['exponents']:
+        key = (exponent['operation'], exponent['variant'])
+        was = baseline_exponents.get(key)
+        if exponent['exponent'] is None or was is None:
+            continue
+        if exponent['exponent'] > was + exponent_threshold:
+            regressions.append('{} {}: growth exponent {:.2f}, was {:.2f}'
+                               .format(*key, exponent['exponent'], was))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--operations', nargs='+',
+                        choices=[benchmark.name for benchmark in BENCHMARKS])
+    parser.add_argument('--compact', action='store_true',
+                        help="Use the `__slots__`-based cells.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help="Write the results there.")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Report the regressions against the results "
+                             "saved there, exiting with 1 if there are any.")
+    parser.add_argument('--threshold', type=float, default=0.25)
+    options = parser.parse_args(args)
+    if min(options.sizes) < MIN_SIZE:
+        parser.error('the sizes must be at least {}'.format(MIN_SIZE))
+
+    results = run_suite(options.sizes, options.operations, options.compact,
+                        options.repeat, log=print)
+    for exponent in results['exponents']:
+        if exponent['exponent'] is not None:
+            print('{:<30} {:<20} exponent {:>5.2f}'.format(
+                exponent['operation'], exponent['variant'],
+                exponent['exponent']))
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, results, options.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
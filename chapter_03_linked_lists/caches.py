@@ -0,0 +1,262 @@
+import functools
+import sys
+
+from .algorithms import insert_cell, delete_cell, make_list
+from .models import DoublyCell
+
+
+class CacheCell(DoublyCell):
+    """A cell of a cache's list, holding a cache entry."""
+    __slots__ = ('key', 'size', 'bucket')
+
+    def __init__(self, key, value, size=0):
+        super().__init__(value)
+        self.key = key
+        self.size = size
+        self.bucket = None  # The frequency bucket of an LFU cache entry.
+
+
+class FrequencyBucket(DoublyCell):
+    """A cell of an LFU cache's list of frequencies. Its value is the number
+    of hits, and `cells` is the list of the entries that got that many hits,
+    the most recently used first.
+    """
+    __slots__ = ('cells',)
+
+    def __init__(self, frequency):
+        super().__init__(frequency)
+        self.cells = new_list()
+
+
+def new_list():
+    """Return an empty doubly linked list of the compact cells."""
+    return make_list((), is_doubly_linked=True, compact=True)
+
+
+def is_empty(top_cell):
+    return top_cell.next is top_cell.bottom_sentinel
+
+
+class BaseCache(object):
+    """The bookkeeping shared by the caches: a key -> cell map, the capacity
+    in entries and/or in bytes, the eviction callback and the counters.
+
+    The subclasses decide the order of the entries, through `_add`, `_touch`,
+    `_remove` and `_victim`.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None,
+                 on_evict=None):
+        """
+        :param max_entries: The maximum number of entries, if any.
+        :param max_bytes: The maximum total size of the entries, if any.
+        :param sizeof: A function of a key and a value returning the size of
+            the entry in bytes. Defaults to `sys.getsizeof` of the value.
+        :param on_evict: A function of a key and a value, called for every
+            entry evicted to make room for new ones.
+        """
+        assert max_entries is None or max_entries > 0
+        assert max_bytes is None or max_bytes > 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda key, value: sys.getsizeof(value))
+        self.on_evict = on_evict
+        self.cells = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, key):
+        return key in self.cells
+
+    def get(self, key, default=None):
+        cell = self.cells.get(key)
+        if cell is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(cell)
+        return cell.value
+
+    def put(self, key, value):
+        """Cache the value of the key, evicting entries to make room.
+
+        An entry larger than `max_bytes` could never fit, so it isn't cached,
+        and the other entries stay. An older value of the key is dropped.
+        """
+        size = self.sizeof(key, value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.pop(key, None)
+            return
+        cell = self.cells.get(key)
+        if cell is not None:
+            self.total_bytes += size - cell.size
+            cell.value = value
+            cell.size = size
+            self._touch(cell)
+        else:
+            self._evict(1, size)  # Make room first, not to evict the new one.
+            cell = CacheCell(key, value, size)
+            self.cells[key] = cell
+            self.total_bytes += size
+            self._add(cell)
+        self._evict()
+
+    def pop(self, key, *default):
+        """Remove the entry and return its value, like `dict.pop`."""
+        cell = self.cells.pop(key, None)
+        if cell is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self.total_bytes -= cell.size
+        self._remove(cell)
+        return cell.value
+
+    def clear(self):
+        while self.cells:
+            self.pop(next(iter(self.cells)))
+
+    def _evict(self, new_entries=0, new_bytes=0):
+        """Evict entries until there's room for the new ones."""
+        while self.cells and (
+                (self.max_entries is not None
+                 and len(self.cells) + new_entries > self.max_entries) or
+                (self.max_bytes is not None
+                 and self.total_bytes + new_bytes > self.max_bytes)):
+            cell = self._victim()
+            self.pop(cell.key)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(cell.key, cell.value)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value of the key, or cache and return
+        `compute()`.
+        """
+        cell = self.cells.get(key)
+        if cell is not None:
+            self.hits += 1
+            self._touch(cell)
+            return cell.value
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def memoize(self, function):
+        """A decorator caching the function's results by its arguments."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                key += (object,) + tuple(sorted(kwargs.items()))
+            return self.get_or_compute(
+                key, lambda: function(*args, **kwargs))
+        wrapper.cache = self
+        return wrapper
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.cells),
+            'bytes': self.total_bytes,
+        }
+
+
+class LRUCache(BaseCache):
+    """A least recently used cache.
+
+    The entries are kept in a doubly linked list, the most recently used
+    first. A hit moves the entry's cell to the top of the list and the cell at
+    the bottom is the one evicted; both are a few link changes, so every
+    operation takes O(1) time.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None,
+                 on_evict=None):
+        super().__init__(max_entries, max_bytes, sizeof, on_evict)
+        self.top_cell = new_list()
+
+    def _add(self, cell):
+        insert_cell(self.top_cell, cell)
+
+    def _touch(self, cell):
+        if cell.prev is not self.top_cell:
+            delete_cell(cell.prev)
+            insert_cell(self.top_cell, cell)
+
+    def _remove(self, cell):
+        delete_cell(cell.prev)
+
+    def _victim(self):
+        return self.top_cell.bottom_sentinel.prev
+
+    def keys(self):
+        """Return the keys, the most recently used first."""
+        keys = []
+        cell = self.top_cell.next
+        while not cell.is_bottom_sentinel:
+            keys.append(cell.key)
+            cell = cell.next
+        return keys
+
+
+class LFUCache(BaseCache):
+    """A least frequently used cache.
+
+    The entries are grouped in buckets by the number of hits. The buckets
+    form a doubly linked list in increasing order of the frequency, and each
+    bucket holds a doubly linked list of its entries, the most recently used
+    first. A hit moves the entry to the bucket of the next frequency, which
+    is either the next bucket or a new one inserted after the current one.
+    The entry evicted is the least recently used one of the first bucket.
+    So, every operation takes O(1) time.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None,
+                 on_evict=None):
+        super().__init__(max_entries, max_bytes, sizeof, on_evict)
+        self.top_cell = new_list()  # The list of the buckets.
+
+    def _move(self, cell, after_me):
+        """Move the entry to the bucket of the next frequency, which is
+        either the bucket after the given one or a new bucket.
+        """
+        frequency = after_me.value + 1 if not after_me.is_top_sentinel else 1
+        bucket = after_me.next
+        if bucket.is_bottom_sentinel or bucket.value != frequency:
+            bucket = FrequencyBucket(frequency)
+            insert_cell(after_me, bucket)
+        insert_cell(bucket.cells, cell)
+        cell.bucket = bucket
+
+    def _add(self, cell):
+        self._move(cell, self.top_cell)
+
+    def _touch(self, cell):
+        bucket = cell.bucket
+        delete_cell(cell.prev)
+        self._move(cell, bucket)
+        if is_empty(bucket.cells):
+            delete_cell(bucket.prev)
+
+    def _remove(self, cell):
+        bucket = cell.bucket
+        delete_cell(cell.prev)
+        cell.bucket = None
+        if is_empty(bucket.cells):
+            delete_cell(bucket.prev)
+
+    def _victim(self):
+        return self.top_cell.next.cells.bottom_sentinel.prev
+
+    def frequency(self, key):
+        """Return the number of uses of the key, the first put included."""
+        return self.cells[key].bucket.value
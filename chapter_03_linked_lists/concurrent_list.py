@@ -0,0 +1,139 @@
+import threading
+
+from .algorithms import iterate
+from .models import SinglyCell
+
+
+class LockingCell(SinglyCell):
+    """A cell of a `ConcurrentSortedList`, with its own lock and a flag set
+    when the cell is logically deleted.
+    """
+    __slots__ = ('lock', 'marked')
+
+    def __init__(self, value=None):
+        super().__init__(value)
+        self.lock = threading.Lock()
+        self.marked = False
+
+    def new_cell(self, value=None):
+        return LockingCell(value)
+
+
+class LockingTopSentinel(LockingCell):
+    __slots__ = ()
+
+    is_sentinel = True
+    is_top_sentinel = True
+
+    def __init__(self):
+        super().__init__(None)
+
+    def new_top_sentinel(self):
+        return LockingTopSentinel()
+
+
+class ConcurrentSortedList(object):
+    """A sorted singly linked list that many threads can use at once.
+
+    It follows the "lazy list" scheme: a thread looks for the place of an
+    operation without taking any locks, then locks only the two cells around
+    that place and checks they are still linked to each other and not
+    deleted. If another thread has changed them in between, it starts over.
+    So threads working on different parts of the list don't wait for each
+    other, unlike with one lock around the whole list.
+
+    A cell is deleted in two steps, first marked and then unlinked, which
+    lets `find_cell` run with no locks at all: it never returns a cell that
+    is marked.
+
+    The cells form an ordinary chain from `top_cell`, so `iterate` works on
+    the list, although it may or may not see the changes made while it runs.
+    """
+
+    def __init__(self, values=()):
+        self.top_cell = LockingTopSentinel()
+        for value in values:
+            self.insert_into_sorted(LockingCell(value))
+
+    def __iter__(self):
+        return iterate(self.top_cell)
+
+    def _find_before(self, value):
+        """Return the last cell whose value is less than the given value, and
+        the cell after it. Takes no locks.
+        """
+        cell_before = self.top_cell
+        cell = cell_before.next
+        while cell is not None and cell.value < value:
+            cell_before = cell
+            cell = cell.next
+        return cell_before, cell
+
+    @staticmethod
+    def _is_valid(cell_before, cell):
+        """Check that the (locked) cells are still in the list, next to each
+        other.
+        """
+        return not cell_before.marked and cell_before.next is cell and \
+            (cell is None or not cell.marked)
+
+    def _locked(self, value, operation):
+        """Run the operation on the cell before the place of the value and
+        the cell after it, with both cells locked and valid.
+        """
+        while True:
+            cell_before, cell = self._find_before(value)
+            with cell_before.lock:
+                if cell is None:
+                    if self._is_valid(cell_before, cell):
+                        return operation(cell_before, cell)
+                    continue
+                with cell.lock:
+                    if self._is_valid(cell_before, cell):
+                        return operation(cell_before, cell)
+
+    def insert_into_sorted(self, new_cell):
+        """Insert a new cell so the list remains sorted.
+
+        Like `algorithms.insert_into_sorted`, the new cell goes before the
+        cells with equal values.
+
+        :type new_cell: LockingCell
+        """
+        def insert(cell_before, cell):
+            new_cell.next = cell
+            cell_before.next = new_cell
+
+        self._locked(new_cell.value, insert)
+
+    def delete_value(self, value):
+        """Delete the first cell containing the value, and return it.
+
+        :raises KeyError: In case there's no such cell.
+        :rtype: LockingCell
+        """
+        def delete(cell_before, cell):
+            if cell is None or cell.value != value:
+                raise KeyError(value)
+            cell.marked = True
+            cell_before.next = cell.next
+            return cell
+
+        return self._locked(value, delete)
+
+    def find_cell(self, value):
+        """Return the first cell containing the value, without locking.
+
+        The cells with equal values that are marked, being deleted, are
+        skipped: a duplicate after them may still be in the list.
+
+        :rtype: LockingCell | None
+        """
+        cell = self._find_before(value)[1]
+        while cell is not None and cell.value == value:
+            if not cell.marked:
+                return cell
+            cell = cell.next
+
+    def __contains__(self, value):
+        return self.find_cell(value) is not None
@@ -0,0 +1,314 @@
+"""Opt-in instrumentation of the list algorithms.
+
+`enable` swaps the functions of the `algorithms` module for wrapped ones,
+which report a `Measurement` of each call to the given sinks: the wall time,
+the number of cells the call has traversed and the number of cell
+comparisons (`BaseCell.__lt__`) it has made. `disable` swaps the plain
+functions back. So while disabled the instrumentation costs nothing at all,
+there are no checks left in the algorithms.
+
+Only the calls looked up on the module are instrumented, like
+`algorithms.find_cell(...)`, including the calls the algorithms make to each
+other. A function imported with `from .algorithms import find_cell` before
+`enable` stays the plain one.
+
+The cells are counted by the searches (`find_cell`, `find_cell_before__*`,
+`find_cell_before_cell`, `find_sorted_position`, `find_last_cell`) and by
+`iterate`. The counts of a call include the counts of the calls it makes, so
+e.g. `insert_into_sorted` reports the cells `find_sorted_position` has
+crossed for it. The counters are shared, so the counts are only exact while
+one thread uses the lists.
+"""
+import math
+import socket
+import time
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+
+from . import algorithms
+from .models import BaseCell
+
+Measurement = namedtuple('Measurement', 'operation cells comparisons seconds')
+
+INSTRUMENTED = (
+    'insertion_sort', 'merge_sort', 'selection_sort', 'merge', 'merge_k',
+    'copy_list', 'find_sorted_position',
+    'insert_into_sorted', 'delete_cell', 'insert_cell', 'add_at_end',
+    'add_at_beginning', 'make_empty_list_like', 'find_last_cell',
+    'find_cell_before_cell', 'splice', 'unlink_range', 'extract_range',
+    'split_at', 'concat', 'find_cell_before__sentinel',
+    'find_cell_before__no_sentinel', 'find_cell', 'iterate', 'make_list',
+)
+
+
+class _Counters(object):
+    __slots__ = ('cells', 'comparisons')
+
+    def __init__(self):
+        self.cells = 0
+        self.comparisons = 0
+
+
+_counters = _Counters()
+_originals = {}
+_sinks = []
+
+
+def _counting_lt(self, other):
+    _counters.comparisons += 1
+    return self.value < other.value
+
+
+# The variants of the searches counting the cells. They follow the plain
+# algorithms step by step.
+
+def _find_cell_before(top_cell, value):
+    cells = 0
+    cell_before = top_cell
+    while cell_before.next:
+        cells += 1
+        if cell_before.next.value == value:
+            break
+        cell_before = cell_before.next
+    else:
+        cell_before = None
+    _counters.cells += cells
+    return cell_before
+
+
+def _find_cell_before__sentinel(top_cell, value):
+    assert top_cell.is_sentinel
+    return _find_cell_before(top_cell, value)
+
+
+def _find_cell_before__no_sentinel(top_cell, value):
+    assert not top_cell or not top_cell.is_sentinel
+    if top_cell:
+        return _find_cell_before(top_cell, value)
+
+
+def _find_cell(top_cell, value):
+    cells = 0
+    current_cell = top_cell
+    while current_cell:
+        cells += 1
+        if current_cell.value == value:
+            break
+        current_cell = current_cell.next
+    _counters.cells += cells
+    return current_cell
+
+
+def _find_cell_before_cell(top_cell, cell):
+    if cell.is_doubly_linked:
+        return cell.prev
+    cells = 0
+    cell_before = top_cell
+    while cell_before.next is not cell:
+        cells += 1
+        cell_before = cell_before.next
+        assert cell_before, "The cell is not in the list."
+    _counters.cells += cells
+    return cell_before
+
+
+def _find_sorted_position(top_cell, new_cell):
+    cells = 0
+    after_me = top_cell
+    while after_me.next and not after_me.next.is_bottom_sentinel and \
+            after_me.next < new_cell:
+        cells += 1
+        after_me = after_me.next
+    _counters.cells += cells
+    return after_me
+
+
+def _find_last_cell(top_cell):
+    assert top_cell.is_top_sentinel
+    if top_cell.is_doubly_linked:
+        return top_cell.bottom_sentinel.prev
+    cells = 0
+    last_cell = top_cell
+    while last_cell.next:
+        cells += 1
+        last_cell = last_cell.next
+    _counters.cells += cells
+    return last_cell
+
+
+def _counting_iterate(iterate):
+    def counting_iterate(top_cell, guarded=False):
+        for cell in iterate(top_cell, guarded):
+            _counters.cells += 1
+            yield cell
+    return counting_iterate
+
+
+_COUNTING = {
+    'find_cell_before__sentinel': _find_cell_before__sentinel,
+    'find_cell_before__no_sentinel': _find_cell_before__no_sentinel,
+    'find_cell': _find_cell,
+    'find_cell_before_cell': _find_cell_before_cell,
+    'find_sorted_position': _find_sorted_position,
+    'find_last_cell': _find_last_cell,
+}
+
+
+def _report(name, cells, comparisons, start):
+    measurement = Measurement(name, _counters.cells - cells,
+                              _counters.comparisons - comparisons,
+                              time.perf_counter() - start)
+    for sink in _sinks:
+        sink(measurement)
+
+
+def _instrument(name, function):
+    if name == 'iterate':  # Report once the iteration ends.
+        def instrumented(*args, **kwargs):
+            cells, comparisons = _counters.cells, _counters.comparisons
+            start = time.perf_counter()
+            try:
+                yield from function(*args, **kwargs)
+            finally:
+                _report(name, cells, comparisons, start)
+    else:
+        def instrumented(*args, **kwargs):
+            cells, comparisons = _counters.cells, _counters.comparisons
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _report(name, cells, comparisons, start)
+    instrumented.__name__ = name
+    instrumented.__doc__ = _originals[name].__doc__
+    return instrumented
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def enable(*sinks):
+    """Swap in the instrumented algorithms, reporting to the sinks.
+
+    :param sinks: Callables taking a `Measurement`, like `Histogram`,
+        `StatsdSink` or any function.
+    """
+    assert not is_enabled(), "The instrumentation is already enabled."
+    _sinks[:] = sinks
+    for name in INSTRUMENTED:
+        _originals[name] = getattr(algorithms, name)
+    for name in INSTRUMENTED:
+        if name == 'iterate':
+            function = _counting_iterate(_originals[name])
+        else:
+            function = _COUNTING.get(name, _originals[name])
+        setattr(algorithms, name, _instrument(name, function))
+    _originals['__lt__'] = BaseCell.__lt__
+    BaseCell.__lt__ = _counting_lt
+
+
+def disable():
+    """Swap the plain algorithms back."""
+    if not is_enabled():
+        return
+    BaseCell.__lt__ = _originals.pop('__lt__')
+    for name, function in _originals.items():
+        setattr(algorithms, name, function)
+    _originals.clear()
+    del _sinks[:]
+
+
+@contextmanager
+def instrumented(*sinks):
+    """Run the block with the instrumentation enabled."""
+    enable(*sinks)
+    try:
+        yield
+    finally:
+        disable()
+
+
+class Histogram(object):
+    """A sink keeping the totals and the histograms of each operation in
+    memory.
+
+    The histograms have power of two buckets: the number of the calls which
+    took from 2^(k-1) to 2^k microseconds, or crossed from 2^(k-1) to 2^k
+    cells, goes to the bucket k.
+    """
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.cells = defaultdict(int)
+        self.comparisons = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.time_buckets = defaultdict(lambda: defaultdict(int))
+        self.cell_buckets = defaultdict(lambda: defaultdict(int))
+
+    @staticmethod
+    def bucket(amount):
+        return math.ceil(math.log2(amount)) if amount > 1 else 0
+
+    def __call__(self, measurement):
+        operation = measurement.operation
+        self.calls[operation] += 1
+        self.cells[operation] += measurement.cells
+        self.comparisons[operation] += measurement.comparisons
+        self.seconds[operation] += measurement.seconds
+        self.time_buckets[operation][
+            self.bucket(measurement.seconds * 1e6)] += 1
+        self.cell_buckets[operation][self.bucket(measurement.cells)] += 1
+
+    def summary(self):
+        """Return the totals and the means per call of each operation,
+        starting with the most time-consuming one.
+
+        :rtype: list[dict]
+        """
+        return [{
+            'operation': operation,
+            'calls': self.calls[operation],
+            'seconds': self.seconds[operation],
+            'cells': self.cells[operation],
+            'comparisons': self.comparisons[operation],
+            'cells_per_call': self.cells[operation] / self.calls[operation],
+            'comparisons_per_call':
+                self.comparisons[operation] / self.calls[operation],
+        } for operation in sorted(self.calls, key=self.seconds.__getitem__,
+                                  reverse=True)]
+
+
+class StatsdSink(object):
+    """A sink sending the measurements as statsd lines over UDP.
+
+    Each call is sent in one datagram of the lines:
+        <prefix>.<operation>.calls:1|c
+        <prefix>.<operation>.cells:<count>|c
+        <prefix>.<operation>.comparisons:<count>|c
+        <prefix>.<operation>.time:<milliseconds>|ms
+    """
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='linked_lists'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format_lines(self, measurement):
+        name = '{}.{}'.format(self.prefix, measurement.operation)
+        return '\n'.join((
+            '{}.calls:1|c'.format(name),
+            '{}.cells:{}|c'.format(name, measurement.cells),
+            '{}.comparisons:{}|c'.format(name, measurement.comparisons),
+            '{}.time:{:.6f}|ms'.format(name, measurement.seconds * 1000),
+        ))
+
+    def __call__(self, measurement):
+        try:
+            self.socket.sendto(self.format_lines(measurement).encode(),
+                               self.address)
+        except OSError:  # Metrics are best effort, never fail the list.
+            pass
+
+    def close(self):
+        self.socket.close()
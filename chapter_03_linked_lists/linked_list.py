@@ -0,0 +1,316 @@
+from .algorithms import insert_cell, delete_cell, find_sorted_position, \
+    iterate, make_list, make_empty_list_like, find_cell_before_cell, splice, \
+    unlink_range
+
+
+class LinkedList(object):
+    """A handle of a sentinel-based linked list.
+
+    The handle wraps the list's top sentinel and keeps track of the list's
+    last cell (`tail`) and its length, so adding a cell at the end and
+    getting the length take O(1) time for both singly and doubly linked
+    lists.
+
+    The bookkeeping is only correct as long as the list is changed through
+    the handle's methods, which delegate the linking to `algorithms.py`.
+
+    With a `CellPool`, the handle takes the cells for the values from the
+    pool and hands the deleted cells back to it.
+    """
+
+    def __init__(self, values=(), is_doubly_linked=False, compact=False,
+                 top_cell=None, pool=None):
+        """
+        :param values: An iterable of the initial cell values.
+        :param top_cell: An existing list to wrap, instead of creating a new
+            one. Finding its tail and length takes O(N) time, once.
+        :type top_cell: TopSentinel
+        :param pool: A pool of the cells of the list's kind.
+        :type pool: CellPool
+        """
+        if top_cell is None:
+            top_cell = make_list((), is_doubly_linked=is_doubly_linked,
+                                 compact=compact)
+        assert top_cell.is_top_sentinel
+
+        self.top_cell = top_cell
+        self.pool = pool
+        self.tail = top_cell
+        self.length = 0
+        for cell in iterate(top_cell):
+            self.tail = cell
+            self.length += 1
+
+        self.extend(values)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iterate(self.top_cell)
+
+    def extend(self, values):
+        """Add cells holding the values at the end of the list."""
+        new_cell = self.top_cell.new_cell if self.pool is None \
+            else self.pool.new_cell
+        for value in values:
+            self.add_at_end(new_cell(value))
+
+    def add_at_end(self, new_cell):
+        """Add a new cell at the end of the list.
+
+        The last cell is known, so this takes O(1) time.
+        """
+        self.insert_cell(self.tail, new_cell)
+
+    def add_at_beginning(self, new_cell):
+        self.insert_cell(self.top_cell, new_cell)
+
+    def insert_cell(self, after_me, new_cell):
+        insert_cell(after_me, new_cell)
+        if after_me is self.tail:
+            self.tail = new_cell
+        self.length += 1
+
+    def delete_cell(self, after_me):
+        """Delete the cell after the given one, and hand it back to the pool
+        in case the handle has one.
+        """
+        cell = after_me.next
+        self._unlink_cell(after_me)
+        if self.pool is not None:
+            self.pool.release(cell)
+
+    def _unlink_cell(self, after_me):
+        if after_me.next is self.tail:
+            self.tail = after_me
+        delete_cell(after_me)
+        self.length -= 1
+
+    def splice(self, after_me, first, last):
+        """Insert a chain of cells, from `first` to `last`, after the cell.
+
+        See `algorithms.splice`. Counting the inserted cells takes O(K) time.
+        """
+        splice(after_me, first, last)
+        if after_me is self.tail:
+            self.tail = last
+        cell = first
+        self.length += 1
+        while cell is not last:
+            cell = cell.next
+            self.length += 1
+
+    def extract_range(self, first, last):
+        """Move the cells from `first` to `last` into a new handle of the same
+        kind, and return it.
+
+        Counting the cells takes O(K) time, plus O(N) time to find the cell
+        before `first` in a singly linked list.
+        """
+        after_me = self.find_cell_before_cell(first)
+        if last is self.tail:
+            self.tail = after_me
+        unlink_range(after_me, last)
+        new_list = self._new_handle(make_empty_list_like(self.top_cell))
+        new_list.splice(new_list.top_cell, first, last)
+        self.length -= new_list.length
+        return new_list
+
+    def split_at(self, cell):
+        """Move the cell and the cells after it into a new handle, and return
+        it. See `extract_range`.
+        """
+        return self.extract_range(cell, self.tail)
+
+    def concat(self, other):
+        """Move all the cells of the other list to the end of this one.
+
+        Both lists' ends and lengths are known, so this takes O(1) time
+        for both singly and doubly linked lists.
+
+        :type other: LinkedList
+        """
+        if not other.length:
+            return
+        first, last = other.top_cell.next, other.tail
+        unlink_range(other.top_cell, last)
+        splice(self.tail, first, last)
+        self.tail = last
+        self.length += other.length
+        other.tail = other.top_cell
+        other.length = 0
+
+    def find_cell_before_cell(self, cell):
+        return find_cell_before_cell(self.top_cell, cell)
+
+    def _new_handle(self, top_cell):
+        return LinkedList(top_cell=top_cell, pool=self.pool)
+
+    def insert_into_sorted(self, new_cell):
+        """Insert a new cell into the sorted list.
+
+        In case the new cell is greater than the last cell it goes right
+        after it, so appending the values in sorted order takes O(1) time per
+        cell. Otherwise it takes O(N) time.
+        """
+        if self.tail is not self.top_cell and self.tail < new_cell:
+            after_me = self.tail
+        else:
+            after_me = find_sorted_position(self.top_cell, new_cell)
+        self.insert_cell(after_me, new_cell)
+
+
+class IndexedLinkedList(LinkedList):
+    """A linked list handle with a hash index of its cells.
+
+    The index maps the key of each cell's value (the value itself, unless a
+    `key` function is given) to the cells holding it, so finding a cell, or
+    the cell before it, takes O(1) time instead of O(N). For singly linked
+    lists the cell before each cell is kept in the index too; doubly linked
+    cells already know it.
+
+    The index is updated by every mutating method: the single cell ones go
+    through `insert_cell` and `delete_cell`, while the bulk ones re-index the
+    moved cells, in O(K) time.
+    """
+
+    def __init__(self, values=(), is_doubly_linked=False, compact=False,
+                 top_cell=None, key=None, pool=None):
+        self.key = key
+        self.cells = {}  # Key -> {cell: None}, an insertion-ordered set.
+        self.cells_before = {}  # Cell -> the cell before it.
+        super().__init__((), is_doubly_linked, compact, top_cell, pool)
+
+        cell_before = self.top_cell
+        for cell in iterate(self.top_cell):
+            self._index(cell, cell_before)
+            cell_before = cell
+        self.extend(values)
+
+    def _key(self, value):
+        return value if self.key is None else self.key(value)
+
+    def _index(self, cell, cell_before):
+        key = self._key(cell.value)
+        cells = self.cells.get(key)
+        if cells is None:
+            self.cells[key] = {cell: None}
+        else:
+            cells[cell] = None
+        if not cell.is_doubly_linked:
+            self.cells_before[cell] = cell_before
+
+    def insert_cell(self, after_me, new_cell):
+        super().insert_cell(after_me, new_cell)
+        self._index(new_cell, after_me)
+        if not new_cell.is_doubly_linked and new_cell.next:
+            self.cells_before[new_cell.next] = new_cell
+
+    def _unlink_cell(self, after_me):
+        cell = after_me.next
+        super()._unlink_cell(after_me)
+        self._unindex(cell)
+        if not cell.is_doubly_linked and after_me.next:
+            self.cells_before[after_me.next] = after_me
+
+    def _unindex(self, cell):
+        key = self._key(cell.value)
+        cells = self.cells[key]
+        del cells[cell]
+        if not cells:
+            del self.cells[key]
+        if not cell.is_doubly_linked:
+            del self.cells_before[cell]
+
+    def splice(self, after_me, first, last):
+        super().splice(after_me, first, last)
+        self._index_range(after_me, last)
+
+    def extract_range(self, first, last):
+        after_me = self.find_cell_before_cell(first)
+        new_list = super().extract_range(first, last)
+        for cell in new_list:
+            self._unindex(cell)
+        if not after_me.is_doubly_linked and after_me.next:
+            self.cells_before[after_me.next] = after_me
+        return new_list
+
+    def concat(self, other):
+        """Move all the cells of the other list to the end of this one.
+
+        Moving the cells takes O(1) time, re-indexing them takes O(M) time.
+        The other list may be a plain `LinkedList`, with no index to clear.
+
+        :type other: LinkedList
+        """
+        after_me = self.tail
+        super().concat(other)
+        if isinstance(other, IndexedLinkedList):
+            other.cells.clear()
+            other.cells_before.clear()
+        self._index_range(after_me, self.tail)
+
+    def _new_handle(self, top_cell):
+        return IndexedLinkedList(top_cell=top_cell, key=self.key,
+                                 pool=self.pool)
+
+    def _index_range(self, after_me, last):
+        """Index the cells after `after_me` up to and including `last`."""
+        cell_before = after_me
+        while cell_before is not last:
+            cell = cell_before.next
+            self._index(cell, cell_before)
+            cell_before = cell
+        if not last.is_doubly_linked and last.next:
+            self.cells_before[last.next] = last
+
+    def find_cell_before_cell(self, cell):
+        """Return the cell before the given cell. Takes O(1) time."""
+        if cell.is_doubly_linked:
+            return cell.prev
+        return self.cells_before[cell]
+
+    def find_cell(self, value):
+        """Return the earliest added cell holding a value with the same key
+        as the given value. Takes O(1) time.
+
+        :rtype: Cell | None
+        """
+        cells = self.cells.get(self._key(value))
+        if cells:
+            return next(iter(cells))
+
+    def find_cells(self, value):
+        """Return a list of the cells holding a value with the same key as the
+        given value, the earliest added first.
+        """
+        return list(self.cells.get(self._key(value), ()))
+
+    def find_cell_before(self, value):
+        """Return the cell before the cell `find_cell` returns. Takes O(1)
+        time.
+
+        :rtype: Cell | None
+        """
+        cell = self.find_cell(value)
+        if cell is None:
+            return None
+        return self.find_cell_before_cell(cell)
+
+    def delete_value(self, value):
+        """Delete the cell `find_cell` returns, and return it. Takes O(1)
+        time.
+
+        The cell is returned rather than handed back to the pool; the caller
+        may release it once done with it.
+
+        :raises KeyError: In case there's no such cell.
+        :rtype: Cell
+        """
+        cell_before = self.find_cell_before(value)
+        if cell_before is None:
+            raise KeyError(value)
+        cell = cell_before.next
+        self._unlink_cell(cell_before)
+        return cell
@@ -0,0 +1,129 @@
+"""Linked lists with loops.
+
+A list whose last cells link back to one of the earlier cells has no end, so
+an algorithm crossing it runs forever. The algorithms below detect such a
+loop and break it.
+
+All the algorithms below follow the `next` links from the given top cell,
+so they work on lists with or without sentinels.
+"""
+
+
+def has_loop__hash_set(top_cell):
+    """Tell whether the list has a loop, by remembering the visited cells.
+
+    Runs in O(N) time, but takes O(N) extra memory for the set of cells.
+    """
+    visited = set()
+    cell = top_cell
+    while cell:
+        if cell in visited:
+            return True
+        visited.add(cell)
+        cell = cell.next
+    return False
+
+
+def has_loop__tortoise_and_hare(top_cell):
+    """Tell whether the list has a loop, using the Floyd's algorithm.
+
+    The tortoise moves by one cell and the hare by two cells at a time. In
+    case the list has a loop, the hare enters it and keeps going around, so
+    the tortoise gets caught when it enters the loop too. Otherwise the hare
+    reaches the end of the list.
+
+    Runs in O(N) time with O(1) extra memory.
+    """
+    return _find_meeting_cell(top_cell) is not None
+
+
+def has_loop__brent(top_cell):
+    """Tell whether the list has a loop, using the Brent's algorithm.
+
+    The hare moves by one cell at a time and the tortoise waits in place,
+    jumping to the hare each time the number of the hare's steps reaches the
+    next power of two. In case the list has a loop, eventually the tortoise
+    waits in the loop long enough for the hare to go around and meet it.
+
+    Like the Floyd's algorithm it runs in O(N) time with O(1) extra memory,
+    but follows fewer links.
+    """
+    if not top_cell:
+        return False
+    tortoise = top_cell
+    hare = top_cell.next
+    steps = limit = 1
+    while hare:
+        if hare is tortoise:
+            return True
+        if steps == limit:
+            tortoise = hare
+            limit *= 2
+            steps = 0
+        hare = hare.next
+        steps += 1
+    return False
+
+
+def _find_meeting_cell(top_cell):
+    """Return the cell where the Floyd's tortoise and hare meet, or None if
+    the list has no loop.
+    """
+    tortoise = hare = top_cell
+    while hare and hare.next:
+        tortoise = tortoise.next
+        hare = hare.next.next
+        if tortoise is hare:
+            return hare
+
+
+def find_loop_start(top_cell):
+    """Return the first cell of the loop, or None if the list has no loop.
+
+    Once the Floyd's tortoise and hare meet, the distance from the top cell
+    to the start of the loop equals the distance from the meeting cell to
+    the start of the loop (modulo the loop length). So, a cell moving from
+    the top and a cell moving from the meeting point, one step at a time,
+    meet at the start of the loop.
+
+    Runs in O(N) time with O(1) extra memory.
+
+    :rtype: Cell | None
+    """
+    hare = _find_meeting_cell(top_cell)
+    if hare is None:
+        return None
+    tortoise = top_cell
+    while tortoise is not hare:
+        tortoise = tortoise.next
+        hare = hare.next
+    return tortoise
+
+
+def break_loop(top_cell):
+    """Break the list's loop, if any, making the list proper again.
+
+    The last cell of the loop, the one linking back to the start of the loop,
+    becomes the last cell of the list. In case the list is doubly linked
+    with sentinels, it's linked to the bottom sentinel.
+
+    Runs in O(N) time with O(1) extra memory.
+
+    :return: Whether the list had a loop.
+    :rtype: bool
+    """
+    loop_start = find_loop_start(top_cell)
+    if loop_start is None:
+        return False
+
+    last_cell = loop_start
+    while last_cell.next is not loop_start:
+        last_cell = last_cell.next
+
+    if top_cell.is_top_sentinel and top_cell.is_doubly_linked:
+        bottom_cell = top_cell.bottom_sentinel
+        last_cell.next = bottom_cell
+        bottom_cell.prev = last_cell
+    else:
+        last_cell.next = None
+    return True
@@ -1,6 +1,25 @@
 
 
-class Cell(object):
+class BaseCell(object):
+    """Behaviour shared by all the cell types.
+
+    The flags are class-level, so the algorithms can tell the kind of a cell
+    without `isinstance` checks or looking into the instance's `__dict__`.
+    """
+    __slots__ = ()
+
+    is_sentinel = False
+    is_top_sentinel = False
+    is_bottom_sentinel = False
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+    def __str__(self):
+        return "{}".format(self.value)
+
+
+class Cell(BaseCell):
 
     def __init__(self, value=None, is_doubly_linked=False):
         self.value = value
@@ -13,11 +32,9 @@ class Cell(object):
     def is_doubly_linked(self):
         return 'prev' in self.__dict__
 
-    def __lt__(self, other):
-        return self.value < other.value
-
-    def __str__(self):
-        return "{}".format(self.value)
+    def new_cell(self, value=None):
+        """Return a new (unlinked) cell of the same kind as this one."""
+        return Cell(value, self.is_doubly_linked)
 
 
 class Sentinel(Cell):
@@ -30,22 +47,105 @@ class Sentinel(Cell):
         - A sentinel may seem like a waste of space, but it removes the need of
         special-purpose code and makes the algorithm simpler and more elegant.
     """
+    is_sentinel = True
 
     def __init__(self, is_doubly_linked=False):
         super().__init__(None, is_doubly_linked)
 
 
 class TopSentinel(Sentinel):
+    is_top_sentinel = True
 
     def __init__(self, is_doubly_linked=False):
         if is_doubly_linked:
             self.bottom_sentinel = None
         super().__init__(is_doubly_linked)
 
+    def new_top_sentinel(self):
+        return TopSentinel(self.is_doubly_linked)
+
+    def new_bottom_sentinel(self):
+        return BottomSentinel()
 
 
 class BottomSentinel(Sentinel):
+    is_bottom_sentinel = True
 
     def __init__(self):
         # Assume a bottom sentinel always implies doubly linked lists.
         super().__init__(is_doubly_linked=True)
+
+
+class SinglyCell(BaseCell):
+    """A compact cell of a singly linked list.
+
+    Unlike `Cell`, the fields are stored in `__slots__` rather than in a
+    per-instance `__dict__`, which makes a cell several times smaller. The
+    linkage is fixed by the class, so `is_doubly_linked` is a plain class
+    attribute.
+    """
+    __slots__ = ('value', 'next')
+
+    is_doubly_linked = False
+
+    def __init__(self, value=None):
+        self.value = value
+        self.next = None
+
+    def new_cell(self, value=None):
+        return SinglyCell(value)
+
+
+class DoublyCell(BaseCell):
+    """A compact cell of a doubly linked list."""
+    __slots__ = ('value', 'next', 'prev')
+
+    is_doubly_linked = True
+
+    def __init__(self, value=None):
+        self.value = value
+        self.next = None
+        self.prev = None
+
+    def new_cell(self, value=None):
+        return DoublyCell(value)
+
+
+class SinglyTopSentinel(SinglyCell):
+    __slots__ = ()
+
+    is_sentinel = True
+    is_top_sentinel = True
+
+    def __init__(self):
+        super().__init__(None)
+
+    def new_top_sentinel(self):
+        return SinglyTopSentinel()
+
+
+class DoublyTopSentinel(DoublyCell):
+    __slots__ = ('bottom_sentinel',)
+
+    is_sentinel = True
+    is_top_sentinel = True
+
+    def __init__(self):
+        super().__init__(None)
+        self.bottom_sentinel = None
+
+    def new_top_sentinel(self):
+        return DoublyTopSentinel()
+
+    def new_bottom_sentinel(self):
+        return DoublyBottomSentinel()
+
+
+class DoublyBottomSentinel(DoublyCell):
+    __slots__ = ()
+
+    is_sentinel = True
+    is_bottom_sentinel = True
+
+    def __init__(self):
+        super().__init__(None)
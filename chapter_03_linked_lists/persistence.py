@@ -0,0 +1,268 @@
+"""A compact binary format for linked lists of numbers.
+
+The layout of a file:
+    - The header: the magic bytes, the format version, the flags (whether the
+    list is doubly linked), the `array` type code of the values, the number
+    of cells and the index of the first cell.
+    - The value column: the values of the cells, in the native layout of the
+    type code, padded to 8 bytes.
+    - The node table: the indices of the next cells, and of the previous
+    cells for doubly linked lists, as 64-bit integers. -1 stands for no cell.
+
+The cells are written in the list order, so the value column alone can be
+read as a stream, while the node table lets `MappedList` walk the list over
+a read-only memory map without loading it.
+
+Unlike pickling, which recurses through the `next` links, writing and
+reading take constant stack and memory whatever the length of the list.
+"""
+import mmap
+import struct
+from array import array
+from itertools import islice
+
+from .algorithms import iterate, make_list
+
+MAGIC = b'LLST'
+VERSION = 1
+DOUBLY_LINKED = 1
+HEADER = struct.Struct('<4sBBcxQq')
+NIL = -1
+CHUNK_SIZE = 65536  # Cells per read or write.
+
+
+def _padding(size):
+    return -size % 8
+
+
+def dump(top_cell, file, typecode='d'):
+    """Write the list into the binary file, streaming it by chunks.
+
+    The file must be seekable, as the number of cells goes into the header
+    once the cells are written.
+
+    :param top_cell: The list's first cell.
+    :type top_cell: TopSentinel
+    :param file: A binary file open for writing.
+    :param typecode: The `array` type code of the values.
+    :return: The number of cells written.
+    """
+    assert top_cell.is_top_sentinel
+    is_doubly_linked = top_cell.is_doubly_linked
+    start = file.tell()
+    file.write(bytes(HEADER.size))
+
+    count = 0
+    values = (cell.value for cell in iterate(top_cell))
+    while True:
+        chunk = array(typecode, islice(values, CHUNK_SIZE))
+        if not chunk:
+            break
+        chunk.tofile(file)
+        count += len(chunk)
+    file.write(bytes(_padding(count * array(typecode).itemsize)))
+
+    # The cells are in the list order, so the links are consecutive.
+    for first in range(0, count, CHUNK_SIZE):
+        last = min(first + CHUNK_SIZE, count)
+        links = array('q', range(first + 1, last + 1))
+        if last == count:
+            links[-1] = NIL
+        links.tofile(file)
+    if is_doubly_linked:
+        for first in range(0, count, CHUNK_SIZE):
+            last = min(first + CHUNK_SIZE, count)
+            array('q', range(first - 1, last - 1)).tofile(file)
+
+    end = file.tell()
+    flags = DOUBLY_LINKED if is_doubly_linked else 0
+    file.seek(start)
+    file.write(HEADER.pack(MAGIC, VERSION, flags, typecode.encode(), count,
+                           0 if count else NIL))
+    file.seek(end)
+    return count
+
+
+def read_header(file):
+    """Read and check the header, and return the type code, whether the list
+    is doubly linked and the number of cells.
+    """
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("The file is truncated.")
+    magic, version, flags, typecode, count, _ = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a linked list file.")
+    return typecode.decode(), bool(flags & DOUBLY_LINKED), count
+
+
+def iter_values(file):
+    """Iterate over the values stored in the binary file, reading it by
+    chunks.
+
+    :raises ValueError: In case the file ends before the values do.
+    """
+    typecode, _, count = read_header(file)
+    itemsize = array(typecode).itemsize
+    while count:
+        size = min(count, CHUNK_SIZE) * itemsize
+        data = file.read(size)
+        if len(data) < size:
+            raise ValueError("The file is truncated.")
+        chunk = array(typecode)
+        chunk.frombytes(data)
+        count -= len(chunk)
+        yield from chunk
+
+
+def load(file, compact=False):
+    """Read the list from the binary file, and return its top sentinel.
+
+    :param compact: Build the list of the `__slots__`-based cells.
+    :rtype: TopSentinel
+    """
+    start = file.tell()
+    is_doubly_linked = read_header(file)[1]
+    file.seek(start)
+    return make_list(iter_values(file), is_doubly_linked=is_doubly_linked,
+                     compact=compact)
+
+
+class MappedCell(object):
+    """A read-only cell of a `MappedList`, made on access.
+
+    It has the same attributes as the other cells, so the algorithms which
+    don't change the list, like `iterate` or `find_cell`, work on it.
+    """
+    __slots__ = ('mapped_list', 'index')
+
+    is_doubly_linked = False
+    is_sentinel = False
+    is_top_sentinel = False
+    is_bottom_sentinel = False
+
+    def __init__(self, mapped_list, index):
+        self.mapped_list = mapped_list
+        self.index = index
+
+    @property
+    def value(self):
+        return self.mapped_list.values[self.index]
+
+    @property
+    def next(self):
+        return self.mapped_list.cell(self.mapped_list.nexts[self.index])
+
+    @property
+    def prev(self):
+        mapped_list = self.mapped_list
+        assert mapped_list.prevs is not None
+        index = mapped_list.prevs[self.index]
+        if index == NIL:
+            return mapped_list.top_cell
+        return mapped_list.cell(index)
+
+    def __eq__(self, other):
+        return isinstance(other, MappedCell) and \
+            other.mapped_list is self.mapped_list and other.index == self.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+    def __str__(self):
+        return "{}".format(self.value)
+
+
+class MappedTopSentinel(MappedCell):
+    __slots__ = ()
+
+    is_sentinel = True
+    is_top_sentinel = True
+
+    @property
+    def value(self):
+        return None
+
+    @property
+    def next(self):
+        return self.mapped_list.cell(self.mapped_list.head)
+
+
+class MappedList(object):
+    """A read-only linked list stored in a binary file, mapped into memory.
+
+    Only the pages of the file that are accessed get loaded, so a list much
+    larger than the memory can be iterated. The cells are made on access, and
+    `top_cell` can be passed to `iterate` and the other algorithms which
+    don't change the list (the lists are read as singly linked ones there;
+    `prev` is available on the cells of a doubly linked list though).
+    """
+
+    def __init__(self, path):
+        """
+        :raises ValueError: In case the file is not a linked list file, or is
+            shorter than its header says.
+        """
+        self.file = open(path, 'rb')
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+            typecode, self.is_doubly_linked, self.count = \
+                read_header(self.file)
+        except ValueError:
+            self.file.close()
+            raise
+        _, _, _, _, _, self.head = HEADER.unpack_from(self.mmap)
+
+        values_size = self.count * array(typecode).itemsize
+        links = 2 if self.is_doubly_linked else 1
+        expected_size = HEADER.size + values_size + _padding(values_size) + \
+            links * self.count * 8
+        if len(self.mmap) < expected_size:
+            self.mmap.close()
+            self.file.close()
+            raise ValueError("The file is truncated.")
+
+        view = memoryview(self.mmap)
+        offset = HEADER.size
+        size = values_size
+        self.values = view[offset:offset + size].cast(typecode)
+        offset += size + _padding(size)
+        size = self.count * 8
+        self.nexts = view[offset:offset + size].cast('q')
+        offset += size
+        self.prevs = view[offset:offset + size].cast('q') \
+            if self.is_doubly_linked else None
+        self.top_cell = MappedTopSentinel(self, NIL)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Iterate over the values, following the links."""
+        values = self.values
+        nexts = self.nexts
+        index = self.head
+        while index != NIL:
+            yield values[index]
+            index = nexts[index]
+
+    def cell(self, index):
+        if index != NIL:
+            return MappedCell(self, index)
+
+    def close(self):
+        for view in (self.values, self.nexts, self.prevs):
+            if view is not None:
+                view.release()
+        self.mmap.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
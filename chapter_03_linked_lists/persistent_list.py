@@ -0,0 +1,219 @@
+"""A persistent (immutable) singly linked list.
+
+A change never modifies the cells, it builds a new version of the list
+instead, which reuses the cells of the old version it doesn't change. Adding
+or removing the first cell reuses all the others, so it takes O(1) time and
+memory, and changing the i-th cell copies only the i cells before it, while
+the cells after it are shared.
+
+The old versions stay valid and unchanged, so a version is a snapshot in
+itself: taking one costs nothing, and reading it needs no locks however the
+writers go on changing the list, unlike `copy_list` which takes O(N) time.
+"""
+import threading
+from itertools import islice
+
+from .algorithms import iterate, make_list
+from .models import BaseCell
+
+
+class PersistentCell(BaseCell):
+    """An immutable singly linked cell, possibly shared by many lists."""
+    __slots__ = ('value', 'next')
+
+    is_doubly_linked = False
+
+    def __init__(self, value, next_cell=None):
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'next', next_cell)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("A persistent cell can't be changed.")
+
+
+class PersistentList(object):
+    """A version of a persistent list: its first cell and its length.
+
+    The cells don't use sentinels, so `iterate(persistent_list.head)` and
+    `find_cell(persistent_list.head, value)` work on them.
+    """
+    __slots__ = ('head', 'length')
+
+    def __init__(self, values=()):
+        """
+        :param values: An iterable of the cell values. Building the list
+            from the end takes O(N) extra memory for the reversed values.
+        """
+        values = list(values)
+        head = None
+        for value in reversed(values):
+            head = PersistentCell(value, head)
+        self.head = head
+        self.length = len(values)
+
+    @classmethod
+    def _from_head(cls, head, length):
+        persistent_list = cls.__new__(cls)
+        persistent_list.head = head
+        persistent_list.length = length
+        return persistent_list
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iterate(self.head)
+
+    def values(self):
+        return [cell.value for cell in iterate(self.head)]
+
+    def first(self):
+        """Return the first value.
+
+        :raises IndexError: In case the list is empty.
+        """
+        if self.head is None:
+            raise IndexError("The list is empty.")
+        return self.head.value
+
+    def prepend(self, value):
+        """Return a new version with the value added at the beginning.
+        Takes O(1) time.
+
+        :rtype: PersistentList
+        """
+        return self._from_head(PersistentCell(value, self.head),
+                               self.length + 1)
+
+    def rest(self):
+        """Return a new version without the first cell, sharing all the
+        other cells. Takes O(1) time.
+
+        :raises IndexError: In case the list is empty.
+        :rtype: PersistentList
+        """
+        if self.head is None:
+            raise IndexError("The list is empty.")
+        return self._from_head(self.head.next, self.length - 1)
+
+    def pop(self):
+        """Return the first value, and a new version without it.
+        Takes O(1) time.
+
+        :raises IndexError: In case the list is empty.
+        :rtype: (object, PersistentList)
+        """
+        return self.first(), self.rest()
+
+    def _rebuild(self, index, tail, length):
+        """Return a new version made of copies of the cells before the index
+        and then the `tail` cells. Takes O(index) time.
+        """
+        if not 0 <= index <= self.length:
+            raise IndexError(index)
+        prefix = [cell.value for cell in islice(iterate(self.head), index)]
+        for value in reversed(prefix):
+            tail = PersistentCell(value, tail)
+        return self._from_head(tail, length)
+
+    def _cell_at(self, index):
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return next(islice(iterate(self.head), index, None))
+
+    def __getitem__(self, index):
+        """Return the value at the index. Takes O(index) time."""
+        return self._cell_at(index).value
+
+    def set(self, index, value):
+        """Return a new version with the value at the index replaced.
+
+        The cells after the index are shared, so it takes O(index) time.
+
+        :rtype: PersistentList
+        """
+        old_cell = self._cell_at(index)
+        return self._rebuild(index, PersistentCell(value, old_cell.next),
+                             self.length)
+
+    def insert(self, index, value):
+        """Return a new version with the value inserted at the index, which
+        may be the length of the list.
+
+        The cells from the index on are shared, so it takes O(index) time.
+
+        :rtype: PersistentList
+        """
+        tail = self._cell_at(index) if index < self.length else None
+        return self._rebuild(index, PersistentCell(value, tail),
+                             self.length + 1)
+
+    def delete(self, index):
+        """Return a new version without the value at the index.
+
+        The cells after the index are shared, so it takes O(index) time.
+
+        :rtype: PersistentList
+        """
+        return self._rebuild(index, self._cell_at(index).next,
+                             self.length - 1)
+
+    def to_list(self, is_doubly_linked=False, compact=False):
+        """Build a mutable list of the values, see `make_list`.
+
+        :rtype: TopSentinel
+        """
+        return make_list(self.values(), is_doubly_linked=is_doubly_linked,
+                         compact=compact)
+
+    @classmethod
+    def from_list(cls, top_cell):
+        """Build a persistent list of the values of the mutable list.
+
+        :type top_cell: Cell | TopSentinel
+        :rtype: PersistentList
+        """
+        return cls(cell.value for cell in iterate(top_cell))
+
+
+class PersistentHandle(object):
+    """A mutable handle to the current version of a persistent list.
+
+    Writers replace the version under a lock, readers take `snapshot()`
+    without any: the snapshot is the version at that moment and no writer
+    ever changes it.
+    """
+
+    def __init__(self, values=()):
+        self.current = PersistentList(values)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.current)
+
+    def snapshot(self):
+        """Return the current version. Takes O(1) time.
+
+        :rtype: PersistentList
+        """
+        return self.current
+
+    def update(self, change):
+        """Replace the current version with `change(current)`, and return
+        the new version.
+        """
+        with self.lock:
+            self.current = change(self.current)
+            return self.current
+
+    def prepend(self, value):
+        return self.update(lambda current: current.prepend(value))
+
+    def pop(self):
+        """Remove the first value, and return it.
+
+        :raises IndexError: In case the list is empty.
+        """
+        with self.lock:
+            value, self.current = self.current.pop()
+            return value
@@ -0,0 +1,196 @@
+import random
+
+from .algorithms import insert_cell, delete_cell, iterate, make_list
+
+
+class IndexNode(object):
+    """A node of an express lane of a skip list.
+
+    It points at the list's `cell` it stands for, the next node of the same
+    level and the node (or the cell, at the lowest index level) below it.
+    """
+    __slots__ = ('cell', 'next', 'down')
+
+    def __init__(self, cell, down):
+        self.cell = cell
+        self.next = None
+        self.down = down
+
+
+class SkipList(object):
+    """A probabilistic index over a sorted sentinel-based linked list.
+
+    The list itself (level 0) stays an ordinary chain of cells starting at
+    `top_cell`, so `iterate`, `copy_list` and the rest of `algorithms.py`
+    keep working on it. Above it are the express lanes of `IndexNode`s: each
+    cell gets an index node at level 1 with the probability `p`, each of
+    those gets one at level 2 with the probability `p`, and so on. A search
+    runs along the highest lane until the next step would overshoot, then
+    drops a level, so the expected number of steps is O(log N).
+
+    The index is only correct as long as the list is changed through the
+    skip list's methods.
+    """
+
+    def __init__(self, values=(), is_doubly_linked=False, top_cell=None,
+                 p=0.5, max_level=32, seed=None):
+        """
+        :param values: An iterable of values to insert.
+        :param top_cell: An existing sorted list to index, instead of
+            creating a new one. Indexing it takes O(N) time.
+        :type top_cell: TopSentinel
+        """
+        if top_cell is None:
+            top_cell = make_list((), is_doubly_linked=is_doubly_linked)
+        assert top_cell.is_top_sentinel
+
+        self.top_cell = top_cell
+        self.p = p
+        self.max_level = max_level
+        self.random = random.Random(seed)
+        # The first index node of each level, the lowest level first.
+        self.heads = [IndexNode(top_cell, down=top_cell)]
+        self.length = 0
+        self._build_index()
+
+        new_cell = top_cell.new_cell
+        for value in values:
+            self.insert(new_cell(value))
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iterate(self.top_cell)
+
+    def _random_level(self):
+        level = 1
+        while level < self.max_level and self.random.random() < self.p:
+            level += 1
+        return level
+
+    def _add_level(self):
+        self.heads.append(IndexNode(self.top_cell, down=self.heads[-1]))
+
+    def _build_index(self):
+        """Index the cells already in the list, in one pass."""
+        tails = list(self.heads)  # The last node of each level.
+        for cell in iterate(self.top_cell):
+            self.length += 1
+            level = self._random_level()
+            while len(self.heads) < level:
+                self._add_level()
+                tails.append(self.heads[-1])
+            down = cell
+            for i in range(level):
+                node = IndexNode(cell, down)
+                tails[i].next = node
+                tails[i] = node
+                down = node
+
+    def _find_before(self, value):
+        """Return the last node of each index level (the lowest level first)
+        and the last cell of the list, whose values are less than the given
+        value.
+        """
+        update = [None] * len(self.heads)
+        node = self.heads[-1]
+        for level in range(len(self.heads) - 1, -1, -1):
+            next_node = node.next
+            while next_node and next_node.cell.value < value:
+                node = next_node
+                next_node = node.next
+            update[level] = node
+            node = node.down
+
+        cell = node  # The lowest index level points down at the cells.
+        next_cell = cell.next
+        while next_cell and not next_cell.is_bottom_sentinel \
+                and next_cell.value < value:
+            cell = next_cell
+            next_cell = cell.next
+        return update, cell
+
+    def insert(self, new_cell):
+        """Insert a new cell so the list remains sorted.
+
+        Like `insert_into_sorted`, the new cell goes before the cells with
+        equal values. Expected runtime is O(log N).
+
+        :type new_cell: Cell
+        """
+        update, after_me = self._find_before(new_cell.value)
+        insert_cell(after_me, new_cell)
+        self.length += 1
+
+        level = self._random_level()
+        while len(self.heads) < level:
+            self._add_level()
+            update.append(self.heads[-1])
+        down = new_cell
+        for i in range(level):
+            node = IndexNode(new_cell, down)
+            node.next = update[i].next
+            update[i].next = node
+            down = node
+
+    def delete(self, value):
+        """Delete the first cell containing the value and return it.
+
+        Expected runtime is O(log N).
+
+        :raises KeyError: In case there's no such cell.
+        :rtype: Cell
+        """
+        update, after_me = self._find_before(value)
+        cell = after_me.next
+        if not cell or cell.is_bottom_sentinel or cell.value != value:
+            raise KeyError(value)
+
+        # Being the first cell with the value, its index nodes (if any) are
+        # right after the nodes found on each level.
+        for node in update:
+            if node.next and node.next.cell is cell:
+                node.next = node.next.next
+            else:
+                break
+        while len(self.heads) > 1 and not self.heads[-1].next:
+            self.heads.pop()
+
+        delete_cell(after_me)
+        self.length -= 1
+        return cell
+
+    def find_cell_before(self, value):
+        """Return the cell before the first cell containing the value.
+
+        Expected runtime is O(log N).
+
+        :rtype: Cell | None
+        """
+        after_me = self._find_before(value)[1]
+        cell = after_me.next
+        if cell and not cell.is_bottom_sentinel and cell.value == value:
+            return after_me
+
+    def find_cell(self, value):
+        """Return the first cell containing the value.
+
+        Expected runtime is O(log N).
+
+        :rtype: Cell | None
+        """
+        cell_before = self.find_cell_before(value)
+        if cell_before:
+            return cell_before.next
+
+    def iterate_range(self, low, high):
+        """Iterate in order over the cells whose values are in [low, high).
+
+        Finding the first cell takes expected O(log N) time, then it takes
+        one step per cell.
+        """
+        cell = self._find_before(low)[1].next
+        while cell and not cell.is_bottom_sentinel and cell.value < high:
+            yield cell
+            cell = cell.next
@@ -0,0 +1,98 @@
+from collections import deque
+from itertools import islice
+
+from .algorithms import delete_cell, iterate, make_list
+
+
+def drain(top_cell):
+    """Iterate over the list's cells, unlinking each one before yielding it.
+
+    The list shrinks as it is consumed, and a yielded cell is detached from
+    the rest of the list, so the cells the consumer has done with can be
+    garbage-collected right away. Stopping half way leaves the rest of the
+    cells in the list.
+
+    :param top_cell: The list's first cell.
+    :type top_cell: TopSentinel
+    """
+    assert top_cell.is_top_sentinel
+    while top_cell.next and not top_cell.next.is_bottom_sentinel:
+        cell = top_cell.next
+        delete_cell(top_cell)
+        cell.next = None
+        if cell.is_doubly_linked:
+            cell.prev = None
+        yield cell
+
+
+class Pipeline(object):
+    """A lazy chain of stages over a stream of items, usually cells.
+
+    Each stage wraps the iterator of the previous one, so nothing runs until
+    the pipeline is iterated, and then the items flow through all the stages
+    one at a time, without intermediate lists.
+
+    Example:
+        Pipeline(drain(top_cell)).values().filter(is_valid).chunk(100)
+    """
+
+    def __init__(self, items):
+        """
+        :param items: An iterable of the items, e.g. `iterate(top_cell)`.
+        """
+        self.items = iter(items)
+
+    def __iter__(self):
+        return self.items
+
+    def values(self):
+        """Replace the cells with their values."""
+        return Pipeline(cell.value for cell in self.items)
+
+    def map(self, function):
+        return Pipeline(map(function, self.items))
+
+    def filter(self, predicate):
+        return Pipeline(filter(predicate, self.items))
+
+    def take(self, count):
+        """Stop after the first `count` items."""
+        return Pipeline(islice(self.items, count))
+
+    def chunk(self, size):
+        """Group the items into tuples of `size` items, the last one shorter
+        if there aren't enough items.
+        """
+        assert size > 0
+
+        def chunks(items):
+            while True:
+                chunk = tuple(islice(items, size))
+                if not chunk:
+                    return
+                yield chunk
+        return Pipeline(chunks(self.items))
+
+    def window(self, size):
+        """Turn the items into tuples of `size` consecutive items, sliding by
+        one item.
+        """
+        assert size > 0
+
+        def windows(items):
+            window = deque(islice(items, size - 1), maxlen=size)
+            for item in items:
+                window.append(item)
+                yield tuple(window)
+        return Pipeline(windows(self.items))
+
+    def to_list(self, use_sentinel=True, is_doubly_linked=False,
+                compact=False):
+        """Build a linked list of the items as the values, see `make_list`.
+        """
+        return make_list(self.items, use_sentinel, is_doubly_linked, compact)
+
+
+def pipeline(top_cell):
+    """Start a pipeline over the list's cells."""
+    return Pipeline(iterate(top_cell))
@@ -1,8 +1,41 @@
+import contextlib
+import io
+import os
+import random
+import socket
+import tempfile
 import unittest
-from .models import Cell, Sentinel, TopSentinel, BottomSentinel
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from .models import Cell, Sentinel, TopSentinel, BottomSentinel, SinglyCell, \
+    DoublyCell, SinglyTopSentinel, DoublyTopSentinel, DoublyBottomSentinel
 from .algorithms import make_list, iterate, add_at_beginning, add_at_end, \
     insert_cell, delete_cell, insert_into_sorted, copy_list, find_cell, \
-    find_cell_before__no_sentinel, find_cell_before__sentinel, insertion_sort
+    find_cell_before__no_sentinel, find_cell_before__sentinel, \
+    insertion_sort, merge_sort, splice, unlink_range, extract_range, \
+    split_at, concat, LoopError, selection_sort, merge, merge_k, \
+    merge_k__lazy
+from .linked_list import LinkedList, IndexedLinkedList
+from .skip_list import SkipList
+from .caches import LRUCache, LFUCache
+from .streams import Pipeline, drain, pipeline
+from .concurrent_list import ConcurrentSortedList, LockingCell
+from .loops import has_loop__hash_set, has_loop__tortoise_and_hare, \
+    has_loop__brent, find_loop_start, break_loop
+from .threaded_list import ThreadedList
+from .array_list import ArrayLinkedList, TOP, BOTTOM, make_list_from_array, \
+    list_to_array
+from .persistence import dump, load, iter_values, MappedList, HEADER
+from .benchmarks import suite
+from . import algorithms, instrumentation
+from .persistent_list import PersistentList, PersistentHandle
+from .unrolled_list import UnrolledLinkedList
+from .pools import CellPool
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class LinkedListTest(unittest.TestCase):
@@ -294,3 +327,1404 @@ class LinkedListTest(unittest.TestCase):
         sorted_top_cell = insertion_sort(top_cell)
         self.assertListValues(sorted_top_cell, sorted(values))
         self.assertListValues(top_cell, values[0:1])  # Broken.
+
+    def test_make_list__compact(self):
+        top_cell = make_list((1, 2, 3), compact=True)
+        self.assertTrue(isinstance(top_cell, SinglyTopSentinel))
+        self.assertFalse(hasattr(top_cell, '__dict__'))
+        self.assertFalse(top_cell.is_doubly_linked)
+        self.assertTrue(isinstance(top_cell.next, SinglyCell))
+        self.assertFalse(top_cell.next.is_sentinel)
+        self.assertListValues(top_cell, [1, 2, 3])
+        self.assertIsNone(top_cell.next.next.next.next)
+
+        top_cell = make_list((1, 2), use_sentinel=False, compact=True)
+        self.assertTrue(isinstance(top_cell, SinglyCell))
+        self.assertFalse(top_cell.is_sentinel)
+        self.assertListValues(top_cell, [1, 2])
+
+        top_cell = make_list('ab', is_doubly_linked=True, compact=True)
+        self.assertTrue(isinstance(top_cell, DoublyTopSentinel))
+        self.assertTrue(top_cell.is_doubly_linked)
+        self.assertTrue(
+            isinstance(top_cell.bottom_sentinel, DoublyBottomSentinel))
+        self.assertIs(top_cell.next.next.next, top_cell.bottom_sentinel)
+        self.assertEqual(top_cell.next.prev, top_cell)
+        self.assertEqual(top_cell.bottom_sentinel.prev.value, 'b')
+        self.assertListValues(top_cell, ['a', 'b'])
+
+        top_cell = make_list('ab', use_sentinel=False, is_doubly_linked=True,
+                             compact=True)
+        self.assertTrue(isinstance(top_cell, DoublyCell))
+        self.assertEqual(top_cell.next.prev, top_cell)
+        self.assertListValues(top_cell, ['a', 'b'])
+
+    def test_algorithms__compact(self):
+        """The compact cells go through the same algorithms as `Cell`."""
+        for is_doubly_linked in (False, True):
+            top_cell = make_list([1, 3, 4], is_doubly_linked=is_doubly_linked,
+                                 compact=True)
+            new_cell = top_cell.new_cell
+
+            add_at_beginning(top_cell, new_cell(0))
+            add_at_end(top_cell, new_cell(6))
+            insert_cell(find_cell(top_cell.next, 4), new_cell(5))
+            insert_into_sorted(top_cell, new_cell(2))
+            self.assertListValues(top_cell, [0, 1, 2, 3, 4, 5, 6])
+
+            delete_cell(find_cell_before__sentinel(top_cell, 3))
+            self.assertListValues(top_cell, [0, 1, 2, 4, 5, 6])
+            self.assertRaises(AssertionError, insert_cell, top_cell,
+                              top_cell.new_top_sentinel())
+
+            new_top_cell = copy_list(top_cell)
+            self.assertIs(type(new_top_cell), type(top_cell))
+            self.assertListValues(new_top_cell, [0, 1, 2, 4, 5, 6])
+            if is_doubly_linked:
+                self.assertEqual(new_top_cell.bottom_sentinel.prev.value, 6)
+
+        top_cell = make_list([3, 1, 2], compact=True)
+        sorted_top_cell = insertion_sort(top_cell)
+        self.assertTrue(isinstance(sorted_top_cell, SinglyTopSentinel))
+        self.assertListValues(sorted_top_cell, [1, 2, 3])
+
+    def test_merge_sort(self):
+        for is_doubly_linked in (False, True):
+            for values in ([], [1], [12, 2, 8, 6, 1, 3], [1, 2, 3, 4, 5],
+                           [5, 4, 3, 2, 1], [2, 1, 2, 1, 3, 0, 3]):
+                top_cell = make_list(values,
+                                     is_doubly_linked=is_doubly_linked)
+                sorted_top_cell = merge_sort(top_cell)
+                self.assertIs(sorted_top_cell, top_cell)
+                self.assertListValues(top_cell, sorted(values))
+                if is_doubly_linked:
+                    cell = top_cell.bottom_sentinel
+                    backwards = []
+                    while cell.prev is not top_cell:
+                        cell = cell.prev
+                        backwards.append(cell.value)
+                    self.assertEqual(backwards, sorted(values)[::-1])
+
+        # Stable, with a key.
+        values = [(2, 'a'), (1, 'b'), (2, 'c'), (1, 'd'), (0, 'e')]
+        top_cell = make_list(values, is_doubly_linked=True, compact=True)
+        cells = {cell.value: cell for cell in iterate(top_cell)}
+        merge_sort(top_cell, key=lambda value: value[0])
+        self.assertListValues(top_cell, sorted(values, key=lambda v: v[0]))
+        for cell in iterate(top_cell):
+            self.assertIs(cells[cell.value], cell)  # Relinked, not copied.
+
+    def test_make_list__streaming(self):
+        top_cell = make_list(value * 2 for value in range(3))
+        self.assertListValues(top_cell, [0, 2, 4])
+
+        top_cell = make_list(iter('ab'), use_sentinel=False,
+                             is_doubly_linked=True)
+        self.assertListValues(top_cell, ['a', 'b'])
+
+        for compact in (False, True):
+            top_cell = make_list((), is_doubly_linked=True, compact=compact)
+            self.assertListValues(top_cell, [])
+            self.assertIs(top_cell.next, top_cell.bottom_sentinel)
+            self.assertIs(top_cell.bottom_sentinel.prev, top_cell)
+            self.assertListValues(make_list((), compact=compact), [])
+        self.assertRaises(AssertionError, make_list, iter(()), False)
+
+    def test_pipeline(self):
+        top_cell = make_list(range(10))
+        stream = pipeline(top_cell).values().filter(lambda x: x % 2).map(
+            lambda x: x * 10)
+        self.assertEqual(list(stream), [10, 30, 50, 70, 90])
+        self.assertListValues(top_cell, list(range(10)))
+
+        self.assertEqual(list(pipeline(top_cell).values().chunk(4)),
+                         [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9)])
+        self.assertEqual(list(pipeline(top_cell).values().take(4).window(3)),
+                         [(0, 1, 2), (1, 2, 3)])
+        self.assertEqual(list(Pipeline([1]).window(2)), [])
+
+        new_top_cell = pipeline(top_cell).values().take(3).to_list(
+            is_doubly_linked=True)
+        self.assertListValues(new_top_cell, [0, 1, 2])
+        self.assertEqual(new_top_cell.bottom_sentinel.prev.value, 2)
+
+        # An unbounded source is consumed lazily.
+        def counter():
+            value = 0
+            while True:
+                yield value
+                value += 1
+        self.assertEqual(list(Pipeline(counter()).take(3)), [0, 1, 2])
+
+    def test_drain(self):
+        for is_doubly_linked in (False, True):
+            top_cell = make_list([1, 2, 3, 4],
+                                 is_doubly_linked=is_doubly_linked)
+            drained = drain(top_cell)
+            cell = next(drained)
+            self.assertEqual(cell.value, 1)
+            self.assertIsNone(cell.next)
+            self.assertListValues(top_cell, [2, 3, 4])
+
+            values = list(Pipeline(drained).values().take(2))
+            self.assertEqual(values, [2, 3])
+            self.assertListValues(top_cell, [4])
+            self.assertEqual([cell.value for cell in drain(top_cell)], [4])
+            self.assertListValues(top_cell, [])
+
+    def assertLinks(self, top_cell, values):
+        """Check the values both ways, and the bottom sentinel."""
+        self.assertListValues(top_cell, values)
+        if top_cell.is_doubly_linked:
+            backwards = []
+            cell = top_cell.bottom_sentinel.prev
+            while cell is not top_cell:
+                backwards.append(cell.value)
+                cell = cell.prev
+            self.assertEqual(backwards[::-1], values)
+            self.assertIsNone(top_cell.bottom_sentinel.next)
+
+    def test_bulk_operations(self):
+        for is_doubly_linked in (False, True):
+            for compact in (False, True):
+                def new_list(values):
+                    return make_list(values, is_doubly_linked=is_doubly_linked,
+                                     compact=compact)
+
+                top_cell = new_list([1, 2, 3, 4, 5])
+                second = top_cell.next.next
+                fourth = second.next.next
+                range_top_cell = extract_range(top_cell, second, fourth)
+                self.assertIs(type(range_top_cell), type(top_cell))
+                self.assertLinks(top_cell, [1, 5])
+                self.assertLinks(range_top_cell, [2, 3, 4])
+
+                first = unlink_range(range_top_cell, second.next)
+                self.assertIs(first, second)
+                self.assertLinks(range_top_cell, [4])
+                splice(top_cell.next, first, second.next)
+                self.assertLinks(top_cell, [1, 2, 3, 5])
+                splice(find_cell(top_cell.next, 5), *[
+                    unlink_range(range_top_cell, fourth)] * 2)
+                self.assertLinks(top_cell, [1, 2, 3, 5, 4])
+                self.assertLinks(range_top_cell, [])
+
+                tail_top_cell = split_at(top_cell, second)
+                self.assertLinks(top_cell, [1])
+                self.assertLinks(tail_top_cell, [2, 3, 5, 4])
+                tail_top_cell = split_at(top_cell, top_cell.next)
+                self.assertLinks(top_cell, [])
+                self.assertLinks(tail_top_cell, [1])
+
+                top_cell = new_list([1, 2])
+                other_top_cell = new_list([3, 4])
+                self.assertIs(concat(top_cell, other_top_cell), top_cell)
+                self.assertLinks(top_cell, [1, 2, 3, 4])
+                self.assertLinks(other_top_cell, [])
+                concat(top_cell, other_top_cell)
+                concat(other_top_cell, top_cell)
+                self.assertLinks(top_cell, [])
+                self.assertLinks(other_top_cell, [1, 2, 3, 4])
+
+
+class ArrayLinkedListTest(unittest.TestCase):
+
+    def assertListValues(self, array_list, values):
+        self.assertEqual(list(array_list), values)
+        self.assertEqual(len(array_list), len(values))
+        # Walk backwards to check the `prev` links.
+        backwards = []
+        cell = array_list.prev[BOTTOM]
+        while cell != TOP:
+            backwards.append(array_list.values[cell])
+            cell = array_list.prev[cell]
+        self.assertEqual(backwards[::-1], values)
+
+    def test_build(self):
+        self.assertListValues(ArrayLinkedList(), [])
+        self.assertListValues(ArrayLinkedList([1, 2, 3]), [1, 2, 3])
+        array_list = ArrayLinkedList(iter('ab'))
+        array_list.extend('cd')
+        self.assertListValues(array_list, ['a', 'b', 'c', 'd'])
+
+    def test_add(self):
+        array_list = ArrayLinkedList([1, 2])
+        index = array_list.add_at_beginning(0)
+        self.assertEqual(array_list.values[index], 0)
+        array_list.add_at_end(3)
+        self.assertListValues(array_list, [0, 1, 2, 3])
+
+        array_list = ArrayLinkedList()
+        array_list.add_at_end('a')
+        array_list.add_at_beginning('b')
+        self.assertListValues(array_list, ['b', 'a'])
+
+    def test_insert_delete_cell(self):
+        array_list = ArrayLinkedList([1, 2, 3])
+        index = array_list.insert_cell(array_list.find_cell(1), 'a')
+        self.assertListValues(array_list, [1, 'a', 2, 3])
+
+        array_list.delete_cell(array_list.find_cell_before(2))
+        self.assertListValues(array_list, [1, 'a', 3])
+        array_list.delete_cell(TOP)
+        self.assertListValues(array_list, ['a', 3])
+        self.assertRaises(AssertionError, array_list.delete_cell,
+                          array_list.find_cell(3))
+        self.assertRaises(AssertionError, array_list.insert_cell, BOTTOM, 4)
+
+        # The freed slots get reused.
+        slots = len(array_list.values)
+        array_list.add_at_end(4)
+        array_list.add_at_end(5)
+        self.assertEqual(len(array_list.values), slots)
+        array_list.add_at_end(6)
+        self.assertEqual(len(array_list.values), slots + 1)
+        self.assertListValues(array_list, ['a', 3, 4, 5, 6])
+        self.assertEqual(array_list.find_cell('a'), index)
+        self.assertIsNone(array_list.find_cell('b'))
+
+    def test_insert_into_sorted(self):
+        array_list = ArrayLinkedList([1, 3, 4])
+        for value in (2, 0, 5, 3):
+            array_list.insert_into_sorted(value)
+        self.assertListValues(array_list, [0, 1, 2, 3, 3, 4, 5])
+
+        array_list = ArrayLinkedList()
+        array_list.insert_into_sorted(1)
+        self.assertListValues(array_list, [1])
+
+    def test_copy_list(self):
+        array_list = ArrayLinkedList([1, 2, 3])
+        array_list.delete_cell(TOP)
+        new_list = array_list.copy_list()
+        self.assertIsNot(new_list.next, array_list.next)
+        self.assertListValues(new_list, [2, 3])
+
+        new_list.add_at_end(4)
+        self.assertListValues(new_list, [2, 3, 4])
+        self.assertListValues(array_list, [2, 3])
+
+    def test_typed(self):
+        array_list = ArrayLinkedList([1.5, 2.5], typecode='d')
+        self.assertIsInstance(array_list.values, array)
+        self.assertTrue(array_list.sequential)
+        array_list.add_at_end(3.5)
+        self.assertTrue(array_list.sequential)
+        self.assertEqual(array_list.to_array(), array('d', [1.5, 2.5, 3.5]))
+        self.assertEqual(array_list.values_view().tolist(), [1.5, 2.5, 3.5])
+
+        array_list.add_at_beginning(0.5)
+        self.assertFalse(array_list.sequential)
+        array_list.delete_cell(array_list.find_cell_before(2.5))
+        self.assertListValues(array_list, [0.5, 1.5, 3.5])
+        self.assertEqual(array_list.to_array(), array('d', [0.5, 1.5, 3.5]))
+        self.assertRaises(AssertionError, array_list.values_view)
+
+        array_list.compact()
+        self.assertTrue(array_list.sequential)
+        self.assertEqual(array_list.free, -1)
+        self.assertListValues(array_list, [0.5, 1.5, 3.5])
+        self.assertEqual(array_list.values_view().tolist(), [0.5, 1.5, 3.5])
+        array_list.add_at_end(4.5)
+        self.assertListValues(array_list, [0.5, 1.5, 3.5, 4.5])
+
+        array_list = ArrayLinkedList([1], typecode='l')
+        array_list.delete_cell(TOP)
+        array_list.compact()
+        self.assertListValues(array_list, [])
+        array_list.add_at_end(2)
+        self.assertListValues(array_list, [2])
+
+    def test_from_to_array(self):
+        data = array('l', [3, 1, 2])
+        array_list = ArrayLinkedList.from_array(data)
+        self.assertEqual(array_list.typecode, 'l')
+        self.assertListValues(array_list, [3, 1, 2])
+        array_list.extend(array('l', [4]))
+        array_list.extend([5])
+        self.assertListValues(array_list, [3, 1, 2, 4, 5])
+
+        out = array('l', [0] * 6)
+        self.assertIs(array_list.to_array(out), out)
+        self.assertEqual(out.tolist(), [3, 1, 2, 4, 5, 0])
+        array_list.insert_into_sorted(0)
+        out = array('d', [0] * 6)  # Another format, item by item.
+        array_list.to_array(out)
+        self.assertEqual(out.tolist(), [0, 3, 1, 2, 4, 5])
+
+        top_cell = make_list_from_array(data, is_doubly_linked=True)
+        self.assertEqual([cell.value for cell in iterate(top_cell)],
+                         [3, 1, 2])
+        self.assertEqual(list_to_array(top_cell, typecode='l'), data)
+        out = array('l', [0, 0, 0])
+        list_to_array(top_cell, out)
+        self.assertEqual(out, data)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed.")
+    def test_numpy(self):
+        data = numpy.arange(5, dtype=numpy.float64)
+        array_list = ArrayLinkedList.from_array(data)
+        view = array_list.to_numpy()
+        self.assertEqual(view.tolist(), [0, 1, 2, 3, 4])
+        array_list.values[2] = 10  # The view shares the memory.
+        self.assertEqual(view[0], 10)
+        copy = array_list.to_numpy(view=False)
+        array_list.values[2] = 0
+        self.assertEqual(copy[0], 10)
+
+        out = numpy.zeros(5)
+        array_list.to_array(out)
+        self.assertEqual(out.tolist(), [0, 1, 2, 3, 4])
+        top_cell = make_list_from_array(data)
+        self.assertEqual(list_to_array(top_cell, numpy.zeros(5)).tolist(),
+                         [0, 1, 2, 3, 4])
+
+
+class LinkedListHandleTest(unittest.TestCase):
+
+    def assertHandle(self, linked_list, values):
+        self.assertEqual([cell.value for cell in linked_list], values)
+        self.assertEqual(len(linked_list), len(values))
+        if values:
+            self.assertEqual(linked_list.tail.value, values[-1])
+        else:
+            self.assertIs(linked_list.tail, linked_list.top_cell)
+        top_cell = linked_list.top_cell
+        if top_cell.is_doubly_linked:
+            self.assertIs(top_cell.bottom_sentinel.prev, linked_list.tail)
+
+    def test_mutations(self):
+        for is_doubly_linked in (False, True):
+            for compact in (False, True):
+                linked_list = LinkedList(
+                    is_doubly_linked=is_doubly_linked, compact=compact)
+                new_cell = linked_list.top_cell.new_cell
+                self.assertHandle(linked_list, [])
+
+                linked_list.add_at_beginning(new_cell(2))
+                self.assertHandle(linked_list, [2])
+                linked_list.add_at_end(new_cell(4))
+                linked_list.add_at_beginning(new_cell(1))
+                self.assertHandle(linked_list, [1, 2, 4])
+
+                linked_list.insert_into_sorted(new_cell(3))
+                linked_list.insert_into_sorted(new_cell(5))
+                linked_list.insert_into_sorted(new_cell(0))
+                self.assertHandle(linked_list, [0, 1, 2, 3, 4, 5])
+
+                linked_list.insert_cell(linked_list.tail, new_cell(6))
+                self.assertHandle(linked_list, [0, 1, 2, 3, 4, 5, 6])
+
+                linked_list.delete_cell(find_cell(linked_list.top_cell, 5))
+                self.assertHandle(linked_list, [0, 1, 2, 3, 4, 5])
+                linked_list.delete_cell(linked_list.top_cell)
+                self.assertHandle(linked_list, [1, 2, 3, 4, 5])
+
+                while len(linked_list):
+                    linked_list.delete_cell(linked_list.top_cell)
+                self.assertHandle(linked_list, [])
+                linked_list.insert_into_sorted(new_cell(1))
+                self.assertHandle(linked_list, [1])
+
+    def test_wrap(self):
+        linked_list = LinkedList([3], top_cell=make_list([1, 2]))
+        self.assertHandle(linked_list, [1, 2, 3])
+
+        top_cell = make_list([1, 2], is_doubly_linked=True)
+        linked_list = LinkedList(range(3, 6), top_cell=top_cell)
+        self.assertHandle(linked_list, [1, 2, 3, 4, 5])
+
+    def test_add_at_end__doubly_linked(self):
+        top_cell = make_list([1, 2], is_doubly_linked=True)
+        add_at_end(top_cell, Cell(3, is_doubly_linked=True))
+        self.assertEqual(top_cell.bottom_sentinel.prev.value, 3)
+        self.assertEqual([cell.value for cell in iterate(top_cell)],
+                         [1, 2, 3])
+
+    def test_bulk_operations(self):
+        for is_doubly_linked in (False, True):
+            linked_list = LinkedList(range(6),
+                                     is_doubly_linked=is_doubly_linked)
+            cells = list(linked_list)
+
+            tail_list = linked_list.split_at(cells[4])
+            self.assertHandle(linked_list, [0, 1, 2, 3])
+            self.assertHandle(tail_list, [4, 5])
+
+            range_list = linked_list.extract_range(cells[1], cells[2])
+            self.assertHandle(linked_list, [0, 3])
+            self.assertHandle(range_list, [1, 2])
+
+            linked_list.concat(tail_list)
+            self.assertHandle(linked_list, [0, 3, 4, 5])
+            self.assertHandle(tail_list, [])
+            tail_list.concat(linked_list)
+            self.assertHandle(tail_list, [0, 3, 4, 5])
+            self.assertHandle(linked_list, [])
+
+            first = range_list.top_cell.next
+            last = range_list.tail
+            range_list.extract_range(first, last)
+            tail_list.splice(tail_list.tail, first, last)
+            self.assertHandle(tail_list, [0, 3, 4, 5, 1, 2])
+            self.assertHandle(range_list, [])
+
+
+class IndexedLinkedListTest(unittest.TestCase):
+
+    def assertIndex(self, linked_list):
+        cell_before = linked_list.top_cell
+        indexed = 0
+        for cell in linked_list:
+            self.assertIn(cell, linked_list.find_cells(cell.value))
+            if not cell.is_doubly_linked:
+                self.assertIs(linked_list.cells_before[cell], cell_before)
+            cell_before = cell
+        for cells in linked_list.cells.values():
+            indexed += len(cells)
+        self.assertEqual(indexed, len(linked_list))
+        if not linked_list.top_cell.is_doubly_linked:
+            self.assertEqual(len(linked_list.cells_before), len(linked_list))
+
+    def test_mutations(self):
+        for is_doubly_linked in (False, True):
+            linked_list = IndexedLinkedList(
+                [3, 1, 4, 1, 5], is_doubly_linked=is_doubly_linked)
+            new_cell = linked_list.top_cell.new_cell
+            self.assertIndex(linked_list)
+
+            first_one = linked_list.find_cell(1)
+            self.assertIs(first_one, linked_list.top_cell.next.next)
+            self.assertEqual(linked_list.find_cell_before(1).value, 3)
+            self.assertEqual(len(linked_list.find_cells(1)), 2)
+            self.assertIsNone(linked_list.find_cell(9))
+            self.assertIsNone(linked_list.find_cell_before(9))
+
+            linked_list.add_at_beginning(new_cell(9))
+            linked_list.add_at_end(new_cell(2))
+            linked_list.insert_cell(first_one, new_cell(6))
+            self.assertIndex(linked_list)
+            self.assertIs(linked_list.find_cell_before(6), first_one)
+
+            self.assertIs(linked_list.delete_value(1), first_one)
+            self.assertIndex(linked_list)
+            self.assertEqual([cell.value for cell in linked_list],
+                             [9, 3, 6, 4, 1, 5, 2])
+            self.assertEqual(linked_list.find_cell_before(6).value, 3)
+            self.assertEqual(len(linked_list.find_cells(1)), 1)
+
+            for value in [9, 3, 6, 4, 1, 5, 2]:
+                linked_list.delete_value(value)
+                self.assertIndex(linked_list)
+            self.assertRaises(KeyError, linked_list.delete_value, 2)
+            self.assertEqual(linked_list.cells, {})
+
+            for value in [2, 0, 1]:
+                linked_list.insert_into_sorted(new_cell(value))
+            self.assertIndex(linked_list)
+            self.assertEqual(linked_list.find_cell_before(2).value, 1)
+
+    def test_key(self):
+        top_cell = make_list(['apple', 'Bob', 'avocado'])
+        linked_list = IndexedLinkedList(['bee'], top_cell=top_cell,
+                                        key=lambda value: value[0].lower())
+        self.assertIndex(linked_list)
+        self.assertEqual(linked_list.find_cell('a').value, 'apple')
+        self.assertEqual([cell.value for cell in linked_list.find_cells('b')],
+                         ['Bob', 'bee'])
+        self.assertEqual(linked_list.delete_value('b').value, 'Bob')
+        self.assertEqual(linked_list.find_cell_before('b').value, 'avocado')
+
+    def test_bulk_operations(self):
+        for is_doubly_linked in (False, True):
+            linked_list = IndexedLinkedList(
+                [1, 2, 3, 4, 5], is_doubly_linked=is_doubly_linked)
+            other = IndexedLinkedList([6, 7],
+                                      is_doubly_linked=is_doubly_linked)
+            linked_list.concat(other)
+            self.assertIndex(linked_list)
+            self.assertIndex(other)
+            self.assertEqual(linked_list.find_cell_before(6).value, 5)
+
+            plain_list = LinkedList([8, 9], is_doubly_linked=is_doubly_linked)
+            linked_list.concat(plain_list)
+            self.assertIndex(linked_list)
+            self.assertEqual(len(plain_list), 0)
+            self.assertEqual(linked_list.delete_value(9).value, 9)
+            self.assertEqual(linked_list.delete_value(8).value, 8)
+
+            range_list = linked_list.extract_range(
+                linked_list.find_cell(2), linked_list.find_cell(3))
+            self.assertIndex(linked_list)
+            self.assertIndex(range_list)
+            self.assertIsNone(linked_list.find_cell(2))
+            self.assertEqual(linked_list.find_cell_before(4).value, 1)
+            self.assertIs(range_list.find_cell_before(2),
+                          range_list.top_cell)
+
+            tail_list = linked_list.split_at(linked_list.find_cell(6))
+            self.assertIndex(linked_list)
+            self.assertIndex(tail_list)
+            self.assertEqual([cell.value for cell in tail_list], [6, 7])
+
+            six = tail_list.delete_value(6)
+            self.assertIndex(tail_list)
+            linked_list.splice(linked_list.find_cell(1), six, six)
+            self.assertIndex(linked_list)
+            self.assertEqual([cell.value for cell in linked_list],
+                             [1, 6, 4, 5])
+
+
+class SkipListTest(unittest.TestCase):
+
+    def assertIndex(self, skip_list, values):
+        self.assertEqual([cell.value for cell in skip_list], values)
+        self.assertEqual(len(skip_list), len(values))
+        cells = list(skip_list)
+        for head in skip_list.heads:  # Every level is sorted and complete.
+            node = head.next
+            level_cells = []
+            while node:
+                level_cells.append(node.cell)
+                node = node.next
+            self.assertEqual(
+                level_cells, [cell for cell in cells if cell in level_cells])
+            values = [cell.value for cell in level_cells]
+            self.assertEqual(values, sorted(values))
+
+    def test_insert_delete(self):
+        for is_doubly_linked in (False, True):
+            skip_list = SkipList(is_doubly_linked=is_doubly_linked, seed=1)
+            values = list(range(200)) * 2
+            random.Random(2).shuffle(values)
+            for value in values:
+                skip_list.insert(skip_list.top_cell.new_cell(value))
+            self.assertIndex(skip_list, sorted(values))
+            self.assertGreater(len(skip_list.heads), 1)
+            if is_doubly_linked:
+                self.assertEqual(
+                    skip_list.top_cell.bottom_sentinel.prev.value, 199)
+
+            for value in values[:300]:
+                cell = skip_list.delete(value)
+                self.assertEqual(cell.value, value)
+                values.remove(value)
+            self.assertIndex(skip_list, sorted(values))
+            self.assertRaises(KeyError, skip_list.delete, 1000)
+
+    def test_find(self):
+        skip_list = SkipList([5, 1, 3, 3, 9], seed=1)
+        self.assertEqual([cell.value for cell in skip_list], [1, 3, 3, 5, 9])
+        self.assertEqual(skip_list.find_cell(5).value, 5)
+        self.assertIs(skip_list.find_cell(3), skip_list.top_cell.next.next)
+        self.assertIsNone(skip_list.find_cell(4))
+        self.assertIsNone(skip_list.find_cell(10))
+        self.assertIs(skip_list.find_cell_before(1), skip_list.top_cell)
+        self.assertEqual(skip_list.find_cell_before(9).value, 5)
+
+        self.assertEqual(
+            [cell.value for cell in skip_list.iterate_range(2, 9)], [3, 3, 5])
+        self.assertEqual(
+            [cell.value for cell in skip_list.iterate_range(0, 100)],
+            [1, 3, 3, 5, 9])
+        self.assertEqual(list(skip_list.iterate_range(6, 9)), [])
+
+    def test_wrap(self):
+        top_cell = make_list(range(100), is_doubly_linked=True)
+        skip_list = SkipList(top_cell=top_cell, seed=1)
+        self.assertIndex(skip_list, list(range(100)))
+        skip_list.insert(Cell(50.5, is_doubly_linked=True))
+        self.assertEqual(skip_list.find_cell_before(51).value, 50.5)
+        self.assertEqual(
+            [cell.value for cell in iterate(copy_list(top_cell))][50:53],
+            [50, 50.5, 51])
+
+
+class CacheTest(unittest.TestCase):
+
+    def test_lru(self):
+        evicted = []
+        cache = LRUCache(max_entries=3,
+                         on_evict=lambda key, value: evicted.append(key))
+        for key in 'abc':
+            cache.put(key, key.upper())
+        self.assertEqual(cache.keys(), ['c', 'b', 'a'])
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertEqual(cache.keys(), ['a', 'c', 'b'])
+        self.assertIsNone(cache.get('x'))
+
+        cache.put('d', 'D')
+        self.assertEqual(evicted, ['b'])
+        self.assertNotIn('b', cache)
+        cache.put('c', 'C2')
+        self.assertEqual(cache.keys(), ['c', 'd', 'a'])
+        self.assertEqual(cache.get('c'), 'C2')
+
+        self.assertEqual(cache.pop('a'), 'A')
+        self.assertRaises(KeyError, cache.pop, 'a')
+        self.assertIsNone(cache.pop('a', None))
+        self.assertEqual(cache.stats(), {
+            'hits': 2, 'misses': 1, 'evictions': 1, 'entries': 2,
+            'bytes': 0})
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.keys(), [])
+
+    def test_lru__bytes(self):
+        cache = LRUCache(max_bytes=10, sizeof=lambda key, value: len(value))
+        cache.put('a', 'xxxx')
+        cache.put('b', 'xxxx')
+        cache.put('c', 'xxxx')
+        self.assertEqual(cache.keys(), ['c', 'b'])
+        self.assertEqual(cache.total_bytes, 8)
+        cache.put('b', 'x')
+        self.assertEqual(cache.total_bytes, 5)
+        self.assertEqual(cache.evictions, 1)
+        cache.put('d', 'x' * 20)  # Too large to cache, evicts nothing.
+        self.assertNotIn('d', cache)
+        self.assertEqual(cache.keys(), ['b', 'c'])
+        self.assertEqual(cache.total_bytes, 5)
+        self.assertEqual(cache.evictions, 1)
+        cache.put('c', 'x' * 11)  # The older value is dropped.
+        self.assertEqual(cache.keys(), ['b'])
+        self.assertEqual(cache.total_bytes, 1)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_lfu(self):
+        evicted = []
+        cache = LFUCache(max_entries=3,
+                         on_evict=lambda key, value: evicted.append(key))
+        for key in 'abc':
+            cache.put(key, key.upper())
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual(cache.frequency('a'), 3)
+        self.assertEqual(cache.frequency('b'), 2)
+        self.assertEqual(cache.frequency('c'), 1)
+
+        cache.put('d', 'D')
+        cache.put('e', 'E')
+        self.assertEqual(evicted, ['c', 'd'])
+        cache.get('e')
+        cache.put('f', 'F')  # b and e have 2 hits, b is the older one.
+        self.assertEqual(evicted, ['c', 'd', 'b'])
+        cache.put('g', 'G')
+        cache.get('g')
+        cache.get('g')
+        cache.put('h', 'H')
+        self.assertEqual(evicted, ['c', 'd', 'b', 'f', 'e'])
+        self.assertEqual(sorted(cache.cells), ['a', 'g', 'h'])
+
+        # The buckets stay in increasing order, with no empty ones.
+        frequencies = []
+        bucket = cache.top_cell.next
+        while not bucket.is_bottom_sentinel:
+            self.assertFalse(bucket.cells.next.is_bottom_sentinel)
+            frequencies.append(bucket.value)
+            bucket = bucket.next
+        self.assertEqual(frequencies, [1, 3])
+
+    def test_memoize(self):
+        calls = []
+        cache = LRUCache(max_entries=2)
+
+        @cache.memoize
+        def square(x, offset=0):
+            calls.append(x)
+            return x * x + offset
+
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3, offset=1), 10)
+        self.assertEqual(calls, [3, 3])
+        self.assertIs(square.cache, cache)
+        self.assertEqual(cache.get_or_compute('k', lambda: 1), 1)
+        self.assertEqual(cache.get_or_compute('k', lambda: 2), 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+
+class ConcurrentSortedListTest(unittest.TestCase):
+
+    def assertSorted(self, concurrent_list, values):
+        self.assertEqual([cell.value for cell in concurrent_list], values)
+        self.assertFalse(any(cell.marked for cell in concurrent_list))
+
+    def test_operations(self):
+        concurrent_list = ConcurrentSortedList([3, 1, 2])
+        self.assertSorted(concurrent_list, [1, 2, 3])
+        concurrent_list.insert_into_sorted(LockingCell(2))
+        concurrent_list.insert_into_sorted(LockingCell(0))
+        concurrent_list.insert_into_sorted(LockingCell(4))
+        self.assertSorted(concurrent_list, [0, 1, 2, 2, 3, 4])
+
+        self.assertIn(2, concurrent_list)
+        cell = concurrent_list.delete_value(2)
+        self.assertTrue(cell.marked)
+        self.assertIn(2, concurrent_list)
+        concurrent_list.delete_value(2)
+        self.assertNotIn(2, concurrent_list)
+        self.assertRaises(KeyError, concurrent_list.delete_value, 2)
+        self.assertRaises(KeyError, concurrent_list.delete_value, 5)
+        concurrent_list.delete_value(4)
+        self.assertSorted(concurrent_list, [0, 1, 3])
+        self.assertEqual(concurrent_list.find_cell(3).value, 3)
+        self.assertIsNone(concurrent_list.find_cell(5))
+
+    def test_find_cell__marked(self):
+        """A cell marked by a delete in progress, still linked, mustn't hide
+        a live duplicate after it.
+        """
+        concurrent_list = ConcurrentSortedList([1, 2, 2, 3])
+        first = concurrent_list.top_cell.next.next
+        second = first.next
+        first.marked = True
+        self.assertIs(concurrent_list.find_cell(2), second)
+        second.marked = True
+        self.assertIsNone(concurrent_list.find_cell(2))
+        self.assertNotIn(2, concurrent_list)
+
+    def test_threads(self):
+        """Several threads insert, find and delete at once; each thread's own
+        values must all be there or all gone at the end.
+        """
+        concurrent_list = ConcurrentSortedList()
+        threads = 8
+        count = 300
+
+        def work(thread):
+            rng = random.Random(thread)
+            values = [rng.randrange(1000) * threads + thread
+                      for _ in range(count)]
+            for value in values:
+                concurrent_list.insert_into_sorted(LockingCell(value))
+            for value in values:
+                assert concurrent_list.find_cell(value) is not None
+            kept = values[::2]
+            for value in values[1::2]:
+                concurrent_list.delete_value(value)
+            return kept
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            kept = [value for values in executor.map(work, range(threads))
+                    for value in values]
+        self.assertSorted(concurrent_list, sorted(kept))
+
+
+class LoopTest(unittest.TestCase):
+
+    def make_loop(self, values, loop_start_index, **kwargs):
+        """Make a list whose last cell links back to the cell at the index.
+        """
+        top_cell = make_list(values, **kwargs)
+        cells = list(iterate(top_cell))
+        cells[-1].next = cells[loop_start_index]
+        return top_cell, cells[loop_start_index]
+
+    def test_detect(self):
+        detectors = (has_loop__hash_set, has_loop__tortoise_and_hare,
+                     has_loop__brent)
+        for size in (1, 2, 3, 10, 101):
+            for use_sentinel in (True, False):
+                top_cell = make_list(range(size), use_sentinel=use_sentinel)
+                for has_loop in detectors:
+                    self.assertFalse(has_loop(top_cell))
+                self.assertIsNone(find_loop_start(top_cell))
+                self.assertFalse(break_loop(top_cell))
+
+                for loop_start_index in {0, size // 2, size - 1}:
+                    top_cell, loop_start = self.make_loop(
+                        range(size), loop_start_index,
+                        use_sentinel=use_sentinel)
+                    for has_loop in detectors:
+                        self.assertTrue(has_loop(top_cell))
+                    self.assertIs(find_loop_start(top_cell), loop_start)
+
+                    self.assertTrue(break_loop(top_cell))
+                    self.assertEqual(
+                        [cell.value for cell in iterate(top_cell)],
+                        list(range(size)))
+        self.assertFalse(has_loop__brent(None))
+
+    def test_break_loop__doubly_linked(self):
+        top_cell, _ = self.make_loop(range(5), 2, is_doubly_linked=True)
+        self.assertTrue(break_loop(top_cell))
+        self.assertEqual(top_cell.bottom_sentinel.prev.value, 4)
+        self.assertEqual(
+            [cell.value for cell in iterate(top_cell, guarded=True)],
+            list(range(5)))
+
+    def test_guarded(self):
+        for use_sentinel in (True, False):
+            for loop_start_index in (0, 3, 9):
+                top_cell, _ = self.make_loop(range(10), loop_start_index,
+                                             use_sentinel=use_sentinel)
+                cells = iterate(top_cell, guarded=True)
+                self.assertRaises(LoopError, list, cells)
+                if use_sentinel:
+                    self.assertRaises(LoopError, copy_list, top_cell,
+                                      guarded=True)
+
+            top_cell = make_list(range(10), use_sentinel=use_sentinel)
+            self.assertEqual(
+                [cell.value for cell in iterate(top_cell, guarded=True)],
+                list(range(10)))
+        self.assertEqual(list(iterate(make_list([]), guarded=True)), [])
+        self.assertEqual(
+            [cell.value
+             for cell in iterate(copy_list(make_list('ab'), guarded=True))],
+            ['a', 'b'])
+
+
+class ThreadedListTest(unittest.TestCase):
+
+    records = [('carol', 3), ('alice', 5), ('bob', 1), ('dave', 4),
+               ('alice', 2)]
+
+    def make_threaded_list(self):
+        return ThreadedList({
+            'name': lambda record: record[0],
+            'time': lambda record: record[1],
+            'added': None,
+        }, self.records)
+
+    def test_threads(self):
+        threaded_list = self.make_threaded_list()
+        self.assertEqual(len(threaded_list), 5)
+        self.assertEqual(threaded_list.values('added'), self.records)
+        self.assertEqual(threaded_list.values('time'),
+                         sorted(self.records, key=lambda r: r[1]))
+        # Like `insert_into_sorted`, a cell goes before the equal ones.
+        self.assertEqual(threaded_list.values('name'),
+                         sorted(self.records[::-1], key=lambda r: r[0]))
+        # The threads share the cells.
+        self.assertEqual(set(threaded_list.iterate('name')),
+                         set(threaded_list.iterate('time')))
+
+        threaded_list.insert(('eve', 0))
+        self.assertEqual(threaded_list.values('time')[0], ('eve', 0))
+        self.assertEqual(threaded_list.values('name')[-1], ('eve', 0))
+        self.assertEqual(threaded_list.values('added')[-1], ('eve', 0))
+
+    def test_find_delete(self):
+        threaded_list = self.make_threaded_list()
+        cell = threaded_list.find_cell('name', 'alice')
+        self.assertEqual(cell.value, ('alice', 2))
+        self.assertIs(threaded_list.find_cell('time', 2), cell)
+        self.assertIsNone(threaded_list.find_cell('name', 'zed'))
+        self.assertRaises(AssertionError, threaded_list.find_cell, 'added', 1)
+
+        threaded_list.delete_cell(cell)
+        records = self.records[:-1]
+        self.assertEqual(threaded_list.values('added'), records)
+        self.assertEqual(threaded_list.values('time'),
+                         sorted(records, key=lambda r: r[1]))
+        self.assertEqual(threaded_list.values('name'),
+                         sorted(records, key=lambda r: r[0]))
+
+        # Deleting the last added cell moved the tail back.
+        threaded_list.insert(('frank', 6))
+        self.assertEqual(threaded_list.values('added'),
+                         records + [('frank', 6)])
+        for cell in list(threaded_list.iterate('time')):
+            threaded_list.delete_cell(cell)
+        self.assertEqual(threaded_list.values('name'), [])
+        self.assertEqual(len(threaded_list), 0)
+
+    def test_insert_into(self):
+        threaded_list = self.make_threaded_list()
+        cell = threaded_list.insert(('bob', 0), names=['time'])
+        self.assertEqual(len(threaded_list), 6)
+        self.assertEqual(threaded_list.values('time')[0], ('bob', 0))
+        self.assertNotIn(('bob', 0), threaded_list.values('name'))
+        self.assertNotIn(('bob', 0), threaded_list.values('added'))
+        self.assertFalse(threaded_list.contains('name', cell))
+
+        threaded_list.insert_into('name', cell)
+        self.assertTrue(threaded_list.contains('name', cell))
+        self.assertEqual(threaded_list.values('name'),
+                         [('alice', 2), ('alice', 5), ('bob', 0), ('bob', 1),
+                          ('carol', 3), ('dave', 4)])
+        self.assertRaises(AssertionError, threaded_list.insert_into, 'name',
+                          cell)
+        threaded_list.insert_into('added', cell)
+        self.assertEqual(threaded_list.values('added')[-1], ('bob', 0))
+        self.assertEqual(len(threaded_list), 6)
+
+        # Deleting from some threads only keeps the cell in the others.
+        threaded_list.delete_cell(cell, names=['time', 'added'])
+        self.assertNotIn(('bob', 0), threaded_list.values('time'))
+        self.assertIn(('bob', 0), threaded_list.values('name'))
+        self.assertEqual(len(threaded_list), 6)
+        threaded_list.delete_cell(cell)
+        threaded_list.delete_cell(cell)
+        self.assertEqual(len(threaded_list), 5)
+        self.assertNotIn(('bob', 0), threaded_list.values('name'))
+        self.assertEqual(threaded_list.values('added'), self.records)
+
+
+class PersistenceTest(unittest.TestCase):
+
+    def test_dump_load(self):
+        for is_doubly_linked in (False, True):
+            values = [random.random() for _ in range(1000)]
+            top_cell = make_list(values, is_doubly_linked=is_doubly_linked)
+            file = io.BytesIO()
+            self.assertEqual(dump(top_cell, file), len(values))
+            file.seek(0)
+            self.assertEqual(list(iter_values(file)), values)
+            file.seek(0)
+            loaded = load(file, compact=True)
+            self.assertEqual(loaded.is_doubly_linked, is_doubly_linked)
+            self.assertEqual([cell.value for cell in iterate(loaded)], values)
+
+        file = io.BytesIO()
+        dump(make_list([]), file, typecode='q')
+        file.seek(0)
+        self.assertEqual(list(iterate(load(file))), [])
+        self.assertRaises(ValueError, load, io.BytesIO(bytes(64)))
+
+    def test_long_list(self):
+        # Far beyond the recursion limit, which breaks pickling the cells.
+        values = range(200000)
+        file = io.BytesIO()
+        dump(make_list(values, compact=True), file, typecode='l')
+        file.seek(0)
+        self.assertEqual(list(iter_values(file)), list(values))
+
+    def test_mapped_list(self):
+        values = [3, 1, 4, 1, 5]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'list.bin')
+            with open(path, 'wb') as file:
+                dump(make_list(values, is_doubly_linked=True), file, 'h')
+            with MappedList(path) as mapped_list:
+                self.assertEqual(len(mapped_list), 5)
+                self.assertEqual(list(mapped_list), values)
+                self.assertEqual(
+                    [cell.value for cell in iterate(mapped_list.top_cell)],
+                    values)
+                cell = find_cell(mapped_list.top_cell, 4)
+                self.assertEqual(cell.index, 2)
+                self.assertEqual(cell.prev.value, 1)
+                self.assertEqual(cell.next.next.value, 5)
+                self.assertIsNone(cell.next.next.next)
+                self.assertIs(cell.prev.prev.prev, mapped_list.top_cell)
+
+    def test_truncated(self):
+        file = io.BytesIO()
+        dump(make_list(range(100), is_doubly_linked=True), file, 'q')
+        data = file.getvalue()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'list.bin')
+            for size in (HEADER.size - 1, HEADER.size + 8, len(data) - 8):
+                if size < HEADER.size + 800:  # Cut inside the values.
+                    self.assertRaises(ValueError, list,
+                                      iter_values(io.BytesIO(data[:size])))
+                    self.assertRaises(ValueError, load,
+                                      io.BytesIO(data[:size]))
+                with open(path, 'wb') as file:
+                    file.write(data[:size])
+                self.assertRaises(ValueError, MappedList, path)
+
+
+class BenchmarkSuiteTest(unittest.TestCase):
+
+    def test_fit_exponent(self):
+        sizes = [10, 100, 1000]
+        self.assertAlmostEqual(suite.fit_exponent(sizes, [5, 5, 5]), 0)
+        self.assertAlmostEqual(
+            suite.fit_exponent(sizes, [size ** 2 for size in sizes]), 2)
+        self.assertIsNone(suite.fit_exponent([10], [1]))
+
+    def test_run_and_compare(self):
+        results = suite.run_suite(sizes=(10, 100), repeat=1,
+                                  names=['find_cell', 'insertion_sort'])
+        self.assertEqual(len(results['results']), 4 * 2 + 2)
+        self.assertEqual(
+            {result['variant'] for result in results['results']},
+            {'singly/sentinel', 'doubly/sentinel', 'singly/no_sentinel',
+             'doubly/no_sentinel'})
+        for result in results['results']:
+            self.assertGreater(result['ns_per_op'], 0)
+        self.assertEqual(suite.compare(results, results), [])
+
+        slower = {
+            'results': [dict(result, ns_per_op=result['ns_per_op'] * 2)
+                        for result in results['results']],
+            'exponents': [dict(exponent, exponent=exponent['exponent'] + 1)
+                          for exponent in results['exponents']],
+        }
+        regressions = suite.compare(results, slower)
+        self.assertEqual(len(regressions), 10 + 5)
+        self.assertEqual(suite.compare(slower, results), [])
+
+    def test_min_size(self):
+        results = suite.run_suite(sizes=(suite.MIN_SIZE,), repeat=1,
+                                  names=['delete_cell', 'add_at_end'])
+        for result in results['results']:
+            self.assertGreater(result['ns_per_op'], 0)
+        self.assertRaises(AssertionError, suite.run_suite, sizes=(1, 10))
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, suite.main, ['--sizes', '0'])
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_counts(self):
+        plain_find_cell = algorithms.find_cell
+        histogram = instrumentation.Histogram()
+        measurements = []
+        with instrumentation.instrumented(histogram, measurements.append):
+            self.assertIsNot(algorithms.find_cell, plain_find_cell)
+            top_cell = algorithms.make_list(range(10))
+            self.assertEqual(algorithms.find_cell(top_cell, 5).value, 5)
+            algorithms.insert_into_sorted(top_cell, Cell(3.5))
+            self.assertEqual(len(list(algorithms.iterate(top_cell))), 11)
+        self.assertIs(algorithms.find_cell, plain_find_cell)
+        self.assertFalse(instrumentation.is_enabled())
+
+        self.assertEqual(
+            [measurement.operation for measurement in measurements],
+            ['make_list', 'find_cell', 'find_sorted_position',
+             'insert_into_sorted', 'iterate'])
+        # The top sentinel and the cells 0 to 5.
+        self.assertEqual(measurements[1].cells, 7)
+        # Passed 0 to 3, and stopped at 4.
+        self.assertEqual(measurements[2].cells, 4)
+        self.assertEqual(measurements[2].comparisons, 5)
+        self.assertEqual(measurements[3][1:3], measurements[2][1:3])
+        self.assertEqual(measurements[4].cells, 11)
+
+        self.assertEqual(histogram.calls['find_cell'], 1)
+        self.assertEqual(histogram.cell_buckets['find_cell'], {3: 1})
+        summary = {entry['operation']: entry
+                   for entry in histogram.summary()}
+        self.assertEqual(summary['insert_into_sorted']['comparisons'], 5)
+
+        # Disabled, nothing is counted.
+        algorithms.find_cell(top_cell, 5)
+        self.assertEqual(len(measurements), 5)
+
+    def test_counting_variants(self):
+        """The counting searches must return what the plain ones do."""
+        counting = instrumentation._COUNTING
+        self.assertEqual(set(counting), {
+            'find_cell_before__sentinel', 'find_cell_before__no_sentinel',
+            'find_cell', 'find_cell_before_cell', 'find_sorted_position',
+            'find_last_cell'})
+        values = [0, 2, 2, 4, 6, 8]
+        for is_doubly_linked in (False, True):
+            top_cell = make_list(values, is_doubly_linked=is_doubly_linked)
+            no_sentinel = make_list(values, use_sentinel=False,
+                                    is_doubly_linked=is_doubly_linked)
+            cells = list(iterate(top_cell))[1:]
+            calls = [('find_last_cell', top_cell)]
+            for value in range(-1, 10):
+                calls += [('find_cell_before__sentinel', top_cell, value),
+                          ('find_cell_before__no_sentinel', no_sentinel,
+                           value),
+                          ('find_cell', top_cell, value),
+                          ('find_cell', no_sentinel, value),
+                          ('find_sorted_position', top_cell, Cell(value))]
+            calls += [('find_cell_before_cell', top_cell, cell)
+                      for cell in cells if not cell.is_sentinel]
+            for name, *args in calls:
+                self.assertIs(counting[name](*args),
+                              getattr(algorithms, name)(*args),
+                              (name, is_doubly_linked, args[1:]))
+        self.assertIsNone(counting['find_cell_before__no_sentinel'](None, 1))
+
+    def test_statsd(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.bind(('127.0.0.1', 0))
+        listener.settimeout(5)
+        sink = instrumentation.StatsdSink(*listener.getsockname(),
+                                          prefix='test')
+        try:
+            with instrumentation.instrumented(sink):
+                algorithms.find_cell(algorithms.make_list('abc'), 'b')
+            lines = [listener.recv(4096).decode().split('\n')
+                     for _ in range(2)]
+        finally:
+            sink.close()
+            listener.close()
+        self.assertEqual(lines[0][0], 'test.make_list.calls:1|c')
+        self.assertEqual(lines[1][:3], ['test.find_cell.calls:1|c',
+                                        'test.find_cell.cells:3|c',
+                                        'test.find_cell.comparisons:0|c'])
+        self.assertRegex(lines[1][3], r'^test\.find_cell\.time:[0-9.]+\|ms$')
+
+
+class PersistentListTest(unittest.TestCase):
+
+    def test_versions(self):
+        empty = PersistentList()
+        self.assertEqual(len(empty), 0)
+        self.assertRaises(IndexError, empty.pop)
+
+        abc = PersistentList('abc')
+        xabc = abc.prepend('x')
+        self.assertEqual(xabc.values(), ['x', 'a', 'b', 'c'])
+        self.assertIs(xabc.head.next, abc.head)  # Shared cells.
+        value, rest = xabc.pop()
+        self.assertEqual(value, 'x')
+        self.assertIs(rest.head, abc.head)
+        self.assertEqual(len(rest), 3)
+
+        aXc = abc.set(1, 'X')
+        self.assertEqual(aXc.values(), ['a', 'X', 'c'])
+        self.assertIs(aXc.head.next.next, abc.head.next.next)
+        self.assertEqual(abc.insert(3, 'd').values(), list('abcd'))
+        self.assertEqual(abc.insert(0, 'z').values(), list('zabc'))
+        ac = abc.delete(1)
+        self.assertEqual(ac.values(), ['a', 'c'])
+        self.assertIs(ac.head.next, abc.head.next.next)
+        self.assertEqual(abc[2], 'c')
+        self.assertRaises(IndexError, abc.__getitem__, 3)
+        self.assertRaises(IndexError, abc.delete, 3)
+        # The old version is unchanged.
+        self.assertEqual(abc.values(), list('abc'))
+        self.assertRaises(AttributeError, setattr, abc.head, 'value', 'z')
+        self.assertEqual(find_cell(abc.head, 'b').value, 'b')
+
+    def test_conversion(self):
+        top_cell = PersistentList(range(5)).to_list(is_doubly_linked=True)
+        self.assertTrue(top_cell.is_top_sentinel)
+        self.assertEqual([cell.value for cell in iterate(top_cell)],
+                         list(range(5)))
+        persistent_list = PersistentList.from_list(top_cell)
+        self.assertEqual(persistent_list.values(), list(range(5)))
+        delete_cell(top_cell)
+        self.assertEqual(len(persistent_list), 5)
+
+    def test_handle(self):
+        handle = PersistentHandle([1, 2])
+        snapshot = handle.snapshot()
+        handle.prepend(0)
+        self.assertEqual(handle.pop(), 0)
+        self.assertEqual(handle.pop(), 1)
+        self.assertEqual(handle.snapshot().values(), [2])
+        self.assertEqual(snapshot.values(), [1, 2])
+        handle.update(lambda current: current.insert(1, 3))
+        self.assertEqual(handle.snapshot().values(), [2, 3])
+
+
+class UnrolledLinkedListTest(unittest.TestCase):
+
+    def check(self, unrolled_list, expected):
+        self.assertEqual(list(unrolled_list), expected)
+        self.assertEqual(len(unrolled_list), len(expected))
+        blocks = list(unrolled_list.iterate_blocks())
+        for block in blocks:
+            self.assertTrue(0 < len(block.values) <= unrolled_list.block_size)
+            self.assertEqual(str(block), str(list(block.values)))
+        self.assertIs(unrolled_list.tail,
+                      blocks[-1] if blocks else unrolled_list.top_cell)
+
+    def test_random_operations(self):
+        for block_size in (1, 2, 3, 16):
+            for typecode in (None, 'l'):
+                unrolled_list = UnrolledLinkedList(
+                    range(50), block_size=block_size, typecode=typecode)
+                expected = list(range(50))
+                for _ in range(300):
+                    if expected and random.random() < 0.5:
+                        index = random.randrange(len(expected))
+                        self.assertEqual(unrolled_list.delete_cell(index),
+                                         expected.pop(index))
+                    else:
+                        index = random.randint(0, len(expected))
+                        unrolled_list.insert_cell(index, index)
+                        expected.insert(index, index)
+                    self.check(unrolled_list, expected)
+                for index in range(len(expected)):
+                    self.assertEqual(unrolled_list[index], expected[index])
+                self.assertRaises(IndexError, unrolled_list.__getitem__,
+                                  len(expected))
+
+    def test_operations(self):
+        unrolled_list = UnrolledLinkedList(block_size=4)
+        self.check(unrolled_list, [])
+        for value in [5, 1, 4, 1, 5, 9, 2, 6, 5, 3]:
+            unrolled_list.insert_into_sorted(value)
+        self.check(unrolled_list, [1, 1, 2, 3, 4, 5, 5, 5, 6, 9])
+        unrolled_list.add_at_beginning(0)
+        unrolled_list.add_at_end(10)
+        self.check(unrolled_list, [0, 1, 1, 2, 3, 4, 5, 5, 5, 6, 9, 10])
+
+        block, offset = unrolled_list.find_cell(5)
+        self.assertEqual(block.values[offset], 5)
+        self.assertIsNone(unrolled_list.find_cell(7))
+        self.assertIn(9, unrolled_list)
+
+        copy = unrolled_list.copy_list()
+        unrolled_list.delete_value(5)
+        self.assertRaises(KeyError, unrolled_list.delete_value, 7)
+        self.check(unrolled_list, [0, 1, 1, 2, 3, 4, 5, 5, 6, 9, 10])
+        self.check(copy, [0, 1, 1, 2, 3, 4, 5, 5, 5, 6, 9, 10])
+        while len(unrolled_list):
+            unrolled_list.delete_cell(0)
+        self.check(unrolled_list, [])
+
+
+class MergeTest(unittest.TestCase):
+
+    def values(self, top_cell):
+        return [cell.value for cell in iterate(top_cell)]
+
+    def check_links(self, top_cell):
+        if top_cell.is_doubly_linked:
+            cell = top_cell.bottom_sentinel
+            backwards = []
+            while not cell.prev.is_top_sentinel:
+                cell = cell.prev
+                backwards.append(cell.value)
+            self.assertEqual(backwards[::-1], self.values(top_cell))
+
+    def test_selection_sort(self):
+        for is_doubly_linked in (False, True):
+            for values in ([], [1], [3, 1, 2], [random.randrange(20)
+                                               for _ in range(100)]):
+                top_cell = make_list(values, is_doubly_linked=is_doubly_linked)
+                cells = set(iterate(top_cell))
+                self.assertIs(selection_sort(top_cell), top_cell)
+                self.assertEqual(self.values(top_cell), sorted(values))
+                self.assertEqual(set(iterate(top_cell)), cells)
+                self.check_links(top_cell)
+
+        # Stable.
+        class Record(object):
+            def __init__(self, key, name):
+                self.key = key
+                self.name = name
+
+            def __lt__(self, other):
+                return self.key < other.key
+
+        top_cell = make_list([Record(1, 'a'), Record(0, 'b'), Record(1, 'c'),
+                              Record(0, 'd')])
+        selection_sort(top_cell)
+        self.assertEqual([cell.value.name for cell in iterate(top_cell)],
+                         ['b', 'd', 'a', 'c'])
+
+    def test_merge(self):
+        for is_doubly_linked in (False, True):
+            for left, right in (([], []), ([1, 3], []), ([], [2]),
+                                ([1, 3, 5, 7], [2, 3, 4, 8, 9])):
+                top_cell = make_list(left, is_doubly_linked=is_doubly_linked)
+                other = make_list(right, is_doubly_linked=is_doubly_linked)
+                merge(top_cell, other)
+                self.assertEqual(self.values(top_cell), sorted(left + right))
+                self.assertEqual(self.values(other), [])
+                self.check_links(top_cell)
+
+        top_cell = make_list(['b', 'C'])
+        merge(top_cell, make_list(['A', 'c']), key=str.lower)
+        self.assertEqual(self.values(top_cell), ['A', 'b', 'C', 'c'])
+
+    def test_merge_k(self):
+        runs = [sorted(random.randrange(50) for _ in range(size))
+                for size in (0, 1, 10, 30, 7)]
+        for is_doubly_linked in (False, True):
+            top_cells = [make_list(run, is_doubly_linked=is_doubly_linked,
+                                   compact=True) for run in runs]
+            cells = {cell for top_cell in top_cells
+                     for cell in iterate(top_cell)}
+            merged = merge_k(top_cells)
+            self.assertEqual(self.values(merged), sorted(sum(runs, [])))
+            self.assertEqual(set(iterate(merged)), cells)
+            self.check_links(merged)
+            for top_cell in top_cells:
+                self.assertEqual(self.values(top_cell), [])
+
+        self.assertEqual(
+            [cell.value for cell in merge_k__lazy(
+                [iterate(make_list(run)) for run in runs])],
+            sorted(sum(runs, [])))
+        self.assertEqual(
+            self.values(merge_k([make_list('ad'), make_list('Bc')],
+                                key=str.lower)),
+            ['a', 'B', 'c', 'd'])
+
+
+class CellPoolTest(unittest.TestCase):
+
+    def test_reuse(self):
+        top_cell = make_list('abc', is_doubly_linked=True)
+        pool = CellPool(top_cell.new_cell, max_size=2)
+        cell = top_cell.next
+        delete_cell(top_cell, pool)
+        self.assertEqual([cell.value for cell in iterate(top_cell)],
+                         ['b', 'c'])
+        self.assertEqual(len(pool), 1)
+        self.assertIsNone(cell.value)
+        self.assertIsNone(cell.next)
+        self.assertIsNone(cell.prev)
+
+        new_cell = pool.new_cell('z')
+        self.assertIs(new_cell, cell)
+        self.assertEqual(new_cell.value, 'z')
+        add_at_end(top_cell, new_cell)
+        self.assertEqual([cell.value for cell in iterate(top_cell)],
+                         ['b', 'c', 'z'])
+
+        for _ in range(3):
+            delete_cell(top_cell, pool)
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.stats(), {
+            'free': 2, 'reused': 1, 'allocated': 0, 'released': 4,
+            'dropped': 1})
+
+        cells = set(pool.free_cells)
+        copy = copy_list(make_list('xyz', is_doubly_linked=True), pool=pool)
+        self.assertEqual([cell.value for cell in iterate(copy)],
+                         ['x', 'y', 'z'])
+        self.assertEqual(len(cells & set(iterate(copy))), 2)
+        self.assertEqual(pool.stats()['allocated'], 1)
+
+    def test_warm(self):
+        pool = CellPool(SinglyCell, max_size=10)
+        pool.warm(20)
+        self.assertEqual(len(pool), 10)
+        cells = set(pool.free_cells)
+        top_cell = make_list(range(5), compact=True, pool=pool)
+        self.assertTrue(set(iterate(top_cell)) <= cells)
+        self.assertEqual([cell.value for cell in iterate(top_cell)],
+                         list(range(5)))
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        self.assertIsInstance(pool.new_cell(1), SinglyCell)
+
+    def test_handles(self):
+        for handle_class in (LinkedList, IndexedLinkedList):
+            pool = CellPool(DoublyCell)
+            pool.warm(2)
+            cells = set(pool.free_cells)
+            linked_list = handle_class('abc', is_doubly_linked=True,
+                                       pool=pool)
+            self.assertEqual(len(cells & set(linked_list)), 2)
+            self.assertEqual(pool.stats()['allocated'], 3)
+
+            first = linked_list.top_cell.next
+            linked_list.delete_cell(linked_list.top_cell)
+            self.assertEqual(pool.free_cells, [first])
+            self.assertIsNone(first.value)
+            linked_list.extend('d')
+            self.assertIs(linked_list.tail, first)
+            self.assertEqual([cell.value for cell in linked_list],
+                             ['b', 'c', 'd'])
+
+            second = linked_list.split_at(linked_list.tail)
+            self.assertIs(second.pool, pool)
+            second.delete_cell(second.top_cell)
+            self.assertEqual(pool.free_cells, [first])
+            self.assertEqual(len(linked_list), 2)
+
+        # The deleted cell is returned, not released.
+        cell = linked_list.delete_value('b')
+        self.assertEqual(cell.value, 'b')
+        self.assertEqual(len(pool), 1)
@@ -0,0 +1,197 @@
+from .models import BaseCell
+
+# The link of a cell in a thread it's not part of, unlike None which ends the
+# thread.
+UNLINKED = object()
+
+
+class ThreadedCell(BaseCell):
+    """A cell of a multithreaded linked list.
+
+    Instead of a single `next` link, it has one link per thread: `nexts[i]`
+    is the next cell in the i-th ordering of the list, or `UNLINKED` in case
+    the cell is not in that thread.
+    """
+    __slots__ = ('value', 'nexts')
+
+    def __init__(self, value=None, threads=1):
+        self.value = value
+        self.nexts = [UNLINKED] * threads
+
+
+class ThreadedTopSentinel(ThreadedCell):
+    __slots__ = ()
+
+    is_sentinel = True
+    is_top_sentinel = True
+
+
+class ThreadedList(object):
+    """A multithreaded linked list: one set of cells ordered several ways.
+
+    Each cell has a link per thread, and following the links of a thread
+    visits the cells in that thread's order. Each thread has a name and a key
+    function of the cell values. The cells of a thread are sorted by the key,
+    or kept in the order they were added in case the key is None. The cells
+    are shared by all the threads, so keeping N orderings of the records
+    costs N links per record rather than N copies of the records.
+
+    A cell needn't be in every thread: `insert` takes the names of the
+    threads to add it to, and `insert_into` adds it to one more thread, at
+    that thread's sorted position.
+    """
+
+    def __init__(self, keys, values=()):
+        """
+        :param keys: A mapping of the thread names to their key functions,
+            or None for the threads kept in the order the cells are added.
+        :param values: An iterable of the initial values.
+        """
+        self.names = list(keys)
+        self.keys = [keys[name] for name in self.names]
+        self.top_cell = ThreadedTopSentinel(threads=len(self.names))
+        self.top_cell.nexts = [None] * len(self.names)
+        self.tails = [self.top_cell] * len(self.names)
+        self.length = 0
+        for value in values:
+            self.insert(value)
+
+    def __len__(self):
+        return self.length
+
+    def thread(self, name):
+        """Return the index of the named thread."""
+        return self.names.index(name)
+
+    def iterate(self, name):
+        """Iterate over the cells in the order of the named thread."""
+        thread = self.thread(name)
+        cell = self.top_cell.nexts[thread]
+        while cell:
+            yield cell
+            cell = cell.nexts[thread]
+
+    def values(self, name):
+        return [cell.value for cell in self.iterate(name)]
+
+    def _find_sorted_position(self, thread, key):
+        """Return the cell after which insert a cell with the key into the
+        sorted thread. Worst-case performance is O(N).
+        """
+        key_function = self.keys[thread]
+        after_me = self.top_cell
+        next_cell = after_me.nexts[thread]
+        while next_cell and key_function(next_cell.value) < key:
+            after_me = next_cell
+            next_cell = after_me.nexts[thread]
+        return after_me
+
+    def _link(self, thread, cell):
+        """Link the cell into the thread, at its sorted position or at the
+        end.
+        """
+        assert cell.nexts[thread] is UNLINKED, "The cell is in the thread."
+        key_function = self.keys[thread]
+        if key_function is None:
+            after_me = self.tails[thread]
+        else:
+            after_me = self._find_sorted_position(
+                thread, key_function(cell.value))
+        cell.nexts[thread] = after_me.nexts[thread]
+        after_me.nexts[thread] = cell
+        if cell.nexts[thread] is None:
+            self.tails[thread] = cell
+
+    def insert(self, value, names=None):
+        """Add a cell holding the value to the named threads, every thread
+        by default, and return it.
+
+        For each thread sorted by a key it takes O(N) time to find the
+        position, appending to the other threads takes O(1) time.
+
+        :param names: The names of the threads to add the cell to. It can be
+            added to the other ones later with `insert_into`.
+        :rtype: ThreadedCell
+        """
+        new_cell = ThreadedCell(value, threads=len(self.names))
+        threads = range(len(self.names)) if names is None else \
+            [self.thread(name) for name in names]
+        assert threads, "The cell must go to a thread at least."
+        for thread in threads:
+            self._link(thread, new_cell)
+        self.length += 1
+        return new_cell
+
+    def insert_into(self, name, cell):
+        """Add the cell, already in the list, to the named thread too: at its
+        sorted position in O(N) time, or at the end in O(1) time in case the
+        thread has no key.
+
+        A cell deleted from all its threads can come back this way.
+
+        :type cell: ThreadedCell
+        """
+        if not self._is_linked(cell):
+            self.length += 1
+        self._link(self.thread(name), cell)
+
+    @staticmethod
+    def _is_linked(cell):
+        """Tell whether the cell is in a thread at least."""
+        return any(link is not UNLINKED for link in cell.nexts)
+
+    def contains(self, name, cell):
+        """Tell whether the cell is in the named thread, in O(1) time."""
+        return cell.nexts[self.thread(name)] is not UNLINKED
+
+    def find_cell(self, name, key):
+        """Find the first cell with the key in the named sorted thread.
+
+        The search stops as soon as it passes the key's position, but the
+        worst-case performance is still O(N).
+
+        :rtype: ThreadedCell | None
+        """
+        thread = self.thread(name)
+        key_function = self.keys[thread]
+        assert key_function is not None
+        cell = self._find_sorted_position(thread, key).nexts[thread]
+        if cell and key_function(cell.value) == key:
+            return cell
+
+    def _find_cell_before(self, thread, cell):
+        key_function = self.keys[thread]
+        if key_function is None:
+            cell_before = self.top_cell
+        else:  # Skip the cells with lesser keys.
+            cell_before = self._find_sorted_position(
+                thread, key_function(cell.value))
+        while cell_before.nexts[thread] is not cell:
+            cell_before = cell_before.nexts[thread]
+            assert cell_before, "The cell is not in the list."
+        return cell_before
+
+    def delete_cell(self, cell, names=None):
+        """Remove the cell from the named threads, every thread it's in by
+        default. The cell leaves the list once it's in no thread.
+
+        The cells are singly linked, so each thread has to be searched for
+        the cell before the given one, in O(N) time.
+
+        :type cell: ThreadedCell
+        """
+        if not self._is_linked(cell):
+            return
+        threads = range(len(self.names)) if names is None else \
+            [self.thread(name) for name in names]
+        for thread in threads:
+            if cell.nexts[thread] is UNLINKED:
+                assert names is None, "The cell is not in the thread."
+                continue
+            cell_before = self._find_cell_before(thread, cell)
+            cell_before.nexts[thread] = cell.nexts[thread]
+            if self.tails[thread] is cell:
+                self.tails[thread] = cell_before
+            cell.nexts[thread] = UNLINKED
+        if not self._is_linked(cell):
+            self.length -= 1
@@ -0,0 +1,262 @@
+from array import array
+from bisect import bisect_left
+
+
+class Block(object):
+    """A cell of an unrolled linked list, holding up to K values.
+
+    The values are in a Python list, or in a typed `array` to store the
+    numbers without boxing them. A block has no single value to compare or
+    print, so it isn't a `BaseCell`: it only shares the `next` link and the
+    kind flags with the cells.
+    """
+    __slots__ = ('values', 'next')
+
+    is_sentinel = False
+    is_top_sentinel = False
+    is_bottom_sentinel = False
+    is_doubly_linked = False
+
+    def __init__(self, values):
+        self.values = values
+        self.next = None
+
+    def __str__(self):
+        return "{}".format(list(self.values))
+
+
+class TopBlock(Block):
+    __slots__ = ()
+
+    is_sentinel = True
+    is_top_sentinel = True
+
+
+class UnrolledLinkedList(object):
+    """A singly linked list of blocks of values.
+
+    Each cell holds up to `block_size` (K) values instead of one, so there
+    are N/K cells to allocate and to follow instead of N: the list takes less
+    memory, and crossing it is mostly scanning the blocks, which runs in C.
+    Reaching a position takes O(N/K) steps, and inserting or deleting there
+    moves up to K values within the block.
+
+    A full block is split in two halves to make room for a new value, and a
+    block less than half full after a deletion takes values from the next
+    block, or is merged with it in case both fit in one block. So all the
+    blocks but the last one stay at least half full.
+
+    The positions are indices of the values, as in a Python list.
+    """
+
+    def __init__(self, values=(), block_size=16, typecode=None):
+        """
+        :param values: An iterable of the initial values.
+        :param block_size: The maximal number of values per block, K.
+        :param typecode: The `array` type code to store the values in typed
+            arrays, or None to store them in Python lists.
+        """
+        assert block_size >= 1
+        self.block_size = block_size
+        self.typecode = typecode
+        self.top_cell = TopBlock(self._new_values())
+        self.tail = self.top_cell
+        self.length = 0
+        self.extend(values)
+
+    def _new_values(self, values=()):
+        if self.typecode is None:
+            return list(values)
+        return array(self.typecode, values)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return self.iterate()
+
+    def iterate_blocks(self):
+        block = self.top_cell.next
+        while block:
+            yield block
+            block = block.next
+
+    def iterate(self):
+        """Iterate over the values."""
+        for block in self.iterate_blocks():
+            yield from block.values
+
+    def _add_block_after(self, block, values):
+        new_block = Block(values)
+        new_block.next = block.next
+        block.next = new_block
+        if block is self.tail:
+            self.tail = new_block
+        return new_block
+
+    def _delete_block_after(self, block):
+        deleted_block = block.next
+        block.next = deleted_block.next
+        if deleted_block is self.tail:
+            self.tail = block
+
+    def extend(self, values):
+        """Add the values at the end, filling the last block up, then new
+        ones. Takes O(1) time per value.
+        """
+        block_size = self.block_size
+        block = self.tail
+        for value in values:
+            if block.is_top_sentinel or len(block.values) == block_size:
+                block = self._add_block_after(block, self._new_values())
+            block.values.append(value)
+            self.length += 1
+
+    def _locate(self, index):
+        """Return the block before the one holding the index, that block and
+        the index within it. Takes O(N/K) time.
+        """
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        block_before = self.top_cell
+        block = block_before.next
+        while index >= len(block.values):
+            index -= len(block.values)
+            block_before = block
+            block = block.next
+        return block_before, block, index
+
+    def __getitem__(self, index):
+        """Return the value at the index. Takes O(N/K) time."""
+        _, block, offset = self._locate(index)
+        return block.values[offset]
+
+    def _insert_into_block(self, block, offset, value):
+        """Insert the value at the offset in the block, splitting it first if
+        it's full. A value added after a full block goes to a new block, so
+        adding values at the end keeps the blocks full.
+        """
+        values = block.values
+        if offset == self.block_size:
+            block = self._add_block_after(block, self._new_values())
+            offset = 0
+        elif len(values) == self.block_size:
+            half = self.block_size // 2
+            new_block = self._add_block_after(block, values[half:])
+            del values[half:]
+            if offset > half:
+                block = new_block
+                offset -= half
+        block.values.insert(offset, value)
+        self.length += 1
+
+    def insert_cell(self, index, value):
+        """Insert the value at the index, that is after the value at index-1.
+        The index may be the length of the list, to add the value at the end.
+        Takes O(N/K + K) time.
+        """
+        if index == self.length:
+            self.add_at_end(value)
+            return
+        _, block, offset = self._locate(index)
+        self._insert_into_block(block, offset, value)
+
+    def add_at_end(self, value):
+        """Add the value at the end. The last block is known, so this takes
+        O(1) time.
+        """
+        block = self.tail
+        if block.is_top_sentinel:
+            block = self._add_block_after(block, self._new_values())
+        self._insert_into_block(block, len(block.values), value)
+
+    def add_at_beginning(self, value):
+        """Add the value at the beginning. Takes O(K) time."""
+        block = self.top_cell.next
+        if block is None:
+            block = self._add_block_after(self.top_cell, self._new_values())
+        self._insert_into_block(block, 0, value)
+
+    def delete_cell(self, index):
+        """Delete the value at the index, and return it.
+
+        Takes O(N/K + K) time, including refilling the block from the next
+        one in case it drops below half full.
+        """
+        block_before, block, offset = self._locate(index)
+        values = block.values
+        value = values.pop(offset)
+        self.length -= 1
+
+        half = self.block_size // 2
+        next_block = block.next
+        if len(values) < half and next_block:
+            if len(values) + len(next_block.values) <= self.block_size:
+                values.extend(next_block.values)
+                self._delete_block_after(block)
+            else:
+                moved = half - len(values)
+                values.extend(next_block.values[:moved])
+                del next_block.values[:moved]
+        if not values:
+            self._delete_block_after(block_before)
+        return value
+
+    def find_cell(self, value):
+        """Return the block containing the first occurrence of the value and
+        the value's offset within it, or None if there's no such value.
+
+        Each block is scanned by `index()`, in C, so the Python loop takes
+        only N/K steps. Worst-case performance is still O(N).
+
+        :rtype: (Block, int) | None
+        """
+        for block in self.iterate_blocks():
+            try:
+                return block, block.values.index(value)
+            except ValueError:
+                pass
+
+    def __contains__(self, value):
+        return self.find_cell(value) is not None
+
+    def delete_value(self, value):
+        """Delete the first occurrence of the value.
+
+        :raises KeyError: In case there's no such value.
+        """
+        index = 0
+        for block in self.iterate_blocks():
+            try:
+                offset = block.values.index(value)
+            except ValueError:
+                index += len(block.values)
+            else:
+                self.delete_cell(index + offset)
+                return
+        raise KeyError(value)
+
+    def insert_into_sorted(self, value):
+        """Insert the value into the sorted list so it remains sorted, before
+        the equal values. Takes O(N/K + K) time.
+        """
+        block = self.top_cell.next
+        if block is None:
+            self.add_at_end(value)
+            return
+        while block.next and block.values[-1] < value:
+            block = block.next
+        self._insert_into_block(block, bisect_left(block.values, value), value)
+
+    def copy_list(self):
+        """Return a copy of the list, copying the blocks as they are.
+        Takes O(N) time, but only N/K cells to allocate.
+
+        :rtype: UnrolledLinkedList
+        """
+        new_list = UnrolledLinkedList(block_size=self.block_size,
+                                      typecode=self.typecode)
+        for block in self.iterate_blocks():
+            new_list._add_block_after(new_list.tail, block.values[:])
+        new_list.length = self.length
+        return new_list